@@ -5,25 +5,331 @@ FastAPI + WebSocket + Simple subprocess SSH + CRUD Management
 """
 
 import asyncio
+import base64
+import bisect
+import codecs
+import csv
+import ctypes
+import ctypes.util
+import errno
+import fcntl
+import gzip
+import hashlib
+import heapq
+import io
 import json
+import logging
+import logging.handlers
+import math
+import queue
+import random
+import re
+import socket
+import sqlite3
+import struct
 import subprocess
 import threading
 import time
 import os
 import pty
+import secrets
 import select
-import signal
 import shutil
-from datetime import datetime
+import signal
+import ssl
+import stat
+import tempfile
+import termios
+from array import array
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Literal
+from urllib.parse import urlsplit
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Request
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Request, Depends, Query
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import RedirectResponse
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, RedirectResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field
 import uvicorn
 
+from inventory import CONFIG_FILES, CONFIG_INDEXES, JSONConfigBackend, SQLiteConfigBackend
+
+try:
+    import asyncssh
+except ImportError:
+    asyncssh = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Logger pro Subsystem; homelab.ssh.io (Output-Chunks, Tastendrücke) ist standardmäßig aus
+log_ssh = logging.getLogger('homelab.ssh')
+log_io = logging.getLogger('homelab.ssh.io')
+log_ping = logging.getLogger('homelab.ping')
+log_config = logging.getLogger('homelab.config')
+
+# Prometheus-Metriken: Latenz-Buckets (Sekunden) für Request-, Render- und Config-Zeiten sowie Ping-RTTs
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+RTT_BUCKETS = (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0)
+
+
+def _label_value(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra: str = '') -> str:
+    pairs = [f'{name}="{_label_value(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class _CounterValue:
+    """Einzelwert ohne Lock: += unter dem GIL, gelegentlich verlorene Inkremente sind für Metriken tragbar"""
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+    def set(self, value: float):
+        self.value = value
+
+
+class _HistogramValue:
+    """Bucket-Zähler, sum und count einer Label-Kombination"""
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        position = bisect.bisect_left(self.buckets, value)
+        if position < len(self.counts):
+            self.counts[position] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metric:
+    """Metrik mit optionalen Labels; Kind-Werte werden pro Label-Kombination einmal angelegt"""
+    kind = 'untyped'
+
+    def __init__(self, registry: 'MetricsRegistry', name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.children: Dict[tuple, object] = {}
+        registry.register(self)
+
+    def _new_child(self):
+        return _CounterValue()
+
+    def labels(self, *values):
+        child = self.children.get(values)
+        if child is None:
+            child = self.children.setdefault(values, self._new_child())
+        return child
+
+    def samples(self):
+        for values, child in list(self.children.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, values)} {child.value:g}"
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, amount: float = 1):
+        self.labels().inc(amount)
+
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def __init__(self, registry: 'MetricsRegistry', name: str, documentation: str, labelnames=(), function=None):
+        super().__init__(registry, name, documentation, labelnames)
+        self.function = function
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+    def samples(self):
+        if self.function is not None:
+            yield f"{self.name} {self.function():g}"
+            return
+        yield from super().samples()
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, registry: 'MetricsRegistry', name: str, documentation: str, labelnames=(),
+                 buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        super().__init__(registry, name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def samples(self):
+        for values, child in list(self.children.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, child.counts):
+                cumulative += count
+                bucket_labels = _format_labels(self.labelnames, values, 'le="%g"' % bound)
+                yield f"{self.name}_bucket{bucket_labels} {cumulative}"
+            bucket_labels = _format_labels(self.labelnames, values, 'le="+Inf"')
+            yield f"{self.name}_bucket{bucket_labels} {child.count}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, values)} {child.sum:g}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, values)} {child.count}"
+
+
+class MetricsRegistry:
+    """Alle Metriken im Prometheus-Textformat (0.0.4) ausgeben"""
+
+    def __init__(self):
+        self.metrics: List[Metric] = []
+
+    def register(self, metric: Metric):
+        self.metrics.append(metric)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+metrics = MetricsRegistry()
+
+PING_PROBE_SECONDS = Histogram(metrics, 'homelab_ping_probe_duration_seconds', 'Dauer einer Ping-Probe inkl. Timeout',
+                               buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0))
+PING_SCHEDULE_LAG_SECONDS = Histogram(metrics, 'homelab_ping_schedule_lag_seconds', 'Verspätung einer Probe gegenüber ihrem Fälligkeitszeitpunkt',
+                                      buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0))
+SERVICE_CHECK_SECONDS = Histogram(metrics, 'homelab_service_check_duration_seconds', 'Dauer eines Service-Checks', ('kind',))
+SERVICE_CHECKS = Counter(metrics, 'homelab_service_checks_total', 'Service-Checks nach Ergebnis', ('result',))
+PING_TARGETS = Gauge(metrics, 'homelab_ping_targets', 'Überwachte Hosts', function=lambda: len(ping_checker.probes))
+PING_RTT_SECONDS = Histogram(metrics, 'homelab_ping_rtt_seconds', 'Ping-Round-Trip-Zeit pro Host',
+                             ('host',), buckets=RTT_BUCKETS)
+PING_PROBES = Counter(metrics, 'homelab_ping_probes_total', 'Ping-Proben nach Ergebnis', ('result',))
+
+SSH_SESSIONS = Gauge(metrics, 'homelab_ssh_sessions', 'Offene SSH-Sitzungen (inkl. abgekoppelter)',
+                     function=lambda: len(connections))
+SSH_SESSIONS_ATTACHED = Gauge(metrics, 'homelab_ssh_sessions_attached', 'SSH-Sitzungen mit verbundenem WebSocket',
+                              function=lambda: sum(1 for conn in list(connections.values()) if conn.websocket is not None))
+SSH_SEND_QUEUE_BYTES = Gauge(metrics, 'homelab_ssh_send_queue_bytes', 'Bytes in den WebSocket-Send-Queues aller Sitzungen',
+                             function=lambda: sum(conn.queued_bytes for conn in list(connections.values())))
+SSH_BYTES = Counter(metrics, 'homelab_ssh_bytes_total', 'Terminal-Bytes (in: Browser zu SSH, out: SSH zu Browser)',
+                    ('direction',))
+SSH_BYTES_IN = SSH_BYTES.labels('in')
+SSH_BYTES_OUT = SSH_BYTES.labels('out')
+
+CONFIG_LOAD_SECONDS = Histogram(metrics, 'homelab_config_load_seconds', 'Laden einer Konfigurationsdatei', ('config',))
+CONFIG_SAVE_SECONDS = Histogram(metrics, 'homelab_config_save_seconds', 'Speichern einer Konfigurationsdatei inkl. Backup', ('config',))
+CACHE_REQUESTS = Counter(metrics, 'homelab_cache_requests_total',
+                         'Zugriffe auf vorkodierte Antworten (GET-Routen, Dashboard-Snapshot) nach Ergebnis', ('cache', 'result'))
+CONFIG_CACHE_HIT = CACHE_REQUESTS.labels('config', 'hit')
+CONFIG_CACHE_MISS = CACHE_REQUESTS.labels('config', 'miss')
+DASHBOARD_CACHE_HIT = CACHE_REQUESTS.labels('dashboard', 'hit')
+DASHBOARD_CACHE_MISS = CACHE_REQUESTS.labels('dashboard', 'miss')
+
+DASHBOARD_RENDER_SECONDS = Histogram(metrics, 'homelab_dashboard_render_seconds', 'Aufbau der /api/dashboard-Antwort (Anreichern + JSON)')
+HTTP_REQUEST_SECONDS = Histogram(metrics, 'homelab_http_request_duration_seconds', 'HTTP-Latenz pro Route', ('method', 'route'))
+
+
+class MetricsMiddleware:
+    """ASGI-Middleware: Latenz pro Route-Template (ohne BaseHTTPMiddleware-Overhead)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        # Mounts (StaticFiles) kürzen scope['path'], daher vorher merken
+        request_path = scope['path']
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            route = scope.get('route')
+            if route is not None:
+                path = route.path
+            elif request_path.startswith('/static/'):
+                path = '/static'
+            else:
+                path = 'unmatched'
+            HTTP_REQUEST_SECONDS.labels(scope['method'], path).observe(time.perf_counter() - started)
+
+
+def json_dumps(data) -> bytes:
+    """Kompaktes UTF-8-JSON für Responses, mit orjson falls installiert"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, allow_nan=False, separators=(',', ':')).encode('utf-8')
+
+
+def json_text(data) -> str:
+    """JSON als str für WebSocket-Text-Frames und SSE"""
+    if orjson is not None:
+        return orjson.dumps(data).decode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+def write_atomic(path: Path, content: bytes):
+    """Temp-Datei schreiben, fsync und per rename ersetzen, Rename per Verzeichnis-fsync persistieren
+    
+    Nach einem Absturz liegt entweder der alte oder der vollständige neue Inhalt vor.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+
+        # Dateirechte der bestehenden Datei übernehmen
+        if path.exists():
+            os.chmod(tmp_path, stat.S_IMODE(path.stat().st_mode))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    dir_fd = os.open(path.parent, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse mit json_dumps; Routen mit fertigen Dicts geben sie direkt zurück (ohne jsonable_encoder)"""
+
+    def render(self, content) -> bytes:
+        return json_dumps(content)
+
+
+# Kürzestes Ping-Intervall pro Host (Sekunden), schützt vor Dauer-Pings durch Tippfehler
+PING_INTERVAL_MIN = 1.0
+
 
 # Pydantic Models for CRUD Operations
 class ServerModel(BaseModel):
@@ -34,6 +340,8 @@ class ServerModel(BaseModel):
     shared: bool = False
     access: dict = {"ssh": False, "ssh_user": "root"}
     notes: str = ""
+    tags: List[str] = []
+    ping_interval: Optional[float] = Field(None, ge=PING_INTERVAL_MIN)
 
 class ServiceModel(BaseModel):
     name: str
@@ -44,6 +352,23 @@ class ServiceModel(BaseModel):
     port: Optional[int] = None
     category: str
     tags: List[str] = []
+    check_timeout: Optional[float] = Field(None, gt=0)
+
+class ServerBatchOperation(BaseModel):
+    op: Literal['create', 'update', 'upsert', 'delete']
+    hostname: Optional[str] = None  # Bisheriger hostname (update/delete), sonst server.hostname
+    server: Optional[ServerModel] = None
+
+class ServerBatchRequest(BaseModel):
+    operations: List[ServerBatchOperation]
+
+class ServiceBatchOperation(BaseModel):
+    op: Literal['create', 'update', 'upsert', 'delete']
+    name: Optional[str] = None  # Bisheriger Name (update/delete), sonst service.name
+    service: Optional[ServiceModel] = None
+
+class ServiceBatchRequest(BaseModel):
+    operations: List[ServiceBatchOperation]
 
 class CategoryModel(BaseModel):
     id: str
@@ -61,26 +386,224 @@ class ServiceCategoryModel(BaseModel):
     order: int
 
 
+# PTY-Output: Lesegröße, Coalescing-Fenster und Backpressure-Grenzen der Send-Queue
+PTY_READ_SIZE = 65536
+OUTPUT_FLUSH_DELAY = 0.005
+OUTPUT_FLUSH_BYTES = 32768
+SEND_QUEUE_HIGH_WATER = 262144
+SEND_QUEUE_LOW_WATER = 65536
+
+# Terminalgröße: Startwert (Spalten, Zeilen), Obergrenze und Entprellung von Resize-Nachrichten
+SSH_TERM_SIZE = (80, 24)
+SSH_TERM_MAX = 1000
+RESIZE_DEBOUNCE = 0.05
+
+# Abgekoppelte Sitzungen: Scrollback pro Sitzung (Bytes) und Gnadenfrist bis zum Beenden (Sekunden)
+SCROLLBACK_BYTES = 262144
+SESSION_GRACE_PERIOD = 300
+
+
+# SSH-Multiplexing: Leerlaufzeit eines Masters (Sekunden) und maximale Anzahl Master
+SSH_CONTROL_PERSIST = 600
+SSH_MAX_MASTERS = 32
+
+
+class SSHSessionManager:
+    """Gemeinsame OpenSSH-Master-Verbindung (ControlMaster) pro (user, host, port)
+    
+    Das erste Terminal authentifiziert sich normal und startet den Master,
+    weitere Terminals zum selben Ziel laufen als Kanal über dessen Socket.
+    """
+
+    def __init__(self, control_persist: int = SSH_CONTROL_PERSIST, max_masters: int = SSH_MAX_MASTERS):
+        self.control_persist = control_persist
+        self.max_masters = max_masters
+        self.control_dir: Optional[Path] = None
+        self.masters: Dict[tuple, dict] = {}
+
+    def _control_path(self, key: tuple) -> Path:
+        """Kurzer Socket-Pfad (Unix-Sockets sind auf ~104 Zeichen begrenzt)"""
+        if self.control_dir is None:
+            self.control_dir = Path(tempfile.mkdtemp(prefix="homelab-ssh-"))
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()[:16]
+        return self.control_dir / f"{digest}.sock"
+
+    @staticmethod
+    def _master_alive(path: Path) -> bool:
+        """Prüfen, ob am Control-Socket ein Master lauscht; verwaiste Sockets entfernen"""
+        if not path.exists():
+            return False
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(path))
+            return True
+        except OSError:
+            path.unlink(missing_ok=True)
+            return False
+        finally:
+            probe.close()
+
+    def _expire(self):
+        """Master ohne Sitzungen vergessen, deren ControlPersist abgelaufen ist"""
+        for key, master in list(self.masters.items()):
+            if master['sessions'] == 0 and not master['path'].exists():
+                del self.masters[key]
+
+    async def acquire(self, username: Optional[str], host: str, port: int) -> List[str]:
+        """SSH-Optionen für eine neue Sitzung; ohne freien Master-Platz ohne Multiplexing"""
+        key = (username or '', host, int(port))
+        self._expire()
+
+        evicted = None
+        if key not in self.masters and len(self.masters) >= self.max_masters:
+            idle = [k for k, master in self.masters.items() if master['sessions'] == 0]
+            if not idle:
+                log_ssh.warning(f"⚠️ Maximale Anzahl SSH-Master erreicht, Verbindung ohne Multiplexing")
+                return ['-o', 'ControlMaster=no', '-o', 'ControlPath=none']
+            evicted = min(idle, key=lambda k: self.masters[k]['last_used'])
+            evicted = (evicted, self.masters.pop(evicted))
+
+        master = self.masters.setdefault(key, {'path': self._control_path(key), 'sessions': 0})
+        master['sessions'] += 1
+        master['last_used'] = time.monotonic()
+
+        if evicted is not None:
+            # Slot ist schon belegt, 'ssh -O exit' (bis 5 s) läuft im Thread statt im Event-Loop
+            try:
+                await asyncio.to_thread(self._exit_master, evicted[0][1], evicted[1]['path'])
+            except (subprocess.SubprocessError, OSError) as e:
+                log_ssh.warning(f"⚠️ SSH-Master für {evicted[0][1]} ließ sich nicht beenden: {e}")
+
+        if self._master_alive(master['path']):
+            log_ssh.info(f"🔁 SSH-Master wiederverwendet für {key[0]}@{host}:{port}")
+        return [
+            '-o', 'ControlMaster=auto',
+            '-o', f"ControlPath={master['path']}",
+            '-o', f"ControlPersist={self.control_persist}"
+        ]
+
+    def release(self, username: Optional[str], host: str, port: int):
+        """Sitzung abmelden, der Master läuft bis ControlPersist weiter"""
+        master = self.masters.get((username or '', host, int(port)))
+        if master and master['sessions'] > 0:
+            master['sessions'] -= 1
+            master['last_used'] = time.monotonic()
+
+    def _close_master(self, key: tuple):
+        """Master vergessen und beenden (blockiert, nur im Thread aufrufen)"""
+        master = self.masters.pop(key)
+        self._exit_master(key[1], master['path'])
+
+    @staticmethod
+    def _exit_master(host: str, path: Path):
+        """Master per 'ssh -O exit' beenden"""
+        if path.exists():
+            subprocess.run(
+                ['ssh', '-O', 'exit', '-o', f"ControlPath={path}", host],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=5
+            )
+
+    def close_all(self):
+        """Alle Master beenden und Socket-Verzeichnis entfernen"""
+        for key in list(self.masters):
+            try:
+                self._close_master(key)
+            except Exception as e:
+                log_ssh.error(f"❌ Fehler beim Beenden des SSH-Masters: {e}")
+        if self.control_dir is not None:
+            shutil.rmtree(self.control_dir, ignore_errors=True)
+            self.control_dir = None
+
+
+class ScrollbackBuffer:
+    """Ringpuffer fester Größe mit der jüngsten Terminal-Ausgabe"""
+
+    def __init__(self, capacity: int = SCROLLBACK_BYTES):
+        self.capacity = capacity
+        self.buffer = bytearray()
+        self.end = 0
+        self.full = False
+
+    def write(self, data: bytes):
+        """Anhängen, älteste Bytes überschreiben sobald die Kapazität erreicht ist"""
+        if not self.full:
+            self.buffer += data
+            if len(self.buffer) >= self.capacity:
+                del self.buffer[:len(self.buffer) - self.capacity]
+                self.full = True
+                self.end = 0
+            return
+
+        data = memoryview(data)[-self.capacity:]
+        first = min(len(data), self.capacity - self.end)
+        self.buffer[self.end:self.end + first] = data[:first]
+        self.buffer[:len(data) - first] = data[first:]
+        self.end = (self.end + len(data)) % self.capacity
+
+    def snapshot(self) -> bytes:
+        """Inhalt in zeitlicher Reihenfolge"""
+        if not self.full:
+            return bytes(self.buffer)
+        return bytes(self.buffer[self.end:] + self.buffer[:self.end])
+
+
+def _pty_child_setup():
+    """Im Kindprozess: neue Session mit dem PTY als Controlling Terminal (für /dev/tty und SIGWINCH)"""
+    os.setsid()
+    fcntl.ioctl(0, termios.TIOCSCTTY, 0)
+
+
+def _reap_ssh_process(process: subprocess.Popen):
+    """Beendeten SSH-Prozess abwarten, nach Timeout hart beenden (Worker-Thread)"""
+    try:
+        process.wait(timeout=3)
+    except subprocess.TimeoutExpired:
+        log_ssh.warning("🔫 SSH-Prozess forciert beenden")
+        try:
+            os.killpg(os.getpgid(process.pid), signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        process.wait()
+
+
 class SSHConnection:
     def __init__(self, websocket: WebSocket):
-        self.websocket = websocket
+        # Mit mehreren Workern beginnt die ID mit dem besitzenden Worker (Reattach über dessen Relay-Socket)
+        token = secrets.token_urlsafe(12)
+        self.session_id = f"{worker_coordinator.worker_id}.{token}" if worker_coordinator else token
+        self.websocket: Optional[WebSocket] = None
         self.ssh_process: Optional[subprocess.Popen] = None
         self.master_fd: Optional[int] = None
         self.slave_fd: Optional[int] = None
         self.connected = False
-        self.output_thread: Optional[threading.Thread] = None
-        self.loop = None
+        self.loop = asyncio.get_running_loop()
+        self.reading = False
+        self.send_queue: asyncio.Queue = asyncio.Queue()
+        self.sender_task: Optional[asyncio.Task] = None
+        self.queued_bytes = 0
+        self.scrollback = ScrollbackBuffer()
+        self.grace_handle: Optional[asyncio.TimerHandle] = None
+        self.output_buffer = bytearray()
+        self.output_decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.flush_handle: Optional[asyncio.TimerHandle] = None
+        self.input_buffer = bytearray()
+        self.binary = False
+        self.session_key: Optional[tuple] = None
+        self.term_size = SSH_TERM_SIZE
+        self.resize_handle: Optional[asyncio.TimerHandle] = None
+        self.attach(websocket)
 
-    async def connect(self, host: str, port: int = 22, username: str = None):
+    async def connect(self, host: str, port: int = 22, username: str = None, binary: bool = False):
         """SSH-Verbindung mit echtem PTY"""
         try:
-            print(f"🔌 SSH-Verbindung mit PTY zu {username}@{host}:{port}")
+            log_ssh.info(f"🔌 SSH-Verbindung mit PTY zu {username}@{host}:{port}")
             
-            # Store event loop for thread communication
-            self.loop = asyncio.get_event_loop()
+            # Binärmodus: Terminal-Daten als rohe Binary-Frames, Steuer-Nachrichten weiter als JSON
+            self.binary = binary
             
             # Create a real PTY
             self.master_fd, self.slave_fd = pty.openpty()
+            self._apply_size()
             
             # SSH-Befehl
             if username:
@@ -103,7 +626,11 @@ class SSHConnection:
                 '-o', 'ConnectTimeout=10'
             ]
             
-            print(f"🔧 SSH-Befehl mit PTY: {' '.join(ssh_cmd)}")
+            # Gemeinsame Master-Verbindung pro Ziel: weitere Terminals ohne erneuten Handshake
+            ssh_cmd += await ssh_sessions.acquire(username, host, port)
+            self.session_key = (username, host, port)
+            
+            log_ssh.debug(f"🔧 SSH-Befehl mit PTY: {' '.join(ssh_cmd)}")
             
             # Starte SSH-Prozess mit PTY
             self.ssh_process = subprocess.Popen(
@@ -111,7 +638,7 @@ class SSHConnection:
                 stdin=self.slave_fd,
                 stdout=self.slave_fd,
                 stderr=self.slave_fd,
-                preexec_fn=os.setsid
+                preexec_fn=_pty_child_setup
             )
             
             # Close slave fd in parent (SSH process keeps it open)
@@ -120,104 +647,268 @@ class SSHConnection:
             
             self.connected = True
             
-            await self.websocket.send_text(json.dumps({
+            self._enqueue({
                 'type': 'connected',
-                'message': f'SSH PTY started for {ssh_target}'
-            }))
+                'message': f'SSH PTY started for {ssh_target}',
+                'session_id': self.session_id,
+                'binary': self.binary
+            })
             
-            # Output-Thread starten
-            self.output_thread = threading.Thread(target=self._read_ssh_output, daemon=True)
-            self.output_thread.start()
+            # PTY-Output ereignisgesteuert über den Event-Loop lesen
+            self._start_output_pump()
             
-            print(f"✅ SSH-PTY gestartet für {ssh_target}")
+            log_ssh.info(f"✅ SSH-PTY gestartet für {ssh_target}")
             
         except Exception as e:
             error_msg = f"SSH-Verbindung fehlgeschlagen: {str(e)}"
-            print(f"❌ {error_msg}")
-            await self.websocket.send_text(json.dumps({
+            log_ssh.error(f"❌ {error_msg}")
+            self._enqueue({
                 'type': 'error',
                 'message': f'Connection failed: {str(e)}'
-            }))
+            })
 
-    def _read_ssh_output(self):
-        """SSH-Output vom PTY lesen"""
+    def resize(self, cols: int, rows: int):
+        """Neue Terminalgröße merken und entprellt anwenden (Fenster-Ziehen erzeugt Serien)"""
+        self.term_size = (max(1, min(int(cols), SSH_TERM_MAX)), max(1, min(int(rows), SSH_TERM_MAX)))
+        if self.loop is None or self.resize_handle is not None:
+            return
+        self.resize_handle = self.loop.call_later(RESIZE_DEBOUNCE, self._apply_size)
+
+    def _apply_size(self):
+        """TIOCSWINSZ auf dem PTY setzen, der Kernel schickt SIGWINCH an ssh"""
+        self.resize_handle = None
+        if self.master_fd is None:
+            return
+        cols, rows = self.term_size
         try:
-            print(f"🔄 PTY Output-Thread gestartet")
-            
-            while self.connected and self.master_fd is not None:
-                try:
-                    # Check if process is still alive
-                    if self.ssh_process and self.ssh_process.poll() is not None:
-                        print(f"🔌 SSH-Prozess beendet mit Code: {self.ssh_process.returncode}")
-                        break
-                    
-                    # Use select to check for available data
-                    ready, _, _ = select.select([self.master_fd], [], [], 0.1)
-                    
-                    if ready:
-                        try:
-                            # Read from PTY
-                            data = os.read(self.master_fd, 1024)
-                            if data:
-                                # Decode and send
-                                text = data.decode('utf-8', errors='replace')
-                                print(f"📥 SSH PTY Output: {repr(text[:100])}")
-                                
-                                if self.loop:
-                                    asyncio.run_coroutine_threadsafe(
-                                        self.websocket.send_text(json.dumps({
-                                            'type': 'output',
-                                            'data': text
-                                        })),
-                                        self.loop
-                                    )
-                            else:
-                                time.sleep(0.01)
-                                
-                        except OSError as e:
-                            if e.errno == 5:
-                                print("🔌 PTY geschlossen")
-                                break
-                            else:
-                                print(f"❌ PTY Read-Fehler: {e}")
-                                time.sleep(0.1)
-                    else:
-                        time.sleep(0.01)
-                        
-                except Exception as read_error:
-                    print(f"❌ PTY Read-Fehler: {read_error}")
-                    time.sleep(0.1)
-                    
-        except Exception as e:
-            print(f"❌ SSH PTY Output-Thread Fehler: {e}")
-        finally:
-            print(f"🔄 PTY Output-Thread beendet")
-            if self.loop:
-                asyncio.run_coroutine_threadsafe(
-                    self.websocket.send_text(json.dumps({
-                        'type': 'disconnected',
-                        'message': 'SSH PTY session ended'
-                    })),
-                    self.loop
-                )
-
-    async def send_input(self, data: str):
-        """Input an SSH-PTY senden"""
+            fcntl.ioctl(self.master_fd, termios.TIOCSWINSZ, struct.pack('HHHH', rows, cols, 0, 0))
+        except OSError as e:
+            log_ssh.error(f"❌ PTY Resize-Fehler: {e}")
+
+    def attach(self, websocket: WebSocket):
+        """WebSocket an die Sitzung koppeln (neu oder Reattach), ein vorheriger wird abgelöst"""
+        if self.websocket is not None:
+            self.detach()
+        if self.grace_handle:
+            self.grace_handle.cancel()
+            self.grace_handle = None
+        self.websocket = websocket
+        self.send_queue = asyncio.Queue()
+        self.queued_bytes = 0
+        self.sender_task = self.loop.create_task(self._send_loop())
+
+    def detach(self, grace: Optional[float] = None):
+        """WebSocket lösen; die Sitzung läuft weiter und schreibt nur noch in den Scrollback"""
+        if self.sender_task:
+            self.sender_task.cancel()
+            self.sender_task = None
+        self.websocket = None
+        self.queued_bytes = 0
+        if self.connected and not self.reading:
+            self._resume_reading()
+        if grace is not None:
+            self.grace_handle = self.loop.call_later(grace, expire_session, self.session_id)
+
+    def replay(self):
+        """Scrollback nach einem Reattach als einen Frame senden"""
+        self._enqueue({
+            'type': 'attached',
+            'session_id': self.session_id,
+            'binary': self.binary,
+            'connected': self.connected
+        })
+        data = self.scrollback.snapshot()
+        if not data:
+            return
+        if self.binary:
+            self._enqueue(data, len(data))
+        else:
+            text = data.decode('utf-8', errors='replace')
+            self._enqueue({'type': 'output', 'data': text}, len(text))
+
+    def _start_output_pump(self):
+        """master_fd beim Event-Loop registrieren statt Polling-Thread"""
+        os.set_blocking(self.master_fd, False)
+        self._resume_reading()
+
+    def _resume_reading(self):
+        """Reader (wieder) beim Event-Loop anmelden"""
+        if not self.reading and self.master_fd is not None:
+            self.loop.add_reader(self.master_fd, self._on_pty_readable)
+            self.reading = True
+
+    def _pause_reading(self):
+        """Reader abmelden (Backpressure oder Sitzungsende)"""
+        if self.reading and self.master_fd is not None:
+            self.loop.remove_reader(self.master_fd)
+        self.reading = False
+
+    def _stop_output_pump(self):
+        """Reader abmelden und Flush-/Resize-Timer verwerfen"""
+        self._pause_reading()
+        if self.flush_handle:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        if self.resize_handle:
+            self.resize_handle.cancel()
+            self.resize_handle = None
+
+    def _on_pty_readable(self):
+        """SSH-Output vom PTY lesen (Callback des Event-Loops)"""
+        try:
+            data = os.read(self.master_fd, PTY_READ_SIZE)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            # EIO: Slave-Seite geschlossen, SSH-Prozess beendet
+            if e.errno != errno.EIO:
+                log_ssh.error(f"❌ PTY Read-Fehler: {e}")
+            data = b''
+
+        if not data:
+            log_ssh.info("🔌 PTY geschlossen")
+            self._on_session_closed()
+            return
+
+        log_io.debug("📥 SSH PTY Output: %d Bytes", len(data))
+        self._feed_output(data)
+
+    def _on_session_closed(self):
+        """Restlichen Output senden und Sitzungsende melden"""
+        self.connected = False
+        self._stop_output_pump()
+        self._flush_output()
+        self._enqueue({
+            'type': 'disconnected',
+            'message': 'SSH PTY session ended'
+        })
+
+    def _feed_output(self, data: bytes):
+        """Output puffern und zeitgesteuert als Frame senden"""
+        SSH_BYTES_OUT.inc(len(data))
+        self.scrollback.write(data)
+        self.output_buffer += data
+
+        # Innerhalb des Zeitfensters sammeln, bei genug Daten sofort senden
+        if len(self.output_buffer) >= OUTPUT_FLUSH_BYTES:
+            self._flush_output()
+        elif self.flush_handle is None:
+            self.flush_handle = self.loop.call_later(OUTPUT_FLUSH_DELAY, self._flush_output)
+
+    def _flush_output(self):
+        """Gesammelten Output als einen Frame in die Send-Queue legen"""
+        if self.flush_handle:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        if not self.output_buffer:
+            return
+
+        if self.binary:
+            data = bytes(self.output_buffer)
+            self.output_buffer.clear()
+            self._enqueue(data, len(data))
+            return
+
+        # Inkrementeller Decoder hält an der Puffergrenze geteilte UTF-8-Zeichen zurück
+        text = self.output_decoder.decode(bytes(self.output_buffer))
+        self.output_buffer.clear()
+        if text:
+            self._enqueue({'type': 'output', 'data': text}, len(text))
+
+    def _enqueue(self, message, size: int = 0):
+        """Nachricht einreihen, bei Überschreiten der High-Water-Mark Lesen pausieren"""
+        if self.websocket is None:
+            # Abgekoppelt: Output landet nur im Scrollback
+            return
+        self.send_queue.put_nowait((message, size))
+        self.queued_bytes += size
+        if self.queued_bytes >= SEND_QUEUE_HIGH_WATER and self.reading:
+            self._pause_reading()
+
+    async def _send_loop(self):
+        """Nachrichten in Reihenfolge an den WebSocket senden"""
+        while True:
+            message, size = await self.send_queue.get()
+            try:
+                if isinstance(message, bytes):
+                    await self.websocket.send_bytes(message)
+                else:
+                    await self.websocket.send_text(json_text(message))
+            except Exception as e:
+                log_ssh.warning(f"❌ WebSocket Send-Fehler: {e}")
+                break
+
+            self.queued_bytes -= size
+            if self.queued_bytes <= SEND_QUEUE_LOW_WATER and self.connected and not self.reading:
+                self._resume_reading()
+
+    async def send_input(self, data):
+        """Input an SSH-PTY senden (str aus JSON-Frames, bytes aus Binary-Frames)"""
         if self.connected and self.master_fd is not None:
             try:
-                print(f"📤 SSH PTY Input: {repr(data)}")
-                os.write(self.master_fd, data.encode('utf-8'))
+                if isinstance(data, str):
+                    data = data.encode('utf-8')
+                log_io.debug("📤 SSH PTY Input: %d Bytes", len(data))
+                SSH_BYTES_IN.inc(len(data))
+                self._write_pty(data)
             except Exception as e:
-                print(f"❌ SSH PTY Input-Fehler: {e}")
-                await self.websocket.send_text(json.dumps({
+                log_ssh.error(f"❌ SSH PTY Input-Fehler: {e}")
+                self._enqueue({
                     'type': 'error',
                     'message': f'Failed to send input: {str(e)}'
-                }))
+                })
+
+    def _write_pty(self, data: bytes):
+        """In den nicht-blockierenden PTY schreiben, Rest per add_writer nachliefern"""
+        if self.input_buffer:
+            self.input_buffer += data
+            return
+
+        written = 0
+        try:
+            written = os.write(self.master_fd, data)
+        except BlockingIOError:
+            pass
+
+        if written < len(data):
+            self.input_buffer += data[written:]
+            self.loop.add_writer(self.master_fd, self._on_pty_writable)
+
+    def _on_pty_writable(self):
+        """Gepufferten Input schreiben, sobald der PTY wieder Platz hat"""
+        try:
+            written = os.write(self.master_fd, self.input_buffer)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            log_ssh.error(f"❌ SSH PTY Input-Fehler: {e}")
+            written = len(self.input_buffer)
+
+        del self.input_buffer[:written]
+        if not self.input_buffer:
+            self.loop.remove_writer(self.master_fd)
 
     def disconnect(self):
         """SSH-PTY-Verbindung schließen"""
-        print(f"🔌 SSH-PTY-Verbindung schließen")
+        log_ssh.info(f"🔌 SSH-PTY-Verbindung schließen")
         self.connected = False
+        self._stop_output_pump()
+
+        if self.grace_handle:
+            self.grace_handle.cancel()
+            self.grace_handle = None
+
+        if self.session_key:
+            ssh_sessions.release(*self.session_key)
+            self.session_key = None
+
+        if self.input_buffer and self.master_fd is not None:
+            self.loop.remove_writer(self.master_fd)
+            self.input_buffer.clear()
+
+        if self.sender_task:
+            self.sender_task.cancel()
+            self.sender_task = None
         
         if self.master_fd is not None:
             try:
@@ -236,151 +927,2359 @@ class SSHConnection:
         if self.ssh_process:
             try:
                 os.killpg(os.getpgid(self.ssh_process.pid), signal.SIGTERM)
-                try:
-                    self.ssh_process.wait(timeout=3)
-                except subprocess.TimeoutExpired:
-                    print("🔫 SSH-Prozess forciert beenden")
-                    os.killpg(os.getpgid(self.ssh_process.pid), signal.SIGKILL)
-                    self.ssh_process.wait()
+                # Warten (bis 3 s) im Thread, der Event-Loop bedient derweil alle anderen Clients
+                self.loop.run_in_executor(None, _reap_ssh_process, self.ssh_process)
             except Exception as e:
-                print(f"❌ Fehler beim Schließen: {e}")
+                log_ssh.error(f"❌ Fehler beim Schließen: {e}")
             self.ssh_process = None
 
 
-class PingChecker:
-    def __init__(self):
-        self.ping_results = {}
-        self.ping_thread = None
-        self.running = False
-        
-    def start_ping_monitoring(self, servers):
-        """Startet kontinuierliches Ping-Monitoring"""
-        if self.running:
-            return
-            
-        self.running = True
-        self.ping_thread = threading.Thread(target=self._ping_loop, args=(servers,), daemon=True)
-        self.ping_thread.start()
-        print("✅ Ping-Monitoring gestartet")
-    
-    def _ping_loop(self, servers):
-        """Kontinuierliche Ping-Überwachung"""
-        while self.running:
-            for server in servers:
-                host = server.get('host')
-                hostname = server.get('hostname')
-                if host and hostname:
-                    self.ping_results[hostname] = self._ping_host(host)
-            time.sleep(30)
-    
-    def _ping_host(self, host):
-        """Einzelnen Host pingen"""
-        try:
-            result = subprocess.run(
-                ['ping', '-c', '1', '-W', '2', host],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            success = result.returncode == 0
-            print(f"🏓 Ping {host}: {'✅' if success else '❌'}")
-            return 'online' if success else 'offline'
-            
-        except Exception as e:
-            print(f"❌ Ping-Fehler für {host}: {e}")
-            return 'offline'
-    
-    def get_status(self, server_id):
-        """Status für einen Server abrufen"""
-        return self.ping_results.get(server_id, 'unknown')
-    
-    def stop(self):
-        """Ping-Monitoring stoppen"""
-        self.running = False
+# Terminal-Typ für PTY-Anfragen des asyncssh-Backends
+SSH_TERM_TYPE = 'xterm-256color'
+SSH_PASSWORD_ATTEMPTS = 3
 
 
-class ConfigManager:
-    """Verwaltet Konfigurationsdateien mit Backup-Funktionalität"""
-    
-    def __init__(self):
-        self.config_dir = Path("config")
-        self.backup_dir = Path("config/backups")
-        self.backup_dir.mkdir(parents=True, exist_ok=True)
-    
-    def create_backup(self, config_type: str):
-        """Erstellt Backup einer Konfigurationsdatei"""
-        config_file = self.config_dir / f"{config_type}.json"
-        if config_file.exists():
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_file = self.backup_dir / f"{config_type}_{timestamp}.json"
-            shutil.copy2(config_file, backup_file)
-            print(f"📦 Backup erstellt: {backup_file}")
-    
-    def save_config(self, config_type: str, data: dict):
-        """Speichert Konfiguration mit Backup"""
-        try:
-            # Backup erstellen
-            self.create_backup(config_type)
-            
-            # Neue Konfiguration speichern
-            config_file = self.config_dir / f"{config_type}.json"
-            with open(config_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            
-            print(f"✅ Konfiguration gespeichert: {config_file}")
-            return True
-            
-        except Exception as e:
-            print(f"❌ Fehler beim Speichern von {config_type}: {e}")
-            return False
+class _PromptingSSHClient(asyncssh.SSHClient if asyncssh else object):
+    """asyncssh-Client, der Passwort- und Keyboard-Interactive-Abfragen ins Terminal leitet"""
 
+    def __init__(self, owner: 'AsyncSSHConnection'):
+        self.owner = owner
+        self.password_attempts = 0
 
-# FastAPI App
-app = FastAPI(title="HomeLab Dashboard")
+    def password_auth_requested(self):
+        self.password_attempts += 1
+        if self.password_attempts > SSH_PASSWORD_ATTEMPTS:
+            return None
+        return self.owner.prompt("Password: ")
 
-# Static Files
-app.mount("/static", StaticFiles(directory="static"), name="static")
+    def kbdint_auth_requested(self):
+        return ''
 
-# In-Memory Connection Store
-connections: Dict[str, SSHConnection] = {}
+    async def kbdint_challenge_received(self, name, instructions, lang, prompts):
+        if instructions:
+            self.owner.write_local(instructions + "\r\n")
+        return [await self.owner.prompt(prompt, echo) for prompt, echo in prompts]
+
+
+class _TerminalSession(asyncssh.SSHClientSession if asyncssh else object):
+    """Kanal-Callbacks an die AsyncSSHConnection weiterreichen"""
+
+    def __init__(self, owner: 'AsyncSSHConnection'):
+        self.owner = owner
+
+    def data_received(self, data, datatype):
+        self.owner._feed_output(data)
+
+    def connection_lost(self, exc):
+        if self.owner.connected:
+            self.owner._on_session_closed()
+
+
+class AsyncSSHPool:
+    """Authentifizierte asyncssh-Verbindungen pro (user, host, port) für weitere Terminals wiederverwenden"""
+
+    def __init__(self, idle_timeout: int = SSH_CONTROL_PERSIST, max_connections: int = SSH_MAX_MASTERS):
+        self.idle_timeout = idle_timeout
+        self.max_connections = max_connections
+        self.entries: Dict[tuple, dict] = {}
+
+    @staticmethod
+    def _is_open(conn) -> bool:
+        return conn is not None and not conn.is_closed()
+
+    async def acquire(self, owner: 'AsyncSSHConnection', username: Optional[str], host: str, port: int):
+        """Offene Verbindung liefern oder neu aufbauen; (conn, pooled)"""
+        key = (username or '', host, int(port))
+        entry = self.entries.get(key)
+
+        if entry and entry['pending']:
+            await asyncio.shield(entry['pending'])
+            entry = self.entries.get(key)
+
+        if entry and self._is_open(entry['conn']):
+            log_ssh.info(f"🔁 SSH-Verbindung wiederverwendet für {key[0]}@{host}:{port}")
+            self._checkout(entry)
+            return entry['conn'], True
+        self.entries.pop(key, None)
+
+        if len(self.entries) >= self.max_connections and not self._evict_idle():
+            log_ssh.warning(f"⚠️ Maximale Anzahl SSH-Verbindungen erreicht, Verbindung ohne Pool")
+            return await self._open(owner, username, host, port), False
+
+        entry = {'conn': None, 'sessions': 0, 'last_used': time.monotonic(), 'idle_handle': None,
+                 'pending': asyncio.get_running_loop().create_future()}
+        self.entries[key] = entry
+        try:
+            entry['conn'] = await self._open(owner, username, host, port)
+        except BaseException:
+            self.entries.pop(key, None)
+            raise
+        finally:
+            entry['pending'].set_result(None)
+            entry['pending'] = None
+
+        self._checkout(entry)
+        return entry['conn'], True
+
+    async def _open(self, owner: 'AsyncSSHConnection', username: Optional[str], host: str, port: int):
+        """Neue Verbindung mit denselben Auth-Optionen wie das ssh-Subprocess-Backend"""
+        ssh_settings = settings['ssh']
+        conn, _ = await asyncssh.create_connection(
+            lambda: _PromptingSSHClient(owner), host, port,
+            username=username,
+            known_hosts=None,
+            client_keys=None,
+            agent_path=None,
+            preferred_auth='keyboard-interactive,password',
+            connect_timeout=10,
+            keepalive_interval=ssh_settings['keepalive_interval'],
+            keepalive_count_max=ssh_settings['keepalive_count_max']
+        )
+        return conn
+
+    def _checkout(self, entry: dict):
+        entry['sessions'] += 1
+        entry['last_used'] = time.monotonic()
+        if entry['idle_handle']:
+            entry['idle_handle'].cancel()
+            entry['idle_handle'] = None
+
+    def _evict_idle(self) -> bool:
+        """Am längsten unbenutzte Verbindung ohne Sitzungen schließen"""
+        idle = [key for key, entry in self.entries.items() if entry['sessions'] == 0 and not entry['pending']]
+        if not idle:
+            return False
+        self._close(min(idle, key=lambda key: self.entries[key]['last_used']))
+        return True
+
+    def _close(self, key: tuple):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        if entry['idle_handle']:
+            entry['idle_handle'].cancel()
+        if self._is_open(entry['conn']):
+            entry['conn'].close()
+
+    def release(self, username: Optional[str], host: str, port: int):
+        """Sitzung abmelden; ohne Sitzungen nach idle_timeout schließen"""
+        key = (username or '', host, int(port))
+        entry = self.entries.get(key)
+        if not entry or entry['sessions'] == 0:
+            return
+        entry['sessions'] -= 1
+        entry['last_used'] = time.monotonic()
+        if entry['sessions'] == 0:
+            entry['idle_handle'] = asyncio.get_running_loop().call_later(
+                self.idle_timeout, lambda: self.entries.get(key) is entry and self._close(key))
+
+    def close_all(self):
+        """Alle Verbindungen schließen"""
+        for key in list(self.entries):
+            self._close(key)
+
+
+class AsyncSSHConnection(SSHConnection):
+    """SSH direkt im Event-Loop über asyncssh: kein ssh-Prozess, kein lokaler PTY"""
+
+    def __init__(self, websocket: WebSocket):
+        super().__init__(websocket)
+        self.conn = None
+        self.channel = None
+        self.pooled = False
+        self.prompt_future: Optional[asyncio.Future] = None
+        self.prompt_echo = False
+        self.prompt_buffer = bytearray()
+        self.connect_task: Optional[asyncio.Task] = None
+
+    async def connect(self, host: str, port: int = 22, username: str = None, binary: bool = False):
+        """Verbindungsaufbau im Hintergrund, damit der WebSocket-Handler Abfrage-Eingaben weiter empfängt"""
+        log_ssh.info(f"🔌 SSH-Verbindung (asyncssh) zu {username}@{host}:{port}")
+        self.binary = binary
+        self.connect_task = self.loop.create_task(self._establish(host, port, username))
+
+    async def _establish(self, host: str, port: int, username: Optional[str]):
+        """SSH-Verbindung über asyncssh mit PTY-Anfrage auf dem Server"""
+        ssh_target = f"{username}@{host}" if username else host
+        try:
+            self.conn, self.pooled = await ssh_pool.acquire(self, username, host, port)
+            if self.pooled:
+                self.session_key = (username, host, port)
+
+            self.channel, _ = await self.conn.create_session(
+                lambda: _TerminalSession(self),
+                term_type=SSH_TERM_TYPE,
+                term_size=self.term_size,
+                encoding=None
+            )
+            self.connected = True
+            self.reading = True
+
+            self._enqueue({
+                'type': 'connected',
+                'message': f'SSH session started for {ssh_target}',
+                'session_id': self.session_id,
+                'binary': self.binary
+            })
+            log_ssh.info(f"✅ SSH-Sitzung (asyncssh) gestartet für {ssh_target}")
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log_ssh.error(f"❌ SSH-Verbindung fehlgeschlagen: {e}")
+            self._enqueue({
+                'type': 'error',
+                'message': f'Connection failed: {str(e)}'
+            })
+
+    def write_local(self, text: str):
+        """Text direkt ins Browser-Terminal schreiben (Abfragen, Hinweise)"""
+        self._feed_output(text.encode('utf-8'))
+        self._flush_output()
+
+    async def prompt(self, text: str, echo: bool = False) -> str:
+        """Eingabezeile im Terminal abfragen (Passwort, Keyboard-Interactive)"""
+        self.write_local(text)
+        self.prompt_echo = echo
+        self.prompt_buffer.clear()
+        self.prompt_future = self.loop.create_future()
+        try:
+            return await self.prompt_future
+        finally:
+            self.prompt_future = None
+
+    def _prompt_input(self, data: bytes):
+        """Tastatureingaben während einer Abfrage zeilenweise sammeln"""
+        for byte in data:
+            if byte in (0x0d, 0x0a):
+                self.write_local("\r\n")
+                if not self.prompt_future.done():
+                    self.prompt_future.set_result(self.prompt_buffer.decode('utf-8', errors='replace'))
+                return
+            if byte == 0x03:
+                self.write_local("^C\r\n")
+                self.prompt_future.set_exception(ConnectionAbortedError("Anmeldung abgebrochen"))
+                return
+            if byte in (0x7f, 0x08):
+                if self.prompt_buffer:
+                    self.prompt_buffer.pop()
+                    if self.prompt_echo:
+                        self._feed_output(b"\b \b")
+                continue
+            self.prompt_buffer.append(byte)
+            if self.prompt_echo:
+                self._feed_output(bytes([byte]))
+        self._flush_output()
+
+    def _resume_reading(self):
+        """Kanal-Flusskontrolle statt add_reader"""
+        if not self.reading and self.channel is not None:
+            self.channel.resume_reading()
+            self.reading = True
+
+    def _pause_reading(self):
+        if self.reading and self.channel is not None:
+            self.channel.pause_reading()
+        self.reading = False
+
+    def _apply_size(self):
+        """window-change an den Server senden"""
+        self.resize_handle = None
+        if self.channel is not None:
+            self.channel.change_terminal_size(*self.term_size)
+
+    async def send_input(self, data):
+        """Input an den SSH-Kanal senden (oder an eine laufende Abfrage)"""
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        if self.prompt_future is not None:
+            self._prompt_input(data)
+            return
+        if self.connected and self.channel is not None:
+            try:
+                SSH_BYTES_IN.inc(len(data))
+                self.channel.write(data)
+            except Exception as e:
+                log_ssh.error(f"❌ SSH Input-Fehler: {e}")
+                self._enqueue({
+                    'type': 'error',
+                    'message': f'Failed to send input: {str(e)}'
+                })
+
+    def disconnect(self):
+        """Kanal schließen; gepoolte Verbindung bleibt für weitere Terminals offen"""
+        log_ssh.info(f"🔌 SSH-Sitzung (asyncssh) schließen")
+        self.connected = False
+        self._stop_output_pump()
+
+        if self.grace_handle:
+            self.grace_handle.cancel()
+            self.grace_handle = None
+
+        if self.connect_task and not self.connect_task.done():
+            self.connect_task.cancel()
+        self.connect_task = None
+
+        if self.channel is not None:
+            self.channel.close()
+            self.channel = None
+
+        if self.session_key:
+            ssh_pool.release(*self.session_key)
+            self.session_key = None
+        elif self.conn is not None:
+            self.conn.close()
+        self.conn = None
+
+        if self.sender_task:
+            self.sender_task.cancel()
+            self.sender_task = None
+
+
+def create_ssh_connection(websocket: WebSocket) -> SSHConnection:
+    """SSH-Backend laut config/settings.json wählen (Standard: ssh-Subprocess mit PTY)"""
+    if settings['ssh']['backend'] == 'asyncssh':
+        if asyncssh is not None:
+            return AsyncSSHConnection(websocket)
+        log_ssh.warning("⚠️ asyncssh nicht installiert, verwende ssh-Subprocess-Backend")
+    return SSHConnection(websocket)
+
+
+ICMP_ECHO_REPLY = 0
+ICMP_ECHO_REQUEST = 8
+ICMP_PAYLOAD = b'homelab-dashboard-ping'
+
+
+def _icmp_checksum(data: bytes) -> int:
+    """RFC-1071-Prüfsumme für ICMP-Pakete"""
+    if len(data) % 2:
+        data += b'\x00'
+    total = sum(struct.unpack(f'!{len(data) // 2}H', data))
+    total = (total >> 16) + (total & 0xffff)
+    total += total >> 16
+    return ~total & 0xffff
+
+
+class AsyncPinger:
+    """Nebenläufiger ICMP-Prober mit einem gemeinsamen Socket (Fallback: ping-Subprozess)"""
+
+    def __init__(self, timeout: float = 2.0, concurrency: int = 64):
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self.identifier = os.getpid() & 0xffff
+        self.sequence = 0
+        self.pending: Dict[int, tuple] = {}
+        self.sock: Optional[socket.socket] = None
+        self.raw = False
+        self.loop = None
+
+    async def start(self):
+        """ICMP-Socket öffnen und beim Event-Loop registrieren"""
+        self.loop = asyncio.get_running_loop()
+
+        # Unprivilegierter Datagram-Socket zuerst, Raw-Socket nur mit CAP_NET_RAW
+        for sock_type in (socket.SOCK_DGRAM, socket.SOCK_RAW):
+            try:
+                self.sock = socket.socket(socket.AF_INET, sock_type, socket.IPPROTO_ICMP)
+            except OSError:
+                continue
+            self.sock.setblocking(False)
+            # Großer Empfangspuffer, damit Reply-Bursts eines Sweeps nicht verworfen werden
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+            self.raw = sock_type == socket.SOCK_RAW
+            self.loop.add_reader(self.sock.fileno(), self._on_readable)
+            log_ping.info(f"✅ ICMP-Socket geöffnet ({'raw' if self.raw else 'datagram'})")
+            return
+
+        log_ping.warning("⚠️ Kein ICMP-Socket verfügbar, verwende ping-Subprozess")
+
+    def close(self):
+        """Socket schließen und offene Probes abbrechen"""
+        if self.sock is not None:
+            self.loop.remove_reader(self.sock.fileno())
+            self.sock.close()
+            self.sock = None
+        for future, _ in self.pending.values():
+            if not future.done():
+                future.cancel()
+        self.pending.clear()
+
+    def _on_readable(self):
+        """Echo-Replies vom Socket lesen und wartenden Probes zuordnen"""
+        while self.sock is not None:
+            try:
+                packet, (address, _) = self.sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                log_ping.error(f"❌ ICMP Read-Fehler: {e}")
+                return
+
+            # Raw-Sockets liefern den IP-Header mit
+            if self.raw:
+                packet = packet[(packet[0] & 0x0f) * 4:]
+            if len(packet) < 8:
+                continue
+
+            icmp_type, _, _, identifier, sequence = struct.unpack('!BBHHH', packet[:8])
+            if icmp_type != ICMP_ECHO_REPLY:
+                continue
+            # Beim Datagram-Socket setzt der Kernel die ID selbst und filtert die Replies
+            if self.raw and identifier != self.identifier:
+                continue
+
+            entry = self.pending.get(sequence)
+            if entry and entry[1] == address and not entry[0].done():
+                entry[0].set_result(time.perf_counter())
+
+    async def _resolve(self, host: str) -> str:
+        """Hostname in IPv4-Adresse auflösen"""
+        try:
+            socket.inet_aton(host)
+            return host
+        except OSError:
+            infos = await self.loop.getaddrinfo(host, None, family=socket.AF_INET, type=socket.SOCK_DGRAM)
+            return infos[0][4][0]
+
+    async def _icmp_ping(self, host: str) -> Optional[float]:
+        """Echo-Request über den gemeinsamen Socket senden"""
+        address = await self._resolve(host)
+
+        self.sequence = (self.sequence + 1) & 0xffff
+        sequence = self.sequence
+        header = struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0, 0, self.identifier, sequence)
+        checksum = _icmp_checksum(header + ICMP_PAYLOAD)
+        packet = struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0, checksum, self.identifier, sequence) + ICMP_PAYLOAD
+
+        future = self.loop.create_future()
+        self.pending[sequence] = (future, address)
+        try:
+            sent = time.perf_counter()
+            self.sock.sendto(packet, (address, 0))
+            received = await future
+            return (received - sent) * 1000
+        finally:
+            self.pending.pop(sequence, None)
+
+    async def _subprocess_ping(self, host: str) -> Optional[float]:
+        """Fallback: ping-Binary asynchron ausführen"""
+        process = await asyncio.create_subprocess_exec(
+            'ping', '-c', '1', '-W', str(max(1, math.ceil(self.timeout))), host,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        try:
+            stdout, _ = await process.communicate()
+        except asyncio.CancelledError:
+            process.kill()
+            raise
+
+        if process.returncode != 0:
+            return None
+        match = re.search(rb'time[=<]([\d.]+)', stdout)
+        return float(match.group(1)) if match else 0.0
+
+    async def ping(self, host: str) -> Optional[float]:
+        """Einzelnen Host pingen, liefert RTT in ms oder None"""
+        probe = self._icmp_ping(host) if self.sock is not None else self._subprocess_ping(host)
+        try:
+            return await asyncio.wait_for(probe, self.timeout)
+        except asyncio.TimeoutError:
+            return None
+        except OSError as e:
+            log_ping.warning(f"❌ Ping-Fehler für {host}: {e}")
+            return None
+
+    async def sweep(self, hosts: List[str]) -> Dict[str, Optional[float]]:
+        """Alle Hosts nebenläufig pingen (begrenzt durch concurrency)"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def probe(host):
+            async with semaphore:
+                return host, await self.ping(host)
+
+        return dict(await asyncio.gather(*(probe(host) for host in set(hosts))))
+
+
+# Ping-Historie: Rohwerte (~24h bei 30s Intervall), dann 5-Minuten- (7 Tage) und Stunden-Buckets (30 Tage)
+HISTORY_RAW_SAMPLES = 2880
+HISTORY_TIERS = ((300, 2016), (3600, 720))
+HISTORY_RECORD = struct.Struct('<IfB')
+# Datei: Kopf mit Schnappschuss aller Stufen, danach angehängte Rohproben; Neuschreiben stündlich
+HISTORY_MAGIC = b'PHS1'
+HISTORY_COUNT = struct.Struct('<I')
+HISTORY_BUCKET = struct.Struct('<BIIIdddI')
+HISTORY_COMPACT_INTERVAL = 3600
+
+
+class RingColumns:
+    """Spaltenweise Ringpuffer auf array-Basis (kompakt, feste Maximalgröße)"""
+
+    def __init__(self, capacity: int, columns):
+        self.capacity = capacity
+        self.names = [name for name, _ in columns]
+        self.columns = [array(typecode) for _, typecode in columns]
+        self.end = 0
+        self.full = False
+
+    def __len__(self) -> int:
+        return self.capacity if self.full else len(self.columns[0])
+
+    def append(self, row):
+        if not self.full:
+            for column, value in zip(self.columns, row):
+                column.append(value)
+            if len(self.columns[0]) == self.capacity:
+                self.full = True
+            return
+        for column, value in zip(self.columns, row):
+            column[self.end] = value
+        self.end = (self.end + 1) % self.capacity
+
+    def oldest(self) -> Optional[int]:
+        if not len(self):
+            return None
+        return self.columns[0][self.end if self.full else 0]
+
+    def newest(self) -> Optional[int]:
+        if not len(self):
+            return None
+        return self.columns[0][self.end - 1 if self.full else -1]
+
+    def _ordered(self) -> List[array]:
+        if self.full:
+            return [column[self.end:] + column[:self.end] for column in self.columns]
+        return [column[:] for column in self.columns]
+
+    def since(self, start: int) -> Dict[str, array]:
+        """Zeilen mit Zeitstempel >= start in zeitlicher Reihenfolge (erste Spalte = Zeitstempel)"""
+        ordered = self._ordered()
+        first = bisect.bisect_left(ordered[0], start)
+        return {name: column[first:] for name, column in zip(self.names, ordered)}
+
+    def dump(self) -> bytes:
+        """Zeilenzahl und Spalten in zeitlicher Reihenfolge"""
+        return HISTORY_COUNT.pack(len(self)) + b''.join(column.tobytes() for column in self._ordered())
+
+    def restore(self, content: bytes, offset: int) -> int:
+        """Mit dump() geschriebene Zeilen übernehmen, liefert das Ende im Puffer"""
+        (count,) = HISTORY_COUNT.unpack_from(content, offset)
+        offset += HISTORY_COUNT.size
+        for index, column in enumerate(self.columns):
+            size = count * column.itemsize
+            restored = array(column.typecode)
+            restored.frombytes(content[offset:offset + size])
+            # Kapazität kann seit dem Schreiben kleiner geworden sein: jüngste Zeilen behalten
+            self.columns[index] = restored[-self.capacity:]
+            offset += size
+        self.end = 0
+        self.full = len(self.columns[0]) == self.capacity
+        return offset
+
+
+def _percentile(values, fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(math.ceil(fraction * len(ordered))) - 1)]
+
+
+class HostHistory:
+    """RTT-/Verlust-Zeitreihe eines Hosts mit Downsampling-Stufen"""
+
+    AGGREGATE_COLUMNS = (('ts', 'I'), ('probes', 'H'), ('lost', 'H'), ('rtt_sum', 'f'),
+                         ('rtt_min', 'f'), ('rtt_max', 'f'), ('rtt_p95', 'f'))
+
+    def __init__(self):
+        self.raw = RingColumns(HISTORY_RAW_SAMPLES, (('ts', 'I'), ('rtt', 'f')))
+        self.tiers = [(width, RingColumns(capacity, self.AGGREGATE_COLUMNS)) for width, capacity in HISTORY_TIERS]
+        self.open_buckets: List[Optional[dict]] = [None] * len(HISTORY_TIERS)
+
+    def add(self, timestamp: int, rtt: Optional[float]):
+        """Probe speichern (rtt in ms, None = verloren) und in die Stufen einrechnen"""
+        self.raw.append((timestamp, math.nan if rtt is None else rtt))
+        rtts = [] if rtt is None else [rtt]
+        self._feed(0, timestamp, 1, 0 if rtt is not None else 1, rtt or 0.0,
+                   rtt if rtt is not None else math.inf, rtt if rtt is not None else -math.inf, rtts)
+
+    def _feed(self, level: int, timestamp: int, probes: int, lost: int, rtt_sum: float,
+              rtt_min: float, rtt_max: float, p95_values: List[float]):
+        width, ring = self.tiers[level]
+        start = timestamp - timestamp % width
+        bucket = self.open_buckets[level]
+
+        if bucket is not None and bucket['ts'] != start:
+            self._close(level)
+            bucket = None
+        if bucket is None:
+            bucket = self.open_buckets[level] = {'ts': start, 'probes': 0, 'lost': 0, 'rtt_sum': 0.0,
+                                                 'rtt_min': math.inf, 'rtt_max': -math.inf, 'p95': []}
+        bucket['probes'] += probes
+        bucket['lost'] += lost
+        bucket['rtt_sum'] += rtt_sum
+        bucket['rtt_min'] = min(bucket['rtt_min'], rtt_min)
+        bucket['rtt_max'] = max(bucket['rtt_max'], rtt_max)
+        bucket['p95'].extend(p95_values)
+
+    def _close(self, level: int):
+        """Offenen Bucket abschließen und an die nächst gröbere Stufe weiterreichen"""
+        bucket = self.open_buckets[level]
+        self.open_buckets[level] = None
+        p95 = _percentile(bucket['p95'], 0.95)
+        row = (bucket['ts'], min(bucket['probes'], 65535), min(bucket['lost'], 65535), bucket['rtt_sum'],
+               bucket['rtt_min'] if p95 is not None else math.nan,
+               bucket['rtt_max'] if p95 is not None else math.nan,
+               p95 if p95 is not None else math.nan)
+        self.tiers[level][1].append(row)
+        if level + 1 < len(self.tiers):
+            self._feed(level + 1, bucket['ts'], bucket['probes'], bucket['lost'], bucket['rtt_sum'],
+                       bucket['rtt_min'], bucket['rtt_max'], [p95] if p95 is not None else [])
+
+    def _source(self, start: int):
+        """Feinste Stufe, die das Fenster abdeckt"""
+        oldest = self.raw.oldest()
+        if not self.raw.full or (oldest is not None and oldest <= start):
+            return None
+        for width, ring in self.tiers:
+            oldest = ring.oldest()
+            if not ring.full or (oldest is not None and oldest <= start):
+                return ring
+        return self.tiers[-1][1]
+
+    def stats(self, window: int, now: int) -> dict:
+        """min/avg/p95 der RTT und Uptime im Fenster [now - window, now]"""
+        start = now - window
+        ring = self._source(start)
+        if ring is None:
+            rtts = self.raw.since(start)['rtt']
+            probes = len(rtts)
+            values = [rtt for rtt in rtts if not math.isnan(rtt)]
+            lost = probes - len(values)
+            rtt_min = min(values) if values else None
+            rtt_max = max(values) if values else None
+            rtt_avg = sum(values) / len(values) if values else None
+            rtt_p95 = _percentile(values, 0.95)
+            resolution = 'raw'
+        else:
+            rows = ring.since(start)
+            probes = sum(rows['probes'])
+            lost = sum(rows['lost'])
+            answered = probes - lost
+            mins = [value for value in rows['rtt_min'] if not math.isnan(value)]
+            maxs = [value for value in rows['rtt_max'] if not math.isnan(value)]
+            rtt_min = min(mins) if mins else None
+            rtt_max = max(maxs) if maxs else None
+            rtt_avg = sum(rows['rtt_sum']) / answered if answered else None
+            # Näherung: p95 über die p95-Werte der Buckets
+            rtt_p95 = _percentile([value for value in rows['rtt_p95'] if not math.isnan(value)], 0.95)
+            resolution = f"{next(width for width, tier in self.tiers if tier is ring)}s"
+
+        def rounded(value):
+            return round(value, 3) if value is not None else None
+
+        return {
+            'probes': probes,
+            'lost': lost,
+            'uptime': round(100.0 * (probes - lost) / probes, 3) if probes else None,
+            'rtt_min': rounded(rtt_min),
+            'rtt_avg': rounded(rtt_avg),
+            'rtt_p95': rounded(rtt_p95),
+            'rtt_max': rounded(rtt_max),
+            'resolution': resolution
+        }
+
+    def points(self, window: int, now: int) -> List[list]:
+        """Zeitreihe für Diagramme: [ts, rtt_avg, verlust_anteil] in der passenden Auflösung"""
+        start = now - window
+        ring = self._source(start)
+        if ring is None:
+            rows = self.raw.since(start)
+            return [[ts, None if math.isnan(rtt) else round(rtt, 3), 1.0 if math.isnan(rtt) else 0.0]
+                    for ts, rtt in zip(rows['ts'], rows['rtt'])]
+        rows = ring.since(start)
+        return [[ts, round(rtt_sum / (probes - lost), 3) if probes > lost else None, round(lost / probes, 3) if probes else None]
+                for ts, probes, lost, rtt_sum in zip(rows['ts'], rows['probes'], rows['lost'], rows['rtt_sum'])]
+
+    def dump(self) -> bytes:
+        """Rohwerte, alle Stufen und offene Buckets als Schnappschuss"""
+        parts = [self.raw.dump()]
+        parts.extend(ring.dump() for _, ring in self.tiers)
+        for bucket in self.open_buckets:
+            if bucket is None:
+                parts.append(HISTORY_BUCKET.pack(0, 0, 0, 0, 0.0, 0.0, 0.0, 0))
+                continue
+            parts.append(HISTORY_BUCKET.pack(1, bucket['ts'], bucket['probes'], bucket['lost'], bucket['rtt_sum'],
+                                             bucket['rtt_min'], bucket['rtt_max'], len(bucket['p95'])))
+            parts.append(array('d', bucket['p95']).tobytes())
+        return b''.join(parts)
+
+    def restore(self, content: bytes, offset: int) -> int:
+        """Mit dump() geschriebenen Zustand übernehmen, liefert das Ende im Puffer"""
+        offset = self.raw.restore(content, offset)
+        for _, ring in self.tiers:
+            offset = ring.restore(content, offset)
+        for level in range(len(self.open_buckets)):
+            present, ts, probes, lost, rtt_sum, rtt_min, rtt_max, count = HISTORY_BUCKET.unpack_from(content, offset)
+            offset += HISTORY_BUCKET.size
+            p95 = array('d')
+            p95.frombytes(content[offset:offset + count * p95.itemsize])
+            offset += count * p95.itemsize
+            self.open_buckets[level] = {'ts': ts, 'probes': probes, 'lost': lost, 'rtt_sum': rtt_sum, 'rtt_min': rtt_min,
+                                        'rtt_max': rtt_max, 'p95': p95.tolist()} if present else None
+        return offset
+
+
+class PingHistory:
+    """Zeitreihen aller Hosts, optional als Datei persistiert (Schnappschuss + angehängte Rohproben)"""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.hosts: Dict[str, HostHistory] = {}
+        self.lock = threading.Lock()
+        self.path = path
+        # Bereits eingelesener Stand der Datei (Inode, Offset)
+        self.inode: Optional[int] = None
+        self.offset = 0
+        self.compacted = 0.0
+
+    def _retention(self) -> int:
+        width, capacity = HISTORY_TIERS[-1]
+        return width * capacity
+
+    def _decode(self, content: bytes, offset: int = 0):
+        """Datensätze (ts, rtt, Hostname, Ende) aus der Datei lesen; abgeschnittenes Ende ignorieren"""
+        while offset + HISTORY_RECORD.size <= len(content):
+            timestamp, rtt, length = HISTORY_RECORD.unpack_from(content, offset)
+            offset += HISTORY_RECORD.size
+            if offset + length > len(content):
+                break
+            hostname = content[offset:offset + length].decode('utf-8', errors='replace')
+            offset += length
+            yield timestamp, rtt, hostname, offset
+
+    @staticmethod
+    def _encode(timestamp: int, rtt: Optional[float], hostname: str) -> bytes:
+        name = hostname.encode('utf-8')[:255]
+        return HISTORY_RECORD.pack(timestamp, math.nan if rtt is None else rtt, len(name)) + name
+
+    def _snapshot(self) -> bytes:
+        """Zustand aller Hosts mit Proben innerhalb der Aufbewahrungsdauer"""
+        cutoff = int(time.time()) - self._retention()
+        parts = []
+        for hostname, history in self.hosts.items():
+            newest = history.raw.newest()
+            if newest is None or newest < cutoff:
+                continue
+            name = hostname.encode('utf-8')[:255]
+            parts.append(bytes((len(name),)) + name + history.dump())
+        return HISTORY_COUNT.pack(len(parts)) + b''.join(parts)
+
+    @staticmethod
+    def _restore(content: bytes, offset: int) -> Dict[str, HostHistory]:
+        (count,) = HISTORY_COUNT.unpack_from(content, offset)
+        offset += HISTORY_COUNT.size
+        hosts = {}
+        for _ in range(count):
+            length = content[offset]
+            hostname = content[offset + 1:offset + 1 + length].decode('utf-8', errors='replace')
+            history = HostHistory()
+            offset = history.restore(content, offset + 1 + length)
+            hosts[hostname] = history
+        return hosts
+
+    def load(self):
+        """Persistierten Stand laden und die Datei als frischen Schnappschuss neu schreiben"""
+        count = self.follow()
+        self.compact()
+        if self.hosts:
+            log_ping.info(f"📈 Ping-Historie geladen: {len(self.hosts)} Hosts, {count} Proben nachgespielt")
+
+    def follow(self) -> int:
+        """Neu angehängte Proben einlesen; wurde die Datei neu geschrieben (anderer Inode, kürzer), von vorn"""
+        if self.path is None:
+            return 0
+        try:
+            info = self.path.stat()
+            if info.st_ino != self.inode or info.st_size < self.offset:
+                with self.lock:
+                    self.hosts = {}
+                self.inode, self.offset = info.st_ino, 0
+            if info.st_size == self.offset:
+                return 0
+            with open(self.path, 'rb') as f:
+                f.seek(self.offset)
+                content = f.read(info.st_size - self.offset)
+        except FileNotFoundError:
+            return 0
+        except OSError as e:
+            log_ping.error(f"❌ Ping-Historie nicht lesbar: {e}")
+            return 0
+
+        cutoff = int(time.time()) - self._retention()
+        consumed = count = 0
+        with self.lock:
+            if self.offset == 0 and content.startswith(HISTORY_MAGIC):
+                # Schnappschuss übernehmen statt Rohproben von 30 Tagen nachzuspielen
+                try:
+                    (length,) = HISTORY_COUNT.unpack_from(content, len(HISTORY_MAGIC))
+                    consumed = len(HISTORY_MAGIC) + HISTORY_COUNT.size + length
+                    self.hosts = self._restore(content[:consumed], len(HISTORY_MAGIC) + HISTORY_COUNT.size)
+                except (struct.error, IndexError) as e:
+                    log_ping.error(f"❌ Ping-Historie beschädigt, beginne leer: {e}")
+                    self.hosts, consumed = {}, len(content)
+            for timestamp, rtt, hostname, consumed in self._decode(content, consumed):
+                if timestamp < cutoff:
+                    continue
+                self.hosts.setdefault(hostname, HostHistory()).add(timestamp, None if math.isnan(rtt) else rtt)
+                count += 1
+        self.offset += consumed
+        return count
+
+    def compact(self):
+        """Datei durch einen Schnappschuss des aktuellen Stands ersetzen (nur der schreibende Prozess)"""
+        if self.path is None:
+            return
+        # Was ein vorheriger Leader noch angehängt hat, gehört in den Schnappschuss
+        self.follow()
+        with self.lock:
+            snapshot = self._snapshot()
+        content = HISTORY_MAGIC + HISTORY_COUNT.pack(len(snapshot)) + snapshot
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(self.path, content)
+            self.inode, self.offset = self.path.stat().st_ino, len(content)
+        except OSError as e:
+            log_ping.error(f"❌ Ping-Historie nicht geschrieben: {e}")
+        self.compacted = time.monotonic()
+
+    def record(self, timestamp: int, results: Dict[str, Optional[float]]):
+        """Ergebnisse eines Sweeps übernehmen (Ping-Thread)"""
+        with self.lock:
+            for hostname, rtt in results.items():
+                self.hosts.setdefault(hostname, HostHistory()).add(timestamp, rtt)
+
+        if self.path is not None:
+            if time.monotonic() - self.compacted >= HISTORY_COMPACT_INTERVAL:
+                # Schnappschuss enthält diese Proben bereits
+                self.compact()
+                return
+            records = b''.join(self._encode(timestamp, rtt, hostname) for hostname, rtt in results.items())
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, 'ab') as f:
+                    f.write(records)
+                self.offset += len(records)
+            except OSError as e:
+                log_ping.error(f"❌ Ping-Historie nicht geschrieben: {e}")
+
+    def stats(self, hostname: str, windows: Dict[str, int]) -> Optional[dict]:
+        now = int(time.time())
+        with self.lock:
+            history = self.hosts.get(hostname)
+            if history is None:
+                return None
+            return {label: history.stats(window, now) for label, window in windows.items()}
+
+    def points(self, hostname: str, window: int) -> Optional[List[list]]:
+        with self.lock:
+            history = self.hosts.get(hostname)
+            if history is None:
+                return None
+            return history.points(window, int(time.time()))
+
+    def hostnames(self) -> List[str]:
+        with self.lock:
+            return list(self.hosts)
+
+
+# Probe-Planung: Startverteilung, schnelle Nachprüfung nach Statuswechsel, Backoff-Obergrenze und Jitter
+PROBE_START_SPREAD = 5.0
+PROBE_RECHECK_DELAY = 5.0
+PROBE_MAX_BACKOFF = 300.0
+PROBE_MAX_BACKOFF_EXPONENT = 16
+PROBE_JITTER = 0.1
+
+
+class PingChecker:
+    """Host-Monitoring mit eigenem Fälligkeitszeitpunkt pro Host (Heap) statt Sweeps im festen Takt"""
+
+    def __init__(self, interval: float = 30, timeout: float = 2.0, concurrency: int = 64,
+                 history: Optional[PingHistory] = None):
+        self.ping_results = {}
+        self.history = history or PingHistory()
+        self.version = 0
+        self.on_change = None
+        self.ping_thread = None
+        self.running = False
+        self.interval = interval
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.wake_event: Optional[asyncio.Event] = None
+        self.probes: Dict[str, dict] = {}
+        self.schedule: List[tuple] = []
+        
+    def start_ping_monitoring(self, servers):
+        """Startet kontinuierliches Ping-Monitoring, läuft es schon: Ziele aktualisieren"""
+        if self.running:
+            self.update_targets(servers)
+            return
+            
+        self.running = True
+        self.loop = asyncio.new_event_loop()
+        self.ping_thread = threading.Thread(target=self._run_loop, args=(servers,), daemon=True)
+        self.ping_thread.start()
+        log_ping.info("✅ Ping-Monitoring gestartet")
+
+    def _run_loop(self, servers):
+        """Eigener Event-Loop für den Prober, blockiert den API-Loop nicht"""
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self._ping_loop(servers))
+        finally:
+            self.loop.close()
+
+    def update_targets(self, servers):
+        """Geänderte Serverliste an den Ping-Thread übergeben (threadsicher, Kopie der relevanten Felder)"""
+        targets = [
+            {'hostname': server.get('hostname'), 'host': server.get('host'), 'ping_interval': server.get('ping_interval')}
+            for server in servers
+        ]
+        if self.loop and self.running:
+            try:
+                self.loop.call_soon_threadsafe(self._set_targets, targets)
+            except RuntimeError:
+                # Loop bereits beendet
+                pass
+
+    def _set_targets(self, servers):
+        """Probe-Ziele abgleichen: neue Hosts verteilt einplanen, entfernte vergessen, Zustand der übrigen behalten"""
+        now = self.loop.time()
+        wanted = set()
+        for server in servers:
+            hostname, host = server.get('hostname'), server.get('host')
+            if not hostname or not host:
+                continue
+            wanted.add(hostname)
+            # Von Hand editierte Konfiguration wird nicht validiert
+            interval = max(float(server.get('ping_interval') or self.interval), PING_INTERVAL_MIN)
+            state = self.probes.get(hostname)
+            if state is None:
+                state = self.probes[hostname] = {'host': host, 'interval': interval, 'failures': 0, 'probing': False}
+                self._schedule(hostname, state, now + random.uniform(0, min(interval, PROBE_START_SPREAD)))
+                log_ping.info(f"➕ {hostname} wird überwacht")
+            elif state['host'] != host:
+                # Neue Adresse: Verlauf des Zustands gilt nicht mehr, bald neu prüfen
+                state.update(host=host, interval=interval, failures=0)
+                self._schedule(hostname, state, now + random.uniform(0, min(interval, PROBE_START_SPREAD)))
+            elif state['interval'] != interval:
+                state['interval'] = interval
+                if state['next_due'] > now + interval:
+                    self._schedule(hostname, state, now + random.uniform(0, interval))
+
+        for hostname in set(self.probes) - wanted:
+            # Heap-Einträge verfallen, laufende Probes verwerfen ihr Ergebnis
+            del self.probes[hostname]
+            if self.ping_results.pop(hostname, None) is not None:
+                self.version += 1
+            log_ping.info(f"➖ {hostname} wird nicht mehr überwacht")
+
+    def _schedule(self, hostname: str, state: dict, due: float):
+        """Nächste Probe vormerken; veraltete Heap-Einträge werden beim Entnehmen übersprungen"""
+        state['next_due'] = due
+        heapq.heappush(self.schedule, (due, hostname))
+        if self.wake_event is not None:
+            self.wake_event.set()
+
+    @staticmethod
+    def _next_delay(state: dict, status: str, changed: bool) -> float:
+        """Nach Wechsel schnell bestätigen, dauerhaft offline exponentiell seltener prüfen"""
+        interval = state['interval']
+        if changed:
+            delay = min(interval, PROBE_RECHECK_DELAY)
+        elif status == 'offline':
+            exponent = min(max(state['failures'] - 2, 0), PROBE_MAX_BACKOFF_EXPONENT)
+            delay = min(interval * 2 ** exponent, max(interval, PROBE_MAX_BACKOFF))
+        else:
+            delay = interval
+        return delay * random.uniform(1 - PROBE_JITTER, 1 + PROBE_JITTER)
+
+    async def _probe(self, pinger: AsyncPinger, hostname: str, state: dict):
+        """Einen Host prüfen, Status/Historie aktualisieren und neu einplanen"""
+        status, changed = 'offline', False
+        try:
+            started = time.monotonic()
+            rtt = await pinger.ping(state['host'])
+            PING_PROBE_SECONDS.observe(time.monotonic() - started)
+            if self.probes.get(hostname) is not state:
+                # Host wurde währenddessen entfernt
+                return
+
+            status = 'online' if rtt is not None else 'offline'
+            PING_PROBES.labels(status).inc()
+            if rtt is not None:
+                PING_RTT_SECONDS.labels(hostname).observe(rtt / 1000)
+            self.history.record(int(time.time()), {hostname: rtt})
+
+            previous = self.ping_results.get(hostname)
+            state['failures'] = state['failures'] + 1 if rtt is None else 0
+            changed = previous is not None and previous != status
+            if previous != status:
+                self.ping_results[hostname] = status
+                self.version += 1
+                if previous is not None:
+                    log_ping.info(f"{'🟢' if rtt is not None else '🔴'} {hostname} ist {status}")
+                if self.on_change:
+                    self.on_change(hostname, status)
+        finally:
+            # Auch nach einem Fehler weiter überwachen, sonst fällt der Host stillschweigend heraus
+            state['probing'] = False
+            if self.probes.get(hostname) is state:
+                self._schedule(hostname, state, self.loop.time() + self._next_delay(state, status, changed))
+
+    async def _ping_loop(self, servers):
+        """Fällige Hosts aus dem Heap nehmen und proben, bis zum nächsten Termin schlafen"""
+        self.wake_event = asyncio.Event()
+        pinger = AsyncPinger(timeout=self.timeout, concurrency=self.concurrency)
+        await pinger.start()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks = set()
+
+        async def run_probe(hostname, state):
+            async with semaphore:
+                try:
+                    await self._probe(pinger, hostname, state)
+                except Exception as e:
+                    log_ping.warning(f"⚠️ Probe für {hostname} fehlgeschlagen: {e}")
+
+        self._set_targets(servers)
+        try:
+            while self.running:
+                now = self.loop.time()
+                while self.schedule and self.schedule[0][0] <= now:
+                    due, hostname = heapq.heappop(self.schedule)
+                    state = self.probes.get(hostname)
+                    if state is None or state['next_due'] != due or state['probing']:
+                        continue
+                    state['probing'] = True
+                    PING_SCHEDULE_LAG_SECONDS.observe(now - due)
+                    task = asyncio.create_task(run_probe(hostname, state))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+
+                delay = self.schedule[0][0] - now if self.schedule else self.interval
+                self.wake_event.clear()
+                try:
+                    await asyncio.wait_for(self.wake_event.wait(), max(delay, 0))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            pinger.close()
+    
+    def get_status(self, server_id):
+        """Status für einen Server abrufen"""
+        return self.ping_results.get(server_id, 'unknown')
+    
+    def stop(self):
+        """Ping-Monitoring stoppen"""
+        self.running = False
+        if self.loop and self.wake_event:
+            try:
+                self.loop.call_soon_threadsafe(self.wake_event.set)
+            except RuntimeError:
+                # Loop bereits beendet
+                pass
+
+
+# Service-Checks: Takt, Standard-Timeout pro Service, Parallelität und Keep-alive-Pool
+SERVICE_CHECK_INTERVAL = 60
+SERVICE_CHECK_TIMEOUT = 5.0
+SERVICE_CHECK_CONCURRENCY = 32
+HTTP_POOL_IDLE_TIMEOUT = 90
+HTTP_MAX_BODY = 1 << 20
+
+
+class HTTPConnectionPool:
+    """Minimaler HTTP/1.1-Client mit Keep-alive-Verbindungen pro (scheme, host, port)"""
+
+    def __init__(self, idle_timeout: float = HTTP_POOL_IDLE_TIMEOUT):
+        self.idle_timeout = idle_timeout
+        self.idle: Dict[tuple, List[tuple]] = {}
+        # Interne Dienste nutzen oft selbstsignierte Zertifikate; geprüft wird Erreichbarkeit, nicht Vertrauen
+        self.ssl_context = ssl.create_default_context()
+        self.ssl_context.check_hostname = False
+        self.ssl_context.verify_mode = ssl.CERT_NONE
+
+    def _checkout(self, key: tuple):
+        connections = self.idle.get(key, [])
+        now = time.monotonic()
+        while connections:
+            reader, writer, last_used = connections.pop()
+            if now - last_used < self.idle_timeout and not writer.is_closing() and not reader.at_eof():
+                return reader, writer
+            writer.close()
+        return None
+
+    def _checkin(self, key: tuple, reader, writer):
+        self.idle.setdefault(key, []).append((reader, writer, time.monotonic()))
+
+    async def get(self, url: str) -> int:
+        """GET ausführen, Body verwerfen und Statuscode liefern (Timeout setzt der Aufrufer)"""
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f"unsupported URL: {url}")
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        key = (parts.scheme, parts.hostname, port)
+        target = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+        host_header = parts.hostname if parts.port is None else f"{parts.hostname}:{port}"
+        request = (f"GET {target} HTTP/1.1\r\nHost: {host_header}\r\nUser-Agent: HomeLab-Dashboard/1.0\r\n"
+                   f"Accept: */*\r\nConnection: keep-alive\r\n\r\n").encode('latin-1')
+
+        pooled = self._checkout(key)
+        if pooled is not None:
+            try:
+                return await self._exchange(key, *pooled, request)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # Server hat die Leerlauf-Verbindung geschlossen: einmal frisch verbinden
+                pooled[1].close()
+            except BaseException:
+                pooled[1].close()
+                raise
+
+        reader, writer = await asyncio.open_connection(
+            parts.hostname, port,
+            ssl=self.ssl_context if parts.scheme == 'https' else None,
+            server_hostname=parts.hostname if parts.scheme == 'https' else None
+        )
+        try:
+            return await self._exchange(key, reader, writer, request)
+        except BaseException:
+            writer.close()
+            raise
+
+    async def _exchange(self, key: tuple, reader, writer, request: bytes) -> int:
+        writer.write(request)
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed by server")
+        version, status = status_line.decode('latin-1').split(None, 2)[:2]
+        status = int(status)
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = headers.get('connection', '').lower() != 'close' and version != 'HTTP/1.0'
+        if status in (204, 304) or 100 <= status < 200:
+            pass
+        elif 'chunked' in headers.get('transfer-encoding', '').lower():
+            total = 0
+            while True:
+                size = int((await reader.readline()).split(b';')[0], 16)
+                total += size
+                if size == 0:
+                    while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass
+                    break
+                if total > HTTP_MAX_BODY:
+                    keep_alive = False
+                    break
+                await reader.readexactly(size + 2)
+        elif 'content-length' in headers:
+            length = int(headers['content-length'])
+            if length > HTTP_MAX_BODY:
+                keep_alive = False
+            else:
+                await reader.readexactly(length)
+        else:
+            # Ende nur durch Verbindungsabbau erkennbar
+            keep_alive = False
+
+        if keep_alive:
+            self._checkin(key, reader, writer)
+        else:
+            writer.close()
+        return status
+
+    def close_all(self):
+        for connections in self.idle.values():
+            for _, writer, _ in connections:
+                writer.close()
+        self.idle.clear()
+
+
+class ServiceChecker:
+    """TCP- und HTTP(S)-Checks aller Services aus services.json, nebenläufig im API-Event-Loop"""
+
+    def __init__(self, interval: float = SERVICE_CHECK_INTERVAL, concurrency: int = SERVICE_CHECK_CONCURRENCY):
+        self.interval = interval
+        self.concurrency = concurrency
+        self.results: Dict[str, dict] = {}
+        self.version = 0
+        self.on_change = None
+        self.pool = HTTPConnectionPool()
+        self.task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self._check_loop())
+            log_ping.info("✅ Service-Checks gestartet")
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        self.pool.close_all()
+
+    async def _check_loop(self):
+        while True:
+            try:
+                await self.check_all()
+            except Exception as e:
+                log_ping.error(f"❌ Service-Checks fehlgeschlagen: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def check_all(self):
+        """Alle Services prüfen und Ergebnisse übernehmen"""
+        services = list(config_cache['services'].get('services', []))
+        servers = config_cache.index('servers')
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(service):
+            server = servers.get(service.get('hostname'))
+            async with semaphore:
+                return service['name'], await self.check(service, server.get('host') if server else None)
+
+        results = dict(await asyncio.gather(*(run(service) for service in services)))
+        for name, result in results.items():
+            previous = self.results.get(name)
+            self.results[name] = result
+            if (previous or {}).get('status') != result['status'] and self.on_change:
+                self.on_change(name, result)
+        for name in set(self.results) - set(results):
+            del self.results[name]
+        self.version += 1
+
+        online = sum(1 for result in results.values() if result['status'] == 'online')
+        log_ping.debug(f"🩺 Service-Checks: {online}/{len(results)} online")
+
+    async def check(self, service: dict, host: Optional[str]) -> dict:
+        """TCP-Connect auf host:port und GET auf internal_url (sonst url), beides mit Timeout des Services"""
+        timeout = float(service.get('check_timeout') or SERVICE_CHECK_TIMEOUT)
+        if timeout <= 0:
+            # Von Hand eingetragener Unsinn würde jeden Check sofort scheitern lassen
+            timeout = SERVICE_CHECK_TIMEOUT
+        result = {'status': 'unknown', 'checked_at': datetime.now().isoformat(timespec='seconds')}
+
+        port = service.get('port')
+        if host and port:
+            started = time.perf_counter()
+            try:
+                _, writer = await asyncio.wait_for(asyncio.open_connection(host, int(port)), timeout)
+                writer.close()
+                result['tcp_ms'] = round((time.perf_counter() - started) * 1000, 2)
+                result['status'] = 'online'
+            except (OSError, asyncio.TimeoutError, ValueError) as e:
+                result['status'] = 'offline'
+                result['error'] = f"tcp: {e.__class__.__name__}"
+            SERVICE_CHECK_SECONDS.labels('tcp').observe(time.perf_counter() - started)
+
+        # Nur HTTP(S)-Adressen abfragen, andere Protokolle (rsync://, ...) bleiben beim TCP-Check
+        url = next((candidate for candidate in (service.get('internal_url'), service.get('url'))
+                    if candidate and urlsplit(candidate).scheme in ('http', 'https')), None)
+        if url:
+            started = time.perf_counter()
+            try:
+                status = await asyncio.wait_for(self.pool.get(url), timeout)
+                result['http_status'] = status
+                result['latency_ms'] = round((time.perf_counter() - started) * 1000, 2)
+                result['status'] = 'online' if status < 500 else 'error'
+                result.pop('error', None)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+                result['status'] = 'offline'
+                result['error'] = f"http: {e.__class__.__name__}"
+            SERVICE_CHECK_SECONDS.labels('http').observe(time.perf_counter() - started)
+
+        SERVICE_CHECKS.labels(result['status']).inc()
+        return result
+
+
+# Multi-Worker-Betrieb: Abgleich-Takt zwischen Leader und Followern, Rahmen der Relay-Verbindungen
+WORKER_SYNC_INTERVAL = 1.0
+RELAY_FRAME = struct.Struct('>cI')
+
+
+class SharedState:
+    """Ping-Status und Service-Check-Ergebnisse des Leaders in SQLite (WAL) für alle Worker"""
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit, Transaktionen explizit; Zugriffe serialisiert der Abgleich-Task
+        self.db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.executescript('''
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+            CREATE TABLE IF NOT EXISTS status (hostname TEXT PRIMARY KEY, status TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS health (name TEXT PRIMARY KEY, result TEXT NOT NULL);
+        ''')
+
+    def version(self) -> int:
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        return row[0] if row else 0
+
+    def publish(self, statuses: Dict[str, str], health: Dict[str, dict]):
+        """Gesamten Stand in einer Transaktion ersetzen und die Version erhöhen (Leader)"""
+        self.db.execute('BEGIN IMMEDIATE')
+        try:
+            self.db.execute('DELETE FROM status')
+            self.db.executemany('INSERT INTO status VALUES (?, ?)', statuses.items())
+            self.db.execute('DELETE FROM health')
+            self.db.executemany('INSERT INTO health VALUES (?, ?)',
+                                ((name, json.dumps(result)) for name, result in health.items()))
+            self.db.execute("INSERT INTO meta VALUES ('version', 1) ON CONFLICT(key) DO UPDATE SET value = value + 1")
+            self.db.execute('COMMIT')
+        except BaseException:
+            self.db.execute('ROLLBACK')
+            raise
+
+    def read(self) -> tuple:
+        """Version, Ping-Status und Service-Checks als konsistenten Stand lesen (Follower)"""
+        self.db.execute('BEGIN')
+        try:
+            statuses = dict(self.db.execute('SELECT hostname, status FROM status'))
+            health = {name: json.loads(result) for name, result in self.db.execute('SELECT name, result FROM health')}
+            return self.version(), statuses, health
+        finally:
+            self.db.execute('COMMIT')
+
+    def close(self):
+        self.db.close()
+
+
+class WorkerCoordinator:
+    """Leader-Wahl per Dateisperre: genau ein Worker prüft, die übrigen übernehmen dessen Stand"""
+
+    def __init__(self, runtime_dir: Path):
+        self.runtime_dir = runtime_dir
+        self.worker_id = str(os.getpid())
+        self.leader = False
+        self.lock_fd: Optional[int] = None
+        self.state: Optional[SharedState] = None
+        self.published: Optional[tuple] = None
+        self.synced_version = 0
+        self.task: Optional[asyncio.Task] = None
+        self.relay_server = None
+
+    def _socket_path(self, worker_id: str) -> Path:
+        return self.runtime_dir / f"worker-{worker_id}.sock"
+
+    def owner_socket(self, session_id: str) -> Optional[Path]:
+        """Relay-Socket des Workers, dem eine fremde SSH-Sitzung gehört (None: eigene oder unbekannt)"""
+        owner, separator, _ = session_id.partition('.')
+        if not separator or not owner.isdigit() or owner == self.worker_id:
+            return None
+        path = self._socket_path(owner)
+        return path if path.exists() else None
+
+    async def start(self):
+        self.runtime_dir.mkdir(parents=True, exist_ok=True)
+        self.state = SharedState(self.runtime_dir / 'state.db')
+        socket_path = self._socket_path(self.worker_id)
+        socket_path.unlink(missing_ok=True)
+        self.relay_server = await asyncio.start_unix_server(serve_relay, path=str(socket_path))
+
+        await asyncio.to_thread(ping_checker.history.follow)
+        if not await self._try_lead():
+            log_config.info(f"👥 Worker {self.worker_id} läuft als Follower")
+            await self._pull()
+        self.task = asyncio.create_task(self._sync_loop())
+
+    async def _try_lead(self) -> bool:
+        """Leader-Sperre nicht blockierend anfordern; gelingt das, Monitoring in diesem Prozess starten"""
+        fd = os.open(self.runtime_dir / 'leader.lock', os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+
+        self.lock_fd = fd
+        self.leader = True
+        log_config.info(f"👑 Worker {self.worker_id} ist Leader")
+        # Vor dem Start der Probes, sonst landen deren Proben in der ersetzten Datei
+        await asyncio.to_thread(ping_checker.history.compact)
+        await asyncio.to_thread(config_manager.backups.import_legacy)
+        start_monitoring()
+        return True
+
+    async def _sync_loop(self):
+        while True:
+            await asyncio.sleep(WORKER_SYNC_INTERVAL)
+            try:
+                if not self.leader:
+                    await self._pull()
+                    # Failover: Sperre wird frei, sobald der Leader-Prozess endet
+                    await self._try_lead()
+                if self.leader:
+                    await self._publish()
+            except Exception as e:
+                log_config.error(f"❌ Worker-Abgleich fehlgeschlagen: {e}")
+
+    async def _publish(self):
+        """Eigenen Stand schreiben, sobald sich Ping-Status oder Service-Checks geändert haben"""
+        key = (ping_checker.version, service_checker.version)
+        if key == self.published:
+            return
+        await asyncio.to_thread(self.state.publish, dict(ping_checker.ping_results), dict(service_checker.results))
+        self.published = key
+
+    async def _pull(self):
+        """Stand des Leaders übernehmen, Änderungen als Events an die eigenen SSE-Clients"""
+        await asyncio.to_thread(ping_checker.history.follow)
+        if await asyncio.to_thread(self.state.version) == self.synced_version:
+            return
+        version, statuses, health = await asyncio.to_thread(self.state.read)
+        self.synced_version = version
+
+        if statuses != ping_checker.ping_results:
+            for hostname in set(statuses) | set(ping_checker.ping_results):
+                status = statuses.get(hostname)
+                if ping_checker.ping_results.get(hostname) != status and status is not None:
+                    publish_status_event(hostname, status)
+            ping_checker.ping_results = statuses
+            ping_checker.version += 1
+
+        if health != service_checker.results:
+            for name, result in health.items():
+                if (service_checker.results.get(name) or {}).get('status') != result['status']:
+                    publish_health_event(name, result)
+            service_checker.results = health
+            service_checker.version += 1
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+        if self.relay_server is not None:
+            self.relay_server.close()
+            self._socket_path(self.worker_id).unlink(missing_ok=True)
+        if self.lock_fd is not None:
+            os.close(self.lock_fd)
+            self.lock_fd = None
+        if self.state is not None:
+            self.state.close()
+
+
+class RelaySocket:
+    """WebSocket-Ersatz über einen Unix-Socket: ein Worker reicht Frames an den Besitzer einer Sitzung weiter"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    async def receive(self) -> dict:
+        """Nächsten Frame im Format von WebSocket.receive() liefern"""
+        try:
+            kind, length = RELAY_FRAME.unpack(await self.reader.readexactly(RELAY_FRAME.size))
+            payload = await self.reader.readexactly(length)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return {'type': 'websocket.disconnect', 'code': 1006}
+        if kind == b'B':
+            return {'type': 'websocket.receive', 'bytes': payload}
+        return {'type': 'websocket.receive', 'text': payload.decode('utf-8')}
+
+    async def send_text(self, text: str):
+        await self._send(b'T', text.encode('utf-8'))
+
+    async def send_bytes(self, data: bytes):
+        await self._send(b'B', bytes(data))
+
+    async def _send(self, kind: bytes, payload: bytes):
+        self.writer.write(RELAY_FRAME.pack(kind, len(payload)) + payload)
+        await self.writer.drain()
+
+    def close(self):
+        self.writer.close()
+
+
+# Backup-Aufbewahrung: letzte N Stände plus je ein Stand pro Stunde/Tag
+BACKUP_KEEP_LAST = 20
+BACKUP_KEEP_HOURLY = 24
+BACKUP_KEEP_DAILY = 30
+
+
+class BackupStore:
+    """Inhaltsadressierte, komprimierte Konfigurations-Backups mit Aufbewahrungsstufen"""
+
+    def __init__(self, backup_dir: Path, keep_last: int = BACKUP_KEEP_LAST,
+                 keep_hourly: int = BACKUP_KEEP_HOURLY, keep_daily: int = BACKUP_KEEP_DAILY):
+        self.backup_dir = backup_dir
+        self.objects_dir = backup_dir / "objects"
+        self.manifest_file = backup_dir / "manifest.json"
+        self.keep_last = keep_last
+        self.keep_hourly = keep_hourly
+        self.keep_daily = keep_daily
+        self.lock = threading.Lock()
+        # Mehrere Prozesse (Worker, Tools) teilen das Verzeichnis: Änderungen unter Dateisperre
+        self.lock_file = backup_dir / "backups.lock"
+        self.manifest_stamp: Optional[tuple] = None
+
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.entries: Dict[str, List[dict]] = {}
+        self._refresh()
+
+    @contextmanager
+    def _locked(self):
+        """Thread- und Prozesssperre halten, Manifest vorher vom aktuellen Stand laden"""
+        with self.lock:
+            fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                self._refresh()
+                yield
+            finally:
+                os.close(fd)
+
+    def _refresh(self):
+        """Manifest neu laden, wenn ein anderer Prozess es geschrieben hat"""
+        try:
+            file_stat = self.manifest_file.stat()
+        except FileNotFoundError:
+            self.entries, self.manifest_stamp = {}, None
+            return
+        stamp = (file_stat.st_ino, file_stat.st_mtime_ns, file_stat.st_size)
+        if stamp == self.manifest_stamp:
+            return
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+            self.manifest_stamp = stamp
+        except (OSError, ValueError) as e:
+            log_config.error(f"❌ Backup-Manifest nicht lesbar: {e}")
+
+    def _save_manifest(self):
+        write_atomic(self.manifest_file, json.dumps(self.entries, indent=2).encode('utf-8'))
+        file_stat = self.manifest_file.stat()
+        self.manifest_stamp = (file_stat.st_ino, file_stat.st_mtime_ns, file_stat.st_size)
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / f"{digest}.json.gz"
+
+    def import_legacy(self):
+        """Alte Einzeldatei-Backups (<typ>_<YYYYmmdd_HHMMSS>.json) übernehmen und entfernen (nur ein Prozess)"""
+        legacy_files = sorted(self.backup_dir.glob("*_*_*.json"), key=lambda p: p.name[-20:])
+        if not legacy_files:
+            return
+
+        imported = 0
+        for legacy_file in legacy_files:
+            try:
+                timestamp = datetime.strptime(legacy_file.stem[-15:], "%Y%m%d_%H%M%S")
+                content = legacy_file.read_bytes()
+            except ValueError:
+                continue
+            except FileNotFoundError:
+                # Schon von einem anderen Prozess übernommen
+                continue
+            self.add(legacy_file.stem[:-16], content, timestamp)
+            legacy_file.unlink(missing_ok=True)
+            imported += 1
+        if imported:
+            log_config.info(f"📦 {imported} alte Backups übernommen")
+
+    def add(self, config_type: str, content: bytes, timestamp: Optional[datetime] = None) -> Optional[str]:
+        """Stand sichern, identischer Inhalt zum letzten Backup wird übersprungen"""
+        digest = hashlib.sha256(content).hexdigest()
+        timestamp = timestamp or datetime.now()
+
+        with self._locked():
+            entries = self.entries.setdefault(config_type, [])
+            if entries and entries[-1]['hash'] == digest:
+                return None
+
+            object_file = self._object_path(digest)
+            if not object_file.exists():
+                write_atomic(object_file, gzip.compress(content, mtime=0))
+
+            entries.append({
+                'hash': digest,
+                'timestamp': timestamp.isoformat(timespec='seconds'),
+                'size': len(content)
+            })
+            entries.sort(key=lambda entry: entry['timestamp'])
+            self._prune(config_type)
+            self._save_manifest()
+        return digest
+
+    def _prune(self, config_type: str):
+        """Aufbewahrung anwenden: letzte N, neuester Stand pro Stunde und pro Tag"""
+        entries = self.entries[config_type]
+        now = datetime.now()
+        keep = set(range(max(0, len(entries) - self.keep_last), len(entries)))
+
+        # Einträge sind aufsteigend sortiert, der neueste pro Bucket gewinnt
+        hourly, daily = {}, {}
+        for index, entry in enumerate(entries):
+            timestamp = datetime.fromisoformat(entry['timestamp'])
+            if now - timestamp <= timedelta(hours=self.keep_hourly):
+                hourly[timestamp.strftime("%Y%m%d%H")] = index
+            if now - timestamp <= timedelta(days=self.keep_daily):
+                daily[timestamp.date()] = index
+        keep |= set(hourly.values()) | set(daily.values())
+
+        if len(keep) == len(entries):
+            return
+        self.entries[config_type] = [entry for index, entry in enumerate(entries) if index in keep]
+
+        # Nicht mehr referenzierte Objekte löschen
+        referenced = {entry['hash'] for type_entries in self.entries.values() for entry in type_entries}
+        for object_file in self.objects_dir.glob("*.json.gz"):
+            if object_file.name[:-len(".json.gz")] not in referenced:
+                object_file.unlink()
+
+    def list(self, config_type: Optional[str] = None) -> List[dict]:
+        """Backups auflisten, neueste zuerst"""
+        with self.lock:
+            self._refresh()
+            backups = [
+                {'config_type': entry_type, **entry}
+                for entry_type, entries in self.entries.items()
+                if config_type is None or entry_type == config_type
+                for entry in entries
+            ]
+        return sorted(backups, key=lambda backup: backup['timestamp'], reverse=True)
+
+    def get(self, config_type: str, digest: str) -> Optional[bytes]:
+        """Inhalt eines Backups lesen"""
+        with self.lock:
+            self._refresh()
+            if not any(entry['hash'] == digest for entry in self.entries.get(config_type, [])):
+                return None
+        try:
+            return gzip.decompress(self._object_path(digest).read_bytes())
+        except FileNotFoundError:
+            # Zwischen Manifest-Abgleich und Lesen von einem anderen Prozess aufgeräumt
+            return None
+
+
+class ConfigManager:
+    """Verwaltet Konfigurationsdateien mit Backup-Funktionalität"""
+    
+    def __init__(self):
+        self.config_dir = Path("config")
+        self.backup_dir = Path("config/backups")
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+        self.backups = BackupStore(self.backup_dir)
+    
+    def create_backup(self, config_type: str):
+        """Erstellt Backup einer Konfigurationsdatei"""
+        config_file = self.config_dir / f"{config_type}.json"
+        if config_file.exists():
+            digest = self.backups.add(config_type, config_file.read_bytes())
+            if digest:
+                log_config.info(f"📦 Backup erstellt: {config_type} ({digest[:12]})")
+    
+    def write_atomic(self, config_file: Path, content: str):
+        """Konfiguration atomar und durabel ersetzen (nie halb geschriebene Dateien)"""
+        write_atomic(config_file, content.encode('utf-8'))
+    
+    def save_config(self, config_type: str, content: str):
+        """Speichert serialisierte Konfiguration mit Backup"""
+        try:
+            # Backup erstellen
+            self.create_backup(config_type)
+            
+            # Neue Konfiguration atomar speichern
+            config_file = self.config_dir / f"{config_type}.json"
+            self.write_atomic(config_file, content)
+            
+            log_config.info(f"✅ Konfiguration gespeichert: {config_file}")
+            return True
+            
+        except Exception as e:
+            log_config.error(f"❌ Fehler beim Speichern von {config_type}: {e}")
+            return False
+
+
+# Config-Watcher: inotify-Maske (IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE) und Polling-Intervall
+INOTIFY_MASK = 0x008 | 0x080 | 0x100 | 0x200
+CONFIG_POLL_INTERVAL = 2.0
+
+# Schreib-Coalescing: Änderungen innerhalb dieses Fensters landen in einem Schreibvorgang
+CONFIG_FLUSH_DELAY = 0.2
+
+
+def _inotify_watch(directories) -> Optional[int]:
+    """inotify-Deskriptor für die Config-Verzeichnisse anlegen (nur Linux)"""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        inotify_fd = libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+    except (OSError, AttributeError):
+        return None
+    if inotify_fd < 0:
+        return None
+
+    for directory in directories:
+        if libc.inotify_add_watch(inotify_fd, str(directory).encode(), INOTIFY_MASK) < 0:
+            os.close(inotify_fd)
+            return None
+    return inotify_fd
+
+
+# Volltextsuche: indizierte Felder pro Typ und Tokenizer (Wörter, kleingeschrieben)
+SEARCH_FIELDS = {
+    'servers': ('hostname', 'description', 'notes', 'tags'),
+    'services': ('name', 'hostname', 'description', 'tags')
+}
+SEARCH_TOKEN = re.compile(r'\w+')
+
+
+class IndexedList:
+    """Hash-Index auf eine Konfigurationsliste (Schlüssel -> Eintrag, Feldwert -> Einträge)
+    
+    Die Liste wird in place verändert, der Index wird bei jeder Mutation
+    inkrementell nachgeführt.
+    """
+
+    def __init__(self, items: List[dict], key: str, group_fields=(), text_fields=()):
+        self.items = items
+        self.key = key
+        self.group_fields = group_fields
+        self.text_fields = text_fields
+        self.by_key: Dict[str, dict] = {}
+        self.positions: Dict[str, int] = {}
+        self.groups: Dict[str, Dict[str, Dict[str, dict]]] = {field: {} for field in group_fields}
+        # Invertierter Index: Wort -> Schlüssel, sortiertes Vokabular für Präfixsuche
+        self.postings: Dict[str, set] = {}
+        self.vocabulary: List[str] = []
+
+        for position, item in enumerate(items):
+            if item[key] in self.by_key:
+                log_config.warning(f"⚠️ Doppelter Schlüssel {key}={item[key]!r}, nur erster Eintrag indiziert")
+                continue
+            self._index(item, position)
+
+    def _index(self, item: dict, position: int):
+        item_key = item[self.key]
+        self.by_key[item_key] = item
+        self.positions[item_key] = position
+        for field in self.group_fields:
+            self.groups[field].setdefault(item.get(field), {})[item_key] = item
+        for token in self._tokens(item):
+            postings = self.postings.get(token)
+            if postings is None:
+                postings = self.postings[token] = set()
+                bisect.insort(self.vocabulary, token)
+            postings.add(item_key)
+
+    def _unindex(self, item: dict):
+        item_key = item[self.key]
+        del self.by_key[item_key]
+        del self.positions[item_key]
+        for field in self.group_fields:
+            group = self.groups[field].get(item.get(field))
+            if group is not None:
+                group.pop(item_key, None)
+                if not group:
+                    del self.groups[field][item.get(field)]
+        for token in self._tokens(item):
+            postings = self.postings.get(token)
+            if postings is not None:
+                postings.discard(item_key)
+                if not postings:
+                    del self.postings[token]
+                    del self.vocabulary[bisect.bisect_left(self.vocabulary, token)]
+
+    def _tokens(self, item: dict) -> set:
+        words = []
+        for field in self.text_fields:
+            value = item.get(field)
+            if isinstance(value, list):
+                words.extend(str(entry) for entry in value)
+            elif value:
+                words.append(str(value))
+        return set(SEARCH_TOKEN.findall(' '.join(words).lower()))
+
+    def search(self, query: str) -> Optional[set]:
+        """Schlüssel der Einträge, die jedes Suchwort als Wortanfang enthalten (None: keine Suchwörter)"""
+        result = None
+        for term in set(SEARCH_TOKEN.findall(query.lower())):
+            matches = set()
+            position = bisect.bisect_left(self.vocabulary, term)
+            while position < len(self.vocabulary) and self.vocabulary[position].startswith(term):
+                matches |= self.postings[self.vocabulary[position]]
+                position += 1
+            result = matches if result is None else result & matches
+            if not result:
+                return set()
+        return result
+
+    def __contains__(self, item_key) -> bool:
+        return item_key in self.by_key
+
+    def get(self, item_key) -> Optional[dict]:
+        return self.by_key.get(item_key)
+
+    def group(self, field: str, value) -> List[dict]:
+        """Alle Einträge mit item[field] == value"""
+        return list(self.groups[field].get(value, {}).values())
+
+    def add(self, item: dict):
+        self.items.append(item)
+        self._index(item, len(self.items) - 1)
+
+    def replace(self, item_key, item: dict) -> Optional[dict]:
+        """Eintrag an gleicher Position ersetzen (Schlüssel darf sich ändern)"""
+        position = self.positions.get(item_key)
+        if position is None:
+            return None
+        previous = self.items[position]
+        self._unindex(previous)
+        self.items[position] = item
+        self._index(item, position)
+        return previous
+
+    def remove(self, item_key) -> Optional[dict]:
+        position = self.positions.get(item_key)
+        if position is None:
+            return None
+        item = self.items.pop(position)
+        self._unindex(item)
+
+        # Positionen der Nachfolger verschieben (das Löschen aus der Liste ist ohnehin O(n))
+        for i in range(position, len(self.items)):
+            following_key = self.items[i][self.key]
+            if self.positions.get(following_key) == i + 1:
+                self.positions[following_key] = i
+        return item
+
+
+class ConfigStore:
+    """In-Memory-Konfiguration über einem Storage-Backend, lädt nur bei geänderter Signatur neu"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.data: Dict[str, Optional[dict]] = {config_type: None for config_type in backend.config_types}
+        self.stamps: Dict[str, Optional[tuple]] = {config_type: None for config_type in backend.config_types}
+        self.version = 0
+        self.on_reload = None
+        self.subscribers = []
+        self.lock = threading.RLock()
+        self.indexes: Dict[str, IndexedList] = {}
+        self.encoded: Dict[str, tuple] = {}
+        self.pending_flushes: Dict[str, asyncio.Future] = {}
+        self.flush_tasks = set()
+        # Mehr-Worker-Betrieb: Sperrdatei für Änderungen, gehalten von begin() bis zum Flush
+        self.lock_path: Optional[Path] = None
+        self.lock_fd: Optional[int] = None
+        self.write_lock: Optional[asyncio.Lock] = None
+        self.watch_thread: Optional[threading.Thread] = None
+        self.watching = False
+        # Event-Loop, in dem Änderungen aus der Überwachung übernommen werden
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def __getitem__(self, config_type: str) -> dict:
+        data = self.data[config_type]
+        if data is None:
+            data = self.reload(config_type)
+        return data
+
+    def encode(self, config_type: str) -> bytes:
+        """Serialisierte Konfiguration für GET-Routen, neu erzeugt nur nach einer Änderung"""
+        if self.data[config_type] is None:
+            self.reload(config_type)
+        # Version vor dem Serialisieren lesen, spätere Änderungen erzwingen neues Encoding
+        version = self.version
+        cached = self.encoded.get(config_type)
+        if cached is not None and cached[0] == version:
+            CONFIG_CACHE_HIT.inc()
+            return cached[1]
+        CONFIG_CACHE_MISS.inc()
+        body = json_dumps(self[config_type])
+        self.encoded[config_type] = (version, body)
+        return body
+
+    def keys(self):
+        return list(self.data)
+
+    def values(self):
+        return [self[config_type] for config_type in self.data]
+
+    def reload(self, config_type: str) -> dict:
+        """Konfiguration aus dem Backend laden"""
+        started = time.perf_counter()
+        with self.lock:
+            stamp = self.backend.stamp(config_type)
+            previous = self.data[config_type]
+
+            if previous is not None and stamp is not None:
+                # Halb geschriebene Dateien nicht übernehmen, beim nächsten Event erneut versuchen
+                try:
+                    data = self.backend.read(config_type)
+                    log_config.info(f"🔄 {self.backend.describe(config_type)} neu geladen")
+                except (OSError, ValueError, sqlite3.Error) as e:
+                    log_config.warning(f"⚠️ {self.backend.describe(config_type)} nicht lesbar, "
+                                       f"behalte bisherige Konfiguration: {e}")
+                    return previous
+            else:
+                data = self.backend.load(config_type)
+                if data is None:
+                    data = get_fallback_config(config_type)
+
+            self.data[config_type] = data
+            self.stamps[config_type] = stamp
+            self.version += 1
+            CONFIG_LOAD_SECONDS.labels(config_type).observe(time.perf_counter() - started)
+            return data
+
+    def load_all(self):
+        """Alle Konfigurationsdateien laden"""
+        for config_type in self.data:
+            self.reload(config_type)
+
+    def refresh(self):
+        """Nur geänderte Konfigurationen neu laden (Lesen im Aufrufer, Übernahme im Event-Loop)"""
+        changes = self._read_changes()
+        if not changes:
+            return
+        if self.loop is not None:
+            # Zwischen zwei Handlern übernehmen, nie parallel zu einer Änderung vor commit()
+            self.loop.call_soon_threadsafe(self._apply_changes, changes)
+        else:
+            self._apply_changes(changes)
+
+    def _read_changes(self) -> list:
+        """Geänderte Typen lesen, ohne die Daten anzufassen: [(config_type, data, stamp, bisherige Signatur)]"""
+        changes = []
+        for config_type in self.data:
+            # Signatur unter Lock prüfen, eigene Schreibvorgänge aktualisieren sie unter demselben Lock
+            with self.lock:
+                stamp, previous_stamp = self.backend.stamp(config_type), self.stamps[config_type]
+                if self.data[config_type] is None or stamp == previous_stamp:
+                    continue
+                # Halb geschriebene Dateien nicht übernehmen, beim nächsten Event erneut versuchen
+                started = time.perf_counter()
+                try:
+                    data = self.backend.read(config_type)
+                except (OSError, ValueError, sqlite3.Error) as e:
+                    log_config.warning(f"⚠️ {self.backend.describe(config_type)} nicht lesbar, "
+                                       f"behalte bisherige Konfiguration: {e}")
+                    continue
+                CONFIG_LOAD_SECONDS.labels(config_type).observe(time.perf_counter() - started)
+            changes.append((config_type, data, stamp, previous_stamp))
+        return changes
+
+    def _apply_changes(self, changes: list):
+        """Gelesene Stände übernehmen (Event-Loop)"""
+        for config_type, data, stamp, previous_stamp in changes:
+            with self.lock:
+                if config_type in self.pending_flushes:
+                    # Vorgemerkte Änderung nicht verwerfen, der Flush schreibt sie (und setzt die Signatur)
+                    continue
+                if self.stamps[config_type] != previous_stamp:
+                    # Inzwischen selbst gespeichert oder neu geladen, der gelesene Stand ist veraltet
+                    continue
+                self.data[config_type] = data
+                self.stamps[config_type] = stamp
+                self.version += 1
+            log_config.info(f"🔄 {self.backend.describe(config_type)} neu geladen")
+            if self.on_reload:
+                self.on_reload(config_type)
+            self._notify(config_type)
+
+    def subscribe(self, callback):
+        """callback(config_type) nach jedem Speichern oder Neuladen aufrufen"""
+        self.subscribers.append(callback)
+
+    def _notify(self, config_type: str):
+        for callback in self.subscribers:
+            try:
+                callback(config_type)
+            except Exception as e:
+                log_config.error(f"❌ Fehler in Config-Subscriber: {e}")
+
+    def index(self, config_type: str) -> IndexedList:
+        """Index der Liste liefern, nach Reload oder ersetzter Liste neu aufbauen"""
+        items = self[config_type][config_type]
+        index = self.indexes.get(config_type)
+        if index is None or index.items is not items:
+            key, group_fields = CONFIG_INDEXES[config_type]
+            index = IndexedList(items, key, group_fields, SEARCH_FIELDS.get(config_type, ()))
+            self.indexes[config_type] = index
+        return index
+
+    def replace(self, config_type: str, data: dict):
+        """Konfiguration komplett ersetzen (danach commit() aufrufen)"""
+        self.data[config_type] = data
+
+    async def begin(self):
+        """Vor jeder Änderung aufrufen (danach ohne await bis commit())
+        
+        Im Mehr-Worker-Betrieb wird die prozessübergreifende Schreibsperre geholt
+        und Änderungen anderer Worker werden geladen. Die Sperre gilt bis zum
+        nächsten Flush, so setzt jede Änderung auf dem gespeicherten Stand auf.
+        """
+        if self.lock_path is None:
+            return
+        if self.write_lock is None:
+            self.write_lock = asyncio.Lock()
+        async with self.write_lock:
+            if self.lock_fd is None:
+                # Nicht abbrechbar: eine geholte Sperre gibt nur der dabei geplante Flush wieder frei
+                await asyncio.shield(self._acquire_write_lock())
+
+    async def _acquire_write_lock(self):
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        await asyncio.to_thread(fcntl.flock, fd, fcntl.LOCK_EX)
+        self.lock_fd = fd
+        self._schedule_flush()
+        # Lesen im Thread, Übernahme hier im Loop vor der Änderung des Aufrufers
+        self._apply_changes(await asyncio.to_thread(self._read_changes))
+
+    def _release_write_lock(self):
+        if self.lock_fd is not None:
+            fcntl.flock(self.lock_fd, fcntl.LOCK_UN)
+            os.close(self.lock_fd)
+            self.lock_fd = None
+
+    async def commit(self, config_type: str) -> bool:
+        """Änderung speichern; Bursts werden zu einem Schreibvorgang pro Zeitfenster zusammengefasst"""
+        future = self.pending_flushes.get(config_type)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self.pending_flushes[config_type] = future
+            self._schedule_flush()
+        return await asyncio.shield(future)
+
+    def _schedule_flush(self):
+        task = asyncio.create_task(self._delayed_flush())
+        self.flush_tasks.add(task)
+        task.add_done_callback(self.flush_tasks.discard)
+
+    async def _delayed_flush(self):
+        await asyncio.sleep(CONFIG_FLUSH_DELAY)
+        await self._flush()
+
+    async def _flush(self):
+        """Vorgemerkte Typen speichern, im Mehr-Worker-Betrieb danach die Schreibsperre freigeben"""
+        if self.write_lock is None:
+            await self._write_pending()
+            return
+        # Wartet auch begin() ab, damit keine Änderung zwischen Schreiben und Freigabe ohne Sperre entsteht
+        async with self.write_lock:
+            try:
+                await self._write_pending()
+            finally:
+                self._release_write_lock()
+
+    async def _write_pending(self):
+        """Alle vorgemerkten Typen in einem Schreibvorgang außerhalb des Event-Loops speichern (SQLite: eine Transaktion)"""
+        pending, self.pending_flushes = self.pending_flushes, {}
+        if not pending:
+            return
+
+        try:
+            # Serialisieren im Event-Loop, dort finden alle Mutationen statt
+            payloads = {config_type: self.backend.serialize(config_type, self.data[config_type]) for config_type in pending}
+            saved = await asyncio.to_thread(self._write, payloads)
+            if saved:
+                self.version += 1
+            else:
+                # Speichern fehlgeschlagen: gespeicherten Stand wiederherstellen
+                for config_type in pending:
+                    await asyncio.to_thread(self.reload, config_type)
+        except Exception as e:
+            log_config.error(f"❌ Fehler beim Speichern von {', '.join(pending)}: {e}")
+            saved = False
+        for config_type, future in pending.items():
+            future.set_result(saved)
+            self._notify(config_type)
+
+    def _write(self, payloads: dict) -> bool:
+        """Im Backend speichern und Signaturen aktualisieren (Worker-Thread)"""
+        started = time.perf_counter()
+        with self.lock:
+            if not self.backend.save(payloads):
+                return False
+            for config_type in payloads:
+                self.stamps[config_type] = self.backend.stamp(config_type)
+        elapsed = time.perf_counter() - started
+        for config_type in payloads:
+            CONFIG_SAVE_SECONDS.labels(config_type).observe(elapsed)
+        return True
+
+    async def flush_pending(self):
+        """Alle vorgemerkten Änderungen sofort speichern (z.B. beim Beenden)"""
+        await self._flush()
+
+    def start_watching(self):
+        """Datei-Überwachung im Hintergrund starten"""
+        if self.watching:
+            return
+
+        self.watching = True
+        try:
+            self.loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.loop = None
+        self.watch_thread = threading.Thread(target=self._watch_loop, daemon=True)
+        self.watch_thread.start()
+
+    def stop_watching(self):
+        """Datei-Überwachung stoppen"""
+        self.watching = False
+
+    def _watch_loop(self):
+        """Auf inotify-Events warten, ohne inotify per stat-Polling prüfen"""
+        directories = self.backend.watch_directories()
+        inotify_fd = _inotify_watch(directories) if directories else None
+        if inotify_fd is not None:
+            log_config.info("👀 Config-Überwachung gestartet (inotify)")
+        else:
+            log_config.info("👀 Config-Überwachung gestartet (stat-Polling)")
+
+        try:
+            while self.watching:
+                if inotify_fd is not None:
+                    ready, _, _ = select.select([inotify_fd], [], [], CONFIG_POLL_INTERVAL)
+                    if not ready:
+                        continue
+                    # Event-Inhalt egal, refresh() vergleicht die Signaturen
+                    os.read(inotify_fd, 65536)
+                    time.sleep(0.05)
+                else:
+                    time.sleep(CONFIG_POLL_INTERVAL)
+
+                try:
+                    self.refresh()
+                except Exception as e:
+                    log_config.error(f"❌ Config-Überwachung Fehler: {e}")
+        finally:
+            if inotify_fd is not None:
+                os.close(inotify_fd)
+
+
+# Event-Stream: Verlauf für Reconnects, Queue-Größe pro Client, Keepalive-Intervall
+EVENT_HISTORY = 256
+EVENT_QUEUE_SIZE = 1000
+SSE_KEEPALIVE = 15
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Konfiguration laden, Ping-Monitoring, Service-Checks und Config-Überwachung starten"""
+    event_broker.loop = asyncio.get_running_loop()
+    ping_checker.on_change = publish_status_event
+    service_checker.on_change = publish_health_event
+    config_cache.on_reload = publish_reload_event
+    config_cache.subscribe(sync_ping_targets)
+    load_all_configs()
+    if worker_coordinator is not None:
+        event_broker.epoch = worker_coordinator.worker_id
+        await worker_coordinator.start()
+    else:
+        await asyncio.to_thread(ping_checker.history.load)
+        await asyncio.to_thread(config_manager.backups.import_legacy)
+        start_monitoring()
+    yield
+    await config_cache.flush_pending()
+    config_cache.stop_watching()
+    if worker_coordinator is not None:
+        await worker_coordinator.stop()
+    ping_checker.stop()
+    await service_checker.stop()
+    for ssh_conn in list(connections.values()):
+        ssh_conn.disconnect()
+    connections.clear()
+    ssh_pool.close_all()
+    await asyncio.to_thread(ssh_sessions.close_all)
+
+
+# FastAPI App
+app = FastAPI(title="HomeLab Dashboard", lifespan=lifespan, default_response_class=FastJSONResponse)
+app.add_middleware(MetricsMiddleware)
+
+# Static Files
+app.mount("/static", StaticFiles(directory="static"), name="static")
+
+# In-Memory Session Store (session_id -> Sitzung, auch ohne gekoppelten WebSocket)
+connections: Dict[str, SSHConnection] = {}
+
+
+def expire_session(session_id: str):
+    """Abgekoppelte Sitzung nach Ablauf der Gnadenfrist beenden"""
+    ssh_conn = connections.get(session_id)
+    if ssh_conn and ssh_conn.websocket is None:
+        log_ssh.info(f"⌛ Gnadenfrist abgelaufen, beende Sitzung {session_id}")
+        ssh_conn.disconnect()
+        del connections[session_id]
+
+config_paths = {config_type: Path("config") / filename for config_type, filename in CONFIG_FILES.items()}
+
+settings_path = Path("config/settings.json")
+
+DEFAULT_SETTINGS = {
+    'ssh': {
+        # 'subprocess' (ssh-Binary mit lokalem PTY) oder 'asyncssh' (im Event-Loop)
+        'backend': 'subprocess',
+        'keepalive_interval': 15,
+        'keepalive_count_max': 3
+    },
+    'logging': {
+        'level': 'INFO',
+        # 'text' oder 'json' (eine Zeile pro Eintrag)
+        'format': 'text',
+        # Debug-Ausgaben pro Chunk/Tastendruck/Action (homelab.ssh.io)
+        'hot_path': False,
+        # Token-Bucket für homelab.ssh.io und homelab.ping: Einträge pro Sekunde und Burst
+        'rate_limit': 20,
+        'burst': 100
+    },
+    'history': {
+        # Ping-Historie als Datei sichern (stündlicher Schnappschuss + angehängte Rohproben) und beim Start laden
+        'persist': False,
+        'path': 'data/ping-history.bin'
+    },
+    'storage': {
+        # 'json' (eine Datei pro Typ unter config/) oder 'sqlite' (WAL, Zeilen-Updates; Migration: tools/migrate_inventory.py)
+        'backend': 'json',
+        'path': 'data/inventory.db'
+    },
+    'workers': {
+        # Anzahl uvicorn-Prozesse; ab 2 prüft nur der Leader, die übrigen lesen dessen Stand
+        'count': 1,
+        # Leader-Sperre, geteilter Zustand (SQLite) und Relay-Sockets der Worker
+        'runtime_dir': 'data/run'
+    }
+}
+
+
+def load_settings() -> dict:
+    """Optionale Einstellungen aus config/settings.json über die Defaults legen"""
+    merged = {section: dict(values) for section, values in DEFAULT_SETTINGS.items()}
+    if settings_path.exists():
+        try:
+            with open(settings_path, 'r', encoding='utf-8') as f:
+                for section, values in json.load(f).items():
+                    merged.setdefault(section, {}).update(values)
+        except Exception as e:
+            log_config.error(f"❌ Fehler beim Laden von {settings_path.name}: {e}")
+    return merged
+
+
+class RateLimitFilter(logging.Filter):
+    """Token-Bucket: höchstens rate Einträge pro Sekunde, Verworfenes wird mitgezählt"""
+
+    def __init__(self, rate: float, burst: int):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.suppressed = 0
+        self.lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                self.suppressed += 1
+                return False
+            self.tokens -= 1
+            suppressed, self.suppressed = self.suppressed, 0
+        if suppressed:
+            record.msg = f"{record.msg} (+{suppressed} unterdrückt)"
+        return True
+
+
+class JsonLogFormatter(logging.Formatter):
+    """Ein JSON-Objekt pro Zeile für Log-Sammler"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def setup_logging(options: dict) -> logging.handlers.QueueListener:
+    """homelab-Logger über eine Queue an einen Listener-Thread hängen (kein blockierendes stdout im Event-Loop)"""
+    handler = logging.StreamHandler()
+    if options['format'] == 'json':
+        handler.setFormatter(JsonLogFormatter())
+    else:
+        handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)-7s [%(name)s] %(message)s', '%H:%M:%S'))
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger('homelab')
+    root.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(options['level'])
+    root.propagate = False
+
+    log_io.setLevel(logging.DEBUG if options['hot_path'] else logging.WARNING)
+    for logger in (log_io, log_ping):
+        logger.filters[:] = [RateLimitFilter(options['rate_limit'], options['burst'])]
+
+    listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+settings = load_settings()
+log_listener = setup_logging(settings['logging'])
+if settings_path.exists():
+    log_config.info(f"✅ {settings_path.name} geladen")
+
+# SSH Session Manager (ControlMaster pro Ziel) und asyncssh-Verbindungspool
+ssh_sessions = SSHSessionManager()
+ssh_pool = AsyncSSHPool()
+
+# Ping Checker and Config Manager
+# Mit mehreren Workern ist die Historie-Datei der Weg, auf dem Follower die Proben des Leaders sehen
+ping_checker = PingChecker(history=PingHistory(
+    Path(settings['history']['path']) if settings['history']['persist'] or settings['workers']['count'] > 1 else None
+))
+service_checker = ServiceChecker()
+worker_coordinator = WorkerCoordinator(Path(settings['workers']['runtime_dir'])) if settings['workers']['count'] > 1 else None
+config_manager = ConfigManager()
 
-# Configuration Cache
-config_cache = {
-    'servers': None,
-    'categories': None,
-    'services': None,
-    'service_categories': None
-}
 
-config_paths = {
-    'servers': Path("config/servers.json"),
-    'categories': Path("config/categories.json"),
-    'services': Path("config/services.json"),
-    'service_categories': Path("config/service-categories.json")
-}
 
-# Ping Checker and Config Manager
-ping_checker = PingChecker()
-config_manager = ConfigManager()
+def create_config_backend():
+    """Storage-Backend laut settings['storage'] (Backups liegen bei beiden unter config/backups)"""
+    if settings['storage']['backend'] == 'sqlite':
+        return SQLiteConfigBackend(Path(settings['storage']['path']), config_manager,
+                                   {config_type: path.stem for config_type, path in config_paths.items()}, json_text)
+    return JSONConfigBackend(config_paths, config_manager)
 
 
-def load_config_file(config_type: str):
-    """Lade eine einzelne Konfigurationsdatei"""
-    try:
-        config_path = config_paths[config_type]
-        if config_path.exists():
-            with open(config_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                print(f"✅ {config_type}.json geladen")
-                return data
-        else:
-            print(f"⚠️ {config_path} nicht gefunden")
-            return get_fallback_config(config_type)
-            
-    except Exception as e:
-        print(f"❌ Fehler beim Laden von {config_type}.json: {e}")
-        return get_fallback_config(config_type)
+# Configuration Cache
+config_cache = ConfigStore(create_config_backend())
+if worker_coordinator is not None:
+    # Änderungen aller Worker nacheinander, jeweils auf dem zuletzt gespeicherten Stand
+    config_cache.lock_path = worker_coordinator.runtime_dir / 'config.lock'
 
 
 def get_fallback_config(config_type: str):
@@ -419,13 +3318,46 @@ def get_fallback_config(config_type: str):
 
 def load_all_configs():
     """Lade alle Konfigurationsdateien"""
-    for config_type in config_cache.keys():
-        config_cache[config_type] = load_config_file(config_type)
-    
-    # Ping-Monitoring für Server starten
+    config_cache.load_all()
+    config_cache.start_watching()
+
+
+def start_monitoring():
+    """Ping-Monitoring und Service-Checks starten (im Multi-Worker-Betrieb nur im Leader)"""
     if config_cache['servers']:
         servers = config_cache['servers'].get('servers', [])
         ping_checker.start_ping_monitoring(servers)
+    service_checker.start()
+
+
+def sync_ping_targets(config_type: str):
+    """Server-CRUD, Importe und Datei-Änderungen ohne Neustart an das Ping-Monitoring geben"""
+    if config_type == 'servers':
+        ping_checker.update_targets(config_cache['servers'].get('servers', []))
+
+
+def enrich_server(server: dict, categories_dict: dict, services: List[dict]) -> dict:
+    """Server-Kopie mit Ping-Status, Kategorie und Services anreichern"""
+    # Kopie anreichern, die gecachte Konfiguration wird so gespeichert
+    enriched = server.copy()
+    
+    # Ping-Status hinzufügen (hostname als ID verwenden)
+    enriched['status'] = ping_checker.get_status(server['hostname'])
+    
+    # Kategorie-Informationen hinzufügen
+    enriched['category'] = categories_dict.get(server['category_id'], {})
+    
+    # Services hinzufügen
+    enriched['services'] = services
+    return enriched
+
+
+def enrich_service(service: dict, service_categories_dict: dict) -> dict:
+    """Service-Kopie mit Kategorie-Info anreichern"""
+    enriched = service.copy()
+    enriched['category_info'] = service_categories_dict.get(service['category'], {})
+    enriched['health'] = service_checker.results.get(service['name'])
+    return enriched
 
 
 def enrich_data():
@@ -433,39 +3365,22 @@ def enrich_data():
     if not all(config_cache.values()):
         return None
     
-    # Kategorien als Dict für schnellen Lookup
-    categories_dict = {cat['id']: cat for cat in config_cache['categories']['categories']}
-    service_categories_dict = {cat['id']: cat for cat in config_cache['service_categories']['service_categories']}
-    
-    # Services gruppiert nach hostname
-    services_by_hostname = {}
-    for service in config_cache['services']['services']:
-        hostname = service['hostname']
-        if hostname not in services_by_hostname:
-            services_by_hostname[hostname] = []
-        services_by_hostname[hostname].append(service)
+    # Kategorien und Services pro Host aus den gepflegten Indizes
+    categories_dict = config_cache.index('categories').by_key
+    service_categories_dict = config_cache.index('service_categories').by_key
+    services_index = config_cache.index('services')
     
     # Server anreichern
-    enriched_servers = []
-    for server in config_cache['servers']['servers']:
-        # Ping-Status hinzufügen (hostname als ID verwenden)
-        server['status'] = ping_checker.get_status(server['hostname'])
-        
-        # Kategorie-Informationen hinzufügen
-        category = categories_dict.get(server['category_id'], {})
-        server['category'] = category
-        
-        # Services hinzufügen
-        server['services'] = services_by_hostname.get(server['hostname'], [])
-        
-        enriched_servers.append(server)
+    enriched_servers = [
+        enrich_server(server, categories_dict, services_index.group('hostname', server['hostname']))
+        for server in config_cache['servers']['servers']
+    ]
     
     # Services mit Kategorie-Info anreichern
-    enriched_services = []
-    for service in config_cache['services']['services']:
-        service_copy = service.copy()
-        service_copy['category_info'] = service_categories_dict.get(service['category'], {})
-        enriched_services.append(service_copy)
+    enriched_services = [
+        enrich_service(service, service_categories_dict)
+        for service in config_cache['services']['services']
+    ]
     
     return {
         'servers': enriched_servers,
@@ -475,6 +3390,157 @@ def enrich_data():
     }
 
 
+class EventBroker:
+    """Verteilt Status- und CRUD-Änderungen als versionierte Events an SSE-Clients"""
+
+    def __init__(self):
+        self.version = 0
+        # Mit mehreren Workern zählt jeder Prozess eigene Versionen; die Epoche (Worker-ID) trennt sie
+        self.epoch: Optional[str] = None
+        # (Version, SSE-Frame): jedes Event wird einmal serialisiert, nicht pro Client
+        self.history = deque(maxlen=EVENT_HISTORY)
+        self.subscribers = set()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @staticmethod
+    def _frame(event: dict) -> str:
+        event_id = f"{event['epoch']}:{event['version']}" if event.get('epoch') else event['version']
+        return f"id: {event_id}\nevent: {event['type']}\ndata: {json_text(event)}\n\n"
+
+    def _reload_frame(self) -> str:
+        return self._frame({'type': 'reload', 'version': self.version, 'epoch': self.epoch})
+
+    def publish(self, event: dict):
+        """Event versionieren und verteilen (nur aus dem Event-Loop aufrufen)"""
+        self.version += 1
+        event['version'] = self.version
+        event['epoch'] = self.epoch
+        frame = self._frame(event)
+        self.history.append((self.version, frame))
+
+        for subscriber in self.subscribers:
+            try:
+                subscriber.put_nowait(frame)
+            except asyncio.QueueFull:
+                # Zu langsamer Client: Rückstand verwerfen, Client lädt den Snapshot neu
+                while not subscriber.empty():
+                    subscriber.get_nowait()
+                subscriber.put_nowait(self._reload_frame())
+
+    def publish_threadsafe(self, event: dict):
+        """Event aus einem Hintergrund-Thread veröffentlichen"""
+        if self.loop is None:
+            return
+        try:
+            self.loop.call_soon_threadsafe(self.publish, event)
+        except RuntimeError:
+            # Event-Loop bereits beendet
+            pass
+
+    def subscribe(self, since: Optional[int] = None, epoch: Optional[str] = None) -> asyncio.Queue:
+        """Queue für einen Client anlegen, verpasste Events seit `since` nachliefern"""
+        subscriber = asyncio.Queue(maxsize=EVENT_QUEUE_SIZE)
+
+        if since is not None and epoch != self.epoch:
+            # Version stammt von einem anderen Worker und ist hier bedeutungslos
+            subscriber.put_nowait(self._reload_frame())
+        elif since is not None and since != self.version:
+            if since < self.version and self.history and self.history[0][0] <= since + 1:
+                for version, frame in self.history:
+                    if version > since:
+                        subscriber.put_nowait(frame)
+            else:
+                # Verlauf reicht nicht zurück (oder Server neu gestartet)
+                subscriber.put_nowait(self._reload_frame())
+
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: asyncio.Queue):
+        self.subscribers.discard(subscriber)
+
+
+event_broker = EventBroker()
+
+
+def publish_server_event(op: str, key: str, server: Optional[dict] = None):
+    """Server-Änderung als Event veröffentlichen (op: upsert/delete, key: bisheriger hostname)"""
+    event = {'type': 'server', 'op': op, 'key': key}
+    if server is not None:
+        services = config_cache.index('services').group('hostname', server['hostname'])
+        event['server'] = enrich_server(server, config_cache.index('categories').by_key, services)
+    event_broker.publish(event)
+
+
+def publish_service_event(op: str, key: str, service: Optional[dict] = None):
+    """Service-Änderung als Event veröffentlichen (op: upsert/delete, key: bisheriger Name)"""
+    event = {'type': 'service', 'op': op, 'key': key}
+    if service is not None:
+        event['service'] = enrich_service(service, config_cache.index('service_categories').by_key)
+    event_broker.publish(event)
+
+
+def publish_status_event(hostname: str, status: str):
+    """Ping-Statuswechsel veröffentlichen (Callback aus dem Ping-Thread)"""
+    event_broker.publish_threadsafe({'type': 'status', 'hostname': hostname, 'status': status})
+
+
+def publish_health_event(name: str, health: dict):
+    """Statuswechsel eines Service-Checks veröffentlichen"""
+    event_broker.publish({'type': 'health', 'name': name, 'health': health})
+
+
+def publish_reload_event(config_type: str):
+    """Extern geänderte Konfiguration: Clients laden den Snapshot neu"""
+    event_broker.publish_threadsafe({'type': 'reload', 'config': config_type})
+
+
+class DashboardSnapshot:
+    """Vorberechnete Dashboard-Antwort, neu erzeugt nur bei Config- oder Status-Änderung"""
+
+    def __init__(self):
+        self.key: Optional[tuple] = None
+        self.body: Optional[bytes] = None
+        self.etag: Optional[str] = None
+
+    def get(self):
+        """Serialisierte Dashboard-Daten und ETag liefern"""
+        # Versionen vor dem Anreichern lesen, spätere Änderungen erzwingen einen Neubau
+        key = (config_cache.version, ping_checker.version, service_checker.version)
+        if key != self.key:
+            DASHBOARD_CACHE_MISS.inc()
+            started = time.perf_counter()
+            data = enrich_data()
+            if data is None:
+                return None
+
+            self.body = json_dumps(data)
+            self.etag = f'"{hashlib.sha1(self.body).hexdigest()}"'
+            self.key = key
+            DASHBOARD_RENDER_SECONDS.observe(time.perf_counter() - started)
+        else:
+            DASHBOARD_CACHE_HIT.inc()
+
+        return self.body, self.etag
+
+
+dashboard_snapshot = DashboardSnapshot()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match-Header gegen ETag prüfen (Listen und schwache ETags erlaubt)"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in candidates or any(tag.removeprefix('W/') == etag for tag in candidates)
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus-Metriken"""
+    return Response(content=metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.get("/")
 async def root():
     """Redirect to static frontend"""
@@ -488,63 +3554,242 @@ async def health_check():
 
 
 @app.get("/api/dashboard")
-async def get_dashboard_data():
+async def get_dashboard_data(request: Request):
     """Vollständige Dashboard-Daten mit verknüpften Services"""
-    load_all_configs()
-    enriched_data = enrich_data()
+    snapshot = dashboard_snapshot.get()
     
-    if not enriched_data:
+    if not snapshot:
         raise HTTPException(status_code=500, detail="Configuration could not be loaded")
     
-    return enriched_data
+    body, etag = snapshot
+    # Event-Version: alle Events bis hier sind im Snapshot enthalten
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache', 'X-Event-Version': str(event_broker.version)}
+    if event_broker.epoch:
+        headers['X-Event-Epoch'] = event_broker.epoch
+    if etag_matches(request.headers.get('if-none-match'), etag):
+        return Response(status_code=304, headers=headers)
+    
+    return Response(content=body, media_type='application/json', headers=headers)
+
+
+@app.get("/api/events")
+async def get_events(request: Request, since: Optional[int] = None, epoch: Optional[str] = None):
+    """Server-Sent Events: Status-Wechsel und CRUD-Änderungen als Deltas"""
+    # Event-IDs haben die Form "<version>" bzw. "<epoch>:<version>" (mehrere Worker)
+    last_event_id = request.headers.get('last-event-id')
+    if last_event_id:
+        last_epoch, _, last_version = last_event_id.rpartition(':')
+        if last_version.isdigit():
+            since, epoch = int(last_version), last_epoch or None
+    
+    subscriber = event_broker.subscribe(since, epoch)
+    
+    async def stream():
+        try:
+            while True:
+                try:
+                    frame = await asyncio.wait_for(subscriber.get(), SSE_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ': keepalive\n\n'
+                    continue
+                yield frame
+        finally:
+            event_broker.unsubscribe(subscriber)
+    
+    return StreamingResponse(stream(), media_type='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+
+@app.get("/api/services/health")
+async def get_services_health():
+    """Letzte TCP/HTTP-Check-Ergebnisse aller Services"""
+    return FastJSONResponse(service_checker.results)
+
+
+HISTORY_WINDOWS = "1h,24h,7d,30d"
+WINDOW_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_windows(value: str) -> Dict[str, int]:
+    """Fensterangaben wie '1h,24h,7d' in Sekunden umrechnen"""
+    windows = {}
+    for label in filter(None, (part.strip() for part in value.split(','))):
+        match = re.fullmatch(r'(\d+)([smhd])', label)
+        if not match or int(match.group(1)) == 0:
+            raise HTTPException(status_code=400, detail=f"Invalid window '{label}' (e.g. 15m, 24h, 7d)")
+        windows[label] = int(match.group(1)) * WINDOW_UNITS[match.group(2)]
+    return windows
+
+
+@app.get("/api/history")
+async def get_history(windows: str = HISTORY_WINDOWS):
+    """RTT-Statistik und Uptime aller Hosts über mehrere Zeitfenster"""
+    parsed = parse_windows(windows)
+    history = ping_checker.history
+    return FastJSONResponse({
+        "windows": list(parsed),
+        "hosts": {hostname: history.stats(hostname, parsed) for hostname in history.hostnames()}
+    })
+
+
+@app.get("/api/history/{hostname}")
+async def get_host_history(hostname: str, windows: str = HISTORY_WINDOWS, points: Optional[str] = None):
+    """RTT-Statistik eines Hosts, optional mit Zeitreihe (points=24h) für Diagramme"""
+    history = ping_checker.history
+    stats = history.stats(hostname, parse_windows(windows))
+    if stats is None:
+        raise HTTPException(status_code=404, detail="No history for this host")
+
+    result = {"hostname": hostname, "stats": stats}
+    if points:
+        window = next(iter(parse_windows(points).values()), None)
+        if window is None:
+            raise HTTPException(status_code=400, detail="Invalid points window")
+        result["points"] = history.points(hostname, window)
+    return FastJSONResponse(result)
+
+
+# Inventar-Seiten: Standard- und Maximalgröße
+PAGE_SIZE = 100
+PAGE_SIZE_MAX = 1000
+
+
+def inventory_query(q: Optional[str] = None, category: Optional[str] = None, tag: Optional[str] = None,
+                    status: Optional[str] = None, shared: Optional[bool] = None, cursor: Optional[str] = None,
+                    limit: Optional[int] = Query(None, ge=1, le=PAGE_SIZE_MAX)) -> dict:
+    """Such-, Filter- und Seitenparameter von /api/servers und /api/services"""
+    return {'q': q, 'category': category, 'tag': tag, 'status': status, 'shared': shared,
+            'cursor': cursor, 'limit': limit}
+
+
+def encode_cursor(position: int, item_key: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([position, item_key]).encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, index: IndexedList) -> int:
+    """Startposition: aktuelle Position des gemerkten Eintrags, nach dessen Löschen die gemerkte Position
+    
+    Wurden zusätzlich Einträge davor gelöscht, rückt die Liste auf und
+    entsprechend viele Einträge werden übersprungen.
+    """
+    try:
+        position, item_key = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(position, int) or isinstance(position, bool) or position < 0 or not isinstance(item_key, str):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return index.positions.get(item_key, position)
+
+
+def service_status(service: dict, servers: IndexedList) -> str:
+    """Eigener Service-Check, sonst Ping-Status des Hosts (wie im Dashboard)"""
+    health = service_checker.results.get(service['name'])
+    if health and health['status'] != 'unknown':
+        return health['status']
+    server = servers.get(service.get('hostname'))
+    return ping_checker.get_status(server['hostname']) if server else 'unknown'
+
+
+def query_inventory(config_type: str, query: dict) -> dict:
+    """Seite der Server/Services nach Suche und Filtern, in Listenreihenfolge, mit Cursor auf den nächsten Treffer"""
+    index = config_cache.index(config_type)
+    servers = config_cache.index('servers')
+    category_field = 'category_id' if config_type == 'servers' else 'category'
+
+    def status_of(item: dict) -> str:
+        if config_type == 'servers':
+            return ping_checker.get_status(item['hostname'])
+        return service_status(item, servers)
+
+    def shared_of(item: dict) -> bool:
+        # Services gelten als geteilt, wenn ihr Host es ist
+        server = item if config_type == 'servers' else servers.get(item.get('hostname'))
+        return bool((server or {}).get('shared'))
+
+    def annotate(item: dict) -> dict:
+        if config_type == 'servers':
+            return dict(item, status=status_of(item))
+        return dict(item, status=status_of(item), health=service_checker.results.get(item['name']))
+
+    # Suche und Kategorie über die Indizes, nur die übrigen Filter prüfen Einträge einzeln
+    candidates = index.search(query['q']) if query['q'] else None
+    if query['category'] is not None:
+        in_category = index.groups[category_field].get(query['category'], {}).keys()
+        candidates = set(in_category) if candidates is None else candidates & in_category
+
+    start = decode_cursor(query['cursor'], index) if query['cursor'] else 0
+    if candidates is None:
+        positions = range(start, len(index.items))
+    else:
+        positions = sorted(position for position in map(index.positions.get, candidates) if position >= start)
+
+    limit = query['limit'] or PAGE_SIZE
+    page, next_cursor = [], None
+    for position in positions:
+        item = index.items[position]
+        if query['tag'] is not None and query['tag'] not in (item.get('tags') or []):
+            continue
+        if query['shared'] is not None and shared_of(item) != query['shared']:
+            continue
+        if query['status'] is not None and status_of(item) != query['status']:
+            continue
+        if len(page) == limit:
+            next_cursor = encode_cursor(position, item[index.key])
+            break
+        page.append(annotate(item))
+
+    return {config_type: page, 'next_cursor': next_cursor}
 
 
 @app.get("/api/servers")
-async def get_servers():
-    """Server-Konfiguration"""
-    config_cache['servers'] = load_config_file('servers')
-    return config_cache['servers']
+async def get_servers(query: dict = Depends(inventory_query)):
+    """Server-Konfiguration; mit Such-, Filter- oder Seitenparametern eine Seite samt next_cursor"""
+    if any(value is not None for value in query.values()):
+        return FastJSONResponse(query_inventory('servers', query))
+    return Response(content=config_cache.encode('servers'), media_type='application/json')
 
 
 @app.get("/api/categories")
 async def get_categories():
     """Kategorien-Konfiguration"""
-    config_cache['categories'] = load_config_file('categories')
-    return config_cache['categories']
+    return Response(content=config_cache.encode('categories'), media_type='application/json')
 
 
 @app.get("/api/services")
-async def get_services():
-    """Services-Konfiguration"""
-    config_cache['services'] = load_config_file('services')
-    return config_cache['services']
+async def get_services(query: dict = Depends(inventory_query)):
+    """Services-Konfiguration; mit Such-, Filter- oder Seitenparametern eine Seite samt next_cursor"""
+    if any(value is not None for value in query.values()):
+        return FastJSONResponse(query_inventory('services', query))
+    return Response(content=config_cache.encode('services'), media_type='application/json')
 
 
 @app.get("/api/service-categories")
 async def get_service_categories():
     """Service-Kategorien-Konfiguration"""
-    config_cache['service_categories'] = load_config_file('service_categories')
-    return config_cache['service_categories']
+    return Response(content=config_cache.encode('service_categories'), media_type='application/json')
 
 
 # CRUD Endpoints für Server
 @app.post("/api/servers")
 async def create_server(server: ServerModel):
     """Server erstellen"""
-    config_cache['servers'] = load_config_file('servers')
-    servers = config_cache['servers']['servers']
+    await config_cache.begin()
+    servers = config_cache.index('servers')
     
     # Check if hostname already exists
-    if any(s['hostname'] == server.hostname for s in servers):
+    if server.hostname in servers:
         raise HTTPException(status_code=400, detail="Hostname already exists")
     
     # Add new server
-    new_server = server.dict()
+    new_server = server.model_dump()
     new_server['status'] = 'unknown'
-    servers.append(new_server)
+    servers.add(new_server)
     
     # Save configuration
-    if config_manager.save_config('servers', config_cache['servers']):
+    if await config_cache.commit('servers'):
+        publish_server_event('upsert', new_server['hostname'], new_server)
         return {"message": "Server created successfully", "server": new_server}
     else:
         raise HTTPException(status_code=500, detail="Failed to save configuration")
@@ -553,59 +3798,64 @@ async def create_server(server: ServerModel):
 @app.put("/api/servers/{hostname}")
 async def update_server(hostname: str, server: ServerModel):
     """Server aktualisieren"""
-    config_cache['servers'] = load_config_file('servers')
-    servers = config_cache['servers']['servers']
+    await config_cache.begin()
+    servers = config_cache.index('servers')
     
     # Find server
-    for i, s in enumerate(servers):
-        if s['hostname'] == hostname:
-            # Update server (keep status)
-            updated_server = server.dict()
-            updated_server['status'] = s.get('status', 'unknown')
-            servers[i] = updated_server
-            
-            # Save configuration
-            if config_manager.save_config('servers', config_cache['servers']):
-                return {"message": "Server updated successfully", "server": updated_server}
-            else:
-                raise HTTPException(status_code=500, detail="Failed to save configuration")
+    existing = servers.get(hostname)
+    if existing is None:
+        raise HTTPException(status_code=404, detail="Server not found")
+    if server.hostname != hostname and server.hostname in servers:
+        raise HTTPException(status_code=400, detail="Hostname already exists")
+    
+    # Update server (keep status)
+    updated_server = server.model_dump()
+    updated_server['status'] = existing.get('status', 'unknown')
+    servers.replace(hostname, updated_server)
     
-    raise HTTPException(status_code=404, detail="Server not found")
+    # Save configuration
+    if await config_cache.commit('servers'):
+        publish_server_event('upsert', hostname, updated_server)
+        return {"message": "Server updated successfully", "server": updated_server}
+    else:
+        raise HTTPException(status_code=500, detail="Failed to save configuration")
 
 
 @app.delete("/api/servers/{hostname}")
 async def delete_server(hostname: str):
     """Server löschen"""
-    config_cache['servers'] = load_config_file('servers')
-    servers = config_cache['servers']['servers']
-    
+    await config_cache.begin()
     # Find and remove server
-    for i, s in enumerate(servers):
-        if s['hostname'] == hostname:
-            removed_server = servers.pop(i)
-            
-            # Save configuration
-            if config_manager.save_config('servers', config_cache['servers']):
-                return {"message": "Server deleted successfully", "server": removed_server}
-            else:
-                raise HTTPException(status_code=500, detail="Failed to save configuration")
+    removed_server = config_cache.index('servers').remove(hostname)
+    if removed_server is None:
+        raise HTTPException(status_code=404, detail="Server not found")
     
-    raise HTTPException(status_code=404, detail="Server not found")
+    # Save configuration
+    if await config_cache.commit('servers'):
+        publish_server_event('delete', hostname)
+        return {"message": "Server deleted successfully", "server": removed_server}
+    else:
+        raise HTTPException(status_code=500, detail="Failed to save configuration")
 
 
 # CRUD Endpoints für Services
 @app.post("/api/services")
 async def create_service(service: ServiceModel):
     """Service erstellen"""
-    config_cache['services'] = load_config_file('services')
-    services = config_cache['services']['services']
+    await config_cache.begin()
+    services = config_cache.index('services')
+    
+    # Check if name already exists (Services werden über den Namen adressiert)
+    if service.name in services:
+        raise HTTPException(status_code=400, detail="Service name already exists")
     
     # Add new service
-    new_service = service.dict()
-    services.append(new_service)
+    new_service = service.model_dump()
+    services.add(new_service)
     
     # Save configuration
-    if config_manager.save_config('services', config_cache['services']):
+    if await config_cache.commit('services'):
+        publish_service_event('upsert', new_service['name'], new_service)
         return {"message": "Service created successfully", "service": new_service}
     else:
         raise HTTPException(status_code=500, detail="Failed to save configuration")
@@ -614,60 +3864,285 @@ async def create_service(service: ServiceModel):
 @app.put("/api/services/{service_name}")
 async def update_service(service_name: str, service: ServiceModel):
     """Service aktualisieren"""
-    config_cache['services'] = load_config_file('services')
-    services = config_cache['services']['services']
+    await config_cache.begin()
+    services = config_cache.index('services')
     
     # Find service
-    for i, s in enumerate(services):
-        if s['name'] == service_name:
-            services[i] = service.dict()
-            
-            # Save configuration
-            if config_manager.save_config('services', config_cache['services']):
-                return {"message": "Service updated successfully", "service": service.dict()}
-            else:
-                raise HTTPException(status_code=500, detail="Failed to save configuration")
+    if service_name not in services:
+        raise HTTPException(status_code=404, detail="Service not found")
+    if service.name != service_name and service.name in services:
+        raise HTTPException(status_code=400, detail="Service name already exists")
     
-    raise HTTPException(status_code=404, detail="Service not found")
+    updated_service = service.model_dump()
+    services.replace(service_name, updated_service)
+    
+    # Save configuration
+    if await config_cache.commit('services'):
+        publish_service_event('upsert', service_name, updated_service)
+        return {"message": "Service updated successfully", "service": updated_service}
+    else:
+        raise HTTPException(status_code=500, detail="Failed to save configuration")
 
 
 @app.delete("/api/services/{service_name}")
 async def delete_service(service_name: str):
     """Service löschen"""
-    config_cache['services'] = load_config_file('services')
-    services = config_cache['services']['services']
-    
+    await config_cache.begin()
     # Find and remove service
-    for i, s in enumerate(services):
-        if s['name'] == service_name:
-            removed_service = services.pop(i)
-            
-            # Save configuration
-            if config_manager.save_config('services', config_cache['services']):
-                return {"message": "Service deleted successfully", "service": removed_service}
-            else:
-                raise HTTPException(status_code=500, detail="Failed to save configuration")
+    removed_service = config_cache.index('services').remove(service_name)
+    if removed_service is None:
+        raise HTTPException(status_code=404, detail="Service not found")
+    
+    # Save configuration
+    if await config_cache.commit('services'):
+        publish_service_event('delete', service_name)
+        return {"message": "Service deleted successfully", "service": removed_service}
+    else:
+        raise HTTPException(status_code=500, detail="Failed to save configuration")
+
+
+# Batch-, Import- und Export-Endpoints
+SERVER_CSV_FIELDS = ['hostname', 'description', 'category_id', 'host', 'shared', 'ssh', 'ssh_user', 'notes', 'ping_interval', 'tags']
+SERVICE_CSV_FIELDS = ['name', 'description', 'hostname', 'url', 'internal_url', 'port', 'category', 'tags', 'check_timeout']
+EXPORT_CHUNK_SIZE = 500
+
+
+def apply_batch(items: List[dict], key: str, operations: List[tuple]):
+    """Batch-Operationen (op, key, item) in einem Durchlauf prüfen und anwenden
+    
+    Liefert (neue Liste, Fehler). Bei Fehlern bleibt die Ausgangsliste unverändert.
+    """
+    items = list(items)
+    positions = {item[key]: i for i, item in enumerate(items)}
+    errors = []
+    
+    for index, (op, item_key, item) in enumerate(operations):
+        if item is None and op != 'delete':
+            errors.append({'index': index, 'error': f"'{op}' requires an item"})
+            continue
+        item_key = item_key or (item[key] if item else None)
+        position = positions.get(item_key)
+        
+        if op == 'create' and position is not None:
+            errors.append({'index': index, 'error': f"{item_key} already exists"})
+        elif op in ('update', 'delete') and position is None:
+            errors.append({'index': index, 'error': f"{item_key} not found"})
+        elif op == 'delete':
+            items[position] = None
+            del positions[item_key]
+        elif position is None:
+            positions[item[key]] = len(items)
+            items.append(item)
+        else:
+            # Umbenennung auf einen bereits vergebenen Schlüssel verhindern
+            if item[key] != item_key and item[key] in positions:
+                errors.append({'index': index, 'error': f"{item[key]} already exists"})
+                continue
+            if key == 'hostname':
+                item['status'] = items[position].get('status', 'unknown')
+            del positions[item_key]
+            positions[item[key]] = position
+            items[position] = item
+    
+    return [item for item in items if item is not None], errors
+
+
+async def commit_batch(config_type: str, key: str, operations: List[tuple]):
+    """Batch anwenden und mit einem Schreibvorgang speichern"""
+    await config_cache.begin()
+    container = config_cache[config_type]
+    items, errors = apply_batch(container[config_type], key, operations)
+    if errors:
+        raise HTTPException(status_code=422, detail={"message": "Batch rejected", "errors": errors})
+    
+    container[config_type] = items
+    if not await config_cache.commit(config_type):
+        raise HTTPException(status_code=500, detail="Failed to save configuration")
+    
+    event_broker.publish({'type': 'reload', 'config': config_type})
+    return {"message": "Batch applied successfully", "operations": len(operations), "total": len(items)}
+
+
+def _csv_bool(value: Optional[str]) -> bool:
+    return (value or '').strip().lower() in ('1', 'true', 'yes', 'ja', 'x')
+
+
+def server_from_row(row: dict) -> dict:
+    """CSV-Zeile in Server-Datensatz umwandeln (Tags mit ';' getrennt)"""
+    return {
+        'hostname': row.get('hostname') or '',
+        'description': row.get('description') or '',
+        'category_id': row.get('category_id') or '',
+        'host': row.get('host') or '',
+        'shared': _csv_bool(row.get('shared')),
+        'access': {'ssh': _csv_bool(row.get('ssh')), 'ssh_user': row.get('ssh_user') or 'root'},
+        'notes': row.get('notes') or '',
+        'ping_interval': row.get('ping_interval') or None,
+        'tags': [tag.strip() for tag in (row.get('tags') or '').split(';') if tag.strip()]
+    }
+
+
+def server_to_row(server: dict) -> list:
+    access = server.get('access') or {}
+    return [
+        server['hostname'], server.get('description', ''), server.get('category_id', ''), server.get('host', ''),
+        'true' if server.get('shared') else 'false', 'true' if access.get('ssh') else 'false',
+        access.get('ssh_user', ''), server.get('notes', ''), server.get('ping_interval') or '',
+        ';'.join(server.get('tags') or [])
+    ]
+
+
+def service_from_row(row: dict) -> dict:
+    """CSV-Zeile in Service-Datensatz umwandeln (Tags mit ';' getrennt)"""
+    return {
+        'name': row.get('name') or '',
+        'description': row.get('description') or '',
+        'hostname': row.get('hostname') or '',
+        'url': row.get('url') or None,
+        'internal_url': row.get('internal_url') or None,
+        'port': row.get('port') or None,
+        'category': row.get('category') or '',
+        'tags': [tag.strip() for tag in (row.get('tags') or '').split(';') if tag.strip()],
+        'check_timeout': row.get('check_timeout') or None
+    }
+
+
+def service_to_row(service: dict) -> list:
+    return [
+        service['name'], service.get('description', ''), service.get('hostname', ''), service.get('url') or '',
+        service.get('internal_url') or '', service.get('port') or '', service.get('category', ''),
+        ';'.join(service.get('tags') or []), service.get('check_timeout') or ''
+    ]
+
+
+def parse_import(body: bytes, import_format: str, model, from_row) -> tuple:
+    """NDJSON- oder CSV-Import validieren, liefert (Datensätze, Fehler mit Zeilennummer)"""
+    text = body.decode('utf-8-sig')
+    records, errors = [], []
+    
+    if import_format == 'csv':
+        reader = csv.DictReader(io.StringIO(text))
+        rows = ((reader.line_num, from_row(row)) for row in reader)
+    else:
+        rows = ((line_number, line) for line_number, line in enumerate(text.splitlines(), 1) if line.strip())
+    
+    for line_number, row in rows:
+        try:
+            record = json.loads(row) if isinstance(row, str) else row
+            records.append(model.model_validate(record).model_dump())
+        except (ValueError, TypeError) as e:
+            errors.append({'line': line_number, 'error': str(e)})
+    
+    return records, errors
+
+
+def detect_format(request: Request, import_format: Optional[str]) -> str:
+    if import_format in ('csv', 'ndjson'):
+        return import_format
+    return 'csv' if 'csv' in request.headers.get('content-type', '') else 'ndjson'
+
+
+def export_response(items: List[dict], export_format: str, fields: List[str], to_row, filename: str):
+    """Einträge als NDJSON oder CSV streamen"""
+    # Flache Kopie, CRUD ersetzt Einträge statt sie zu verändern
+    items = list(items)
     
-    raise HTTPException(status_code=404, detail="Service not found")
+    async def stream():
+        if export_format == 'csv':
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(fields)
+            for start in range(0, len(items), EXPORT_CHUNK_SIZE):
+                writer.writerows(to_row(item) for item in items[start:start + EXPORT_CHUNK_SIZE])
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        else:
+            for start in range(0, len(items), EXPORT_CHUNK_SIZE):
+                yield ''.join(json.dumps(item, ensure_ascii=False) + '\n' for item in items[start:start + EXPORT_CHUNK_SIZE])
+    
+    media_type = 'text/csv' if export_format == 'csv' else 'application/x-ndjson'
+    extension = 'csv' if export_format == 'csv' else 'ndjson'
+    return StreamingResponse(stream(), media_type=media_type, headers={
+        'Content-Disposition': f'attachment; filename="{filename}.{extension}"'
+    })
+
+
+@app.post("/api/servers:batch")
+async def batch_servers(batch: ServerBatchRequest):
+    """Mehrere Server-Operationen validieren und mit einem Schreibvorgang speichern"""
+    operations = []
+    for operation in batch.operations:
+        server = operation.server.model_dump() if operation.server else None
+        if server:
+            # Bei update/upsert übernimmt apply_batch den bisherigen Status
+            server['status'] = 'unknown'
+        operations.append((operation.op, operation.hostname, server))
+    return await commit_batch('servers', 'hostname', operations)
+
+
+@app.post("/api/services:batch")
+async def batch_services(batch: ServiceBatchRequest):
+    """Mehrere Service-Operationen validieren und mit einem Schreibvorgang speichern"""
+    operations = [
+        (operation.op, operation.name, operation.service.model_dump() if operation.service else None)
+        for operation in batch.operations
+    ]
+    return await commit_batch('services', 'name', operations)
+
+
+@app.post("/api/servers/import")
+async def import_servers(request: Request, format: Optional[str] = None, mode: Literal['create', 'upsert'] = 'create'):
+    """Server aus NDJSON oder CSV importieren"""
+    records, errors = parse_import(await request.body(), detect_format(request, format), ServerModel, server_from_row)
+    if errors:
+        raise HTTPException(status_code=422, detail={"message": "Import rejected", "errors": errors})
+    
+    for record in records:
+        record['status'] = 'unknown'
+    return await commit_batch('servers', 'hostname', [(mode, None, record) for record in records])
+
+
+@app.post("/api/services/import")
+async def import_services(request: Request, format: Optional[str] = None, mode: Literal['create', 'upsert'] = 'create'):
+    """Services aus NDJSON oder CSV importieren"""
+    records, errors = parse_import(await request.body(), detect_format(request, format), ServiceModel, service_from_row)
+    if errors:
+        raise HTTPException(status_code=422, detail={"message": "Import rejected", "errors": errors})
+    
+    return await commit_batch('services', 'name', [(mode, None, record) for record in records])
+
+
+@app.get("/api/servers/export")
+async def export_servers(format: Literal['ndjson', 'csv'] = 'ndjson'):
+    """Server als NDJSON oder CSV exportieren"""
+    return export_response(config_cache['servers']['servers'], format, SERVER_CSV_FIELDS, server_to_row, 'servers')
+
+
+@app.get("/api/services/export")
+async def export_services(format: Literal['ndjson', 'csv'] = 'ndjson'):
+    """Services als NDJSON oder CSV exportieren"""
+    return export_response(config_cache['services']['services'], format, SERVICE_CSV_FIELDS, service_to_row, 'services')
 
 
 # CRUD Endpoints für Service-Kategorien
 @app.post("/api/service-categories")
 async def create_service_category(category: ServiceCategoryModel):
     """Service-Kategorie erstellen"""
-    config_cache['service_categories'] = load_config_file('service_categories')
-    categories = config_cache['service_categories']['service_categories']
+    await config_cache.begin()
+    categories = config_cache.index('service_categories')
     
     # Check if ID already exists
-    if any(c['id'] == category.id for c in categories):
+    if category.id in categories:
         raise HTTPException(status_code=400, detail="Category ID already exists")
     
     # Add new category
-    new_category = category.dict()
-    categories.append(new_category)
+    new_category = category.model_dump()
+    categories.add(new_category)
     
     # Save configuration
-    if config_manager.save_config('service-categories', config_cache['service_categories']):
+    if await config_cache.commit('service_categories'):
+        event_broker.publish({'type': 'reload', 'config': 'service_categories'})
         return {"message": "Service category created successfully", "category": new_category}
     else:
         raise HTTPException(status_code=500, detail="Failed to save configuration")
@@ -676,52 +4151,52 @@ async def create_service_category(category: ServiceCategoryModel):
 @app.put("/api/service-categories/{category_id}")
 async def update_service_category(category_id: str, category: ServiceCategoryModel):
     """Service-Kategorie aktualisieren"""
-    config_cache['service_categories'] = load_config_file('service_categories')
-    categories = config_cache['service_categories']['service_categories']
+    await config_cache.begin()
+    categories = config_cache.index('service_categories')
     
     # Find category
-    for i, c in enumerate(categories):
-        if c['id'] == category_id:
-            categories[i] = category.dict()
-            
-            # Save configuration
-            if config_manager.save_config('service-categories', config_cache['service_categories']):
-                return {"message": "Service category updated successfully", "category": category.dict()}
-            else:
-                raise HTTPException(status_code=500, detail="Failed to save configuration")
+    if category_id not in categories:
+        raise HTTPException(status_code=404, detail="Service category not found")
+    if category.id != category_id and category.id in categories:
+        raise HTTPException(status_code=400, detail="Category ID already exists")
+    
+    categories.replace(category_id, category.model_dump())
     
-    raise HTTPException(status_code=404, detail="Service category not found")
+    # Save configuration
+    if await config_cache.commit('service_categories'):
+        event_broker.publish({'type': 'reload', 'config': 'service_categories'})
+        return {"message": "Service category updated successfully", "category": category.model_dump()}
+    else:
+        raise HTTPException(status_code=500, detail="Failed to save configuration")
 
 
 @app.delete("/api/service-categories/{category_id}")
 async def delete_service_category(category_id: str):
     """Service-Kategorie löschen"""
-    config_cache['service_categories'] = load_config_file('service_categories')
-    categories = config_cache['service_categories']['service_categories']
-    
+    await config_cache.begin()
     # Find and remove category
-    for i, c in enumerate(categories):
-        if c['id'] == category_id:
-            removed_category = categories.pop(i)
-            
-            # Save configuration
-            if config_manager.save_config('service-categories', config_cache['service_categories']):
-                return {"message": "Service category deleted successfully", "category": removed_category}
-            else:
-                raise HTTPException(status_code=500, detail="Failed to save configuration")
+    removed_category = config_cache.index('service_categories').remove(category_id)
+    if removed_category is None:
+        raise HTTPException(status_code=404, detail="Service category not found")
     
-    raise HTTPException(status_code=404, detail="Service category not found")
+    # Save configuration
+    if await config_cache.commit('service_categories'):
+        event_broker.publish({'type': 'reload', 'config': 'service_categories'})
+        return {"message": "Service category deleted successfully", "category": removed_category}
+    else:
+        raise HTTPException(status_code=500, detail="Failed to save configuration")
 
 
 # Endpoint für Kategorie-Sortierung
 @app.put("/api/service-categories/reorder")
 async def reorder_service_categories(category_order: List[str]):
     """Service-Kategorien neu sortieren"""
-    config_cache['service_categories'] = load_config_file('service_categories')
+    await config_cache.begin()
     categories = config_cache['service_categories']['service_categories']
     
     # Update order based on position in list
-    categories_dict = {c['id']: c for c in categories}
+    categories_dict = config_cache.index('service_categories').by_key
+    ordered_ids = set(category_order)
     reordered_categories = []
     
     for i, category_id in enumerate(category_order):
@@ -732,70 +4207,209 @@ async def reorder_service_categories(category_order: List[str]):
     
     # Add any categories not in the order list
     for category in categories:
-        if category['id'] not in category_order:
+        if category['id'] not in ordered_ids:
             category['order'] = len(category_order) + 1
             reordered_categories.append(category)
     
     config_cache['service_categories']['service_categories'] = reordered_categories
     
     # Save configuration
-    if config_manager.save_config('service-categories', config_cache['service_categories']):
+    if await config_cache.commit('service_categories'):
+        event_broker.publish({'type': 'reload', 'config': 'service_categories'})
         return {"message": "Service categories reordered successfully", "categories": reordered_categories}
     else:
         raise HTTPException(status_code=500, detail="Failed to save configuration")
 
 
+# Backup-Endpoints (config_type = Dateiname ohne .json, z.B. service-categories)
+@app.get("/api/backups")
+async def list_backups(config_type: Optional[str] = None):
+    """Backups auflisten"""
+    return {"backups": config_manager.backups.list(config_type)}
+
+
+@app.post("/api/backups/{config_type}/{digest}/restore")
+async def restore_backup(config_type: str, digest: str):
+    """Konfiguration aus Backup wiederherstellen"""
+    store_keys = {path.stem: key for key, path in config_paths.items()}
+    if config_type not in store_keys:
+        raise HTTPException(status_code=404, detail="Unknown config type")
+    
+    content = await asyncio.to_thread(config_manager.backups.get, config_type, digest)
+    if content is None:
+        raise HTTPException(status_code=404, detail="Backup not found")
+    
+    try:
+        data = json.loads(content)
+    except ValueError:
+        raise HTTPException(status_code=500, detail="Backup is not valid JSON")
+    
+    # Aktueller Stand wird beim Speichern selbst gesichert
+    await config_cache.begin()
+    config_cache.replace(store_keys[config_type], data)
+    if await config_cache.commit(store_keys[config_type]):
+        event_broker.publish({'type': 'reload', 'config': store_keys[config_type]})
+        return {"message": "Backup restored successfully", "config_type": config_type, "hash": digest}
+    else:
+        raise HTTPException(status_code=500, detail="Failed to save configuration")
+
+
 @app.websocket("/ws/ssh")
 async def ssh_websocket(websocket: WebSocket):
     """SSH WebSocket Handler"""
     await websocket.accept()
-    connection_id = id(websocket)
-    ssh_conn = SSHConnection(websocket)
-    connections[connection_id] = ssh_conn
+    await handle_ssh_socket(websocket)
+
+
+async def serve_relay(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Von einem anderen Worker weitergereichten Terminal-Client bedienen"""
+    relay = RelaySocket(reader, writer)
+    try:
+        await handle_ssh_socket(relay)
+    finally:
+        relay.close()
+
+
+async def relay_to_worker(websocket: WebSocket, socket_path: Path, first_frame: str) -> bool:
+    """Client-Frames an den Worker weiterreichen, dem die Sitzung gehört, bis eine Seite schließt"""
+    try:
+        reader, writer = await asyncio.open_unix_connection(str(socket_path))
+    except OSError:
+        return False
+    relay = RelaySocket(reader, writer)
+    await relay.send_text(first_frame)
+
+    async def upstream():
+        while True:
+            frame = await websocket.receive()
+            if frame['type'] == 'websocket.disconnect':
+                return
+            if frame.get('bytes') is not None:
+                await relay.send_bytes(frame['bytes'])
+            else:
+                await relay.send_text(frame['text'])
+
+    async def downstream():
+        while True:
+            frame = await relay.receive()
+            if frame['type'] == 'websocket.disconnect':
+                return
+            if frame.get('bytes') is not None:
+                await websocket.send_bytes(frame['bytes'])
+            else:
+                await websocket.send_text(frame['text'])
+
+    tasks = [asyncio.create_task(upstream()), asyncio.create_task(downstream())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        relay.close()
+    return True
+
+
+async def handle_ssh_socket(websocket):
+    """Terminal-Actions eines Clients verarbeiten (WebSocket oder Relay eines anderen Workers)"""
+    ssh_conn: Optional[SSHConnection] = None
+    terminated = False
     
-    print(f"🔗 WebSocket-Verbindung hergestellt: {connection_id}")
+    log_ssh.info(f"🔗 WebSocket-Verbindung hergestellt: {id(websocket)}")
     
     try:
         while True:
-            data = await websocket.receive_text()
-            message = json.loads(data)
+            frame = await websocket.receive()
+            if frame['type'] == 'websocket.disconnect':
+                raise WebSocketDisconnect(frame.get('code', 1000))
+            
+            # Binary-Frames enthalten rohe Terminal-Eingaben
+            if frame.get('bytes') is not None:
+                if ssh_conn:
+                    await ssh_conn.send_input(frame['bytes'])
+                continue
+            
+            message = json.loads(frame['text'])
             
             action = message.get('action')
-            print(f"📨 WebSocket Action: {action}")
+            log_io.debug("📨 WebSocket Action: %s", action)
             
             if action == 'connect':
                 host = message.get('host')
                 port = message.get('port', 22)
                 username = message.get('username')
                 
-                print(f"📡 SSH-Verbindung starten für: {username}@{host}:{port}")
+                log_ssh.info(f"📡 SSH-Verbindung starten für: {username}@{host}:{port}")
                 
                 if not host:
-                    await websocket.send_text(json.dumps({
+                    await websocket.send_text(json_text({
                         'type': 'error',
                         'message': 'Host is required'
                     }))
                     continue
                 
-                await ssh_conn.connect(host, port, username)
+                if ssh_conn:
+                    ssh_conn.disconnect()
+                    connections.pop(ssh_conn.session_id, None)
+                ssh_conn = create_ssh_connection(websocket)
+                connections[ssh_conn.session_id] = ssh_conn
+                
+                if message.get('cols') and message.get('rows'):
+                    ssh_conn.resize(message['cols'], message['rows'])
+                await ssh_conn.connect(host, port, username, binary=bool(message.get('binary')))
+                
+            elif action == 'attach':
+                # Reattach nach Reload: Sitzung übernehmen und Scrollback senden
+                session = connections.get(message.get('session_id'))
+                if session is None and worker_coordinator is not None:
+                    owner_socket = worker_coordinator.owner_socket(str(message.get('session_id', '')))
+                    if owner_socket and await relay_to_worker(websocket, owner_socket, frame['text']):
+                        # Sitzung gehört einem anderen Worker, der Client war bis eben mit ihm verbunden
+                        break
+                if session is None:
+                    await websocket.send_text(json_text({
+                        'type': 'error',
+                        'code': 'session_not_found',
+                        'message': 'Session not found or expired'
+                    }))
+                    continue
+                
+                if ssh_conn and ssh_conn is not session:
+                    ssh_conn.disconnect()
+                    connections.pop(ssh_conn.session_id, None)
+                ssh_conn = session
+                ssh_conn.attach(websocket)
+                ssh_conn.replay()
+                if message.get('cols') and message.get('rows'):
+                    ssh_conn.resize(message['cols'], message['rows'])
+                log_ssh.info(f"🔗 Sitzung {ssh_conn.session_id} wieder verbunden")
                 
             elif action == 'input':
-                input_data = message.get('data')
-                await ssh_conn.send_input(input_data)
+                if ssh_conn:
+                    await ssh_conn.send_input(message.get('data'))
+                
+            elif action == 'resize':
+                if ssh_conn:
+                    ssh_conn.resize(message.get('cols', SSH_TERM_SIZE[0]), message.get('rows', SSH_TERM_SIZE[1]))
                 
             elif action == 'disconnect':
-                ssh_conn.disconnect()
+                terminated = True
                 break
                 
     except WebSocketDisconnect:
-        print(f"🔌 WebSocket getrennt: {connection_id}")
+        log_ssh.info(f"🔌 WebSocket getrennt: {id(websocket)}")
     except Exception as e:
-        print(f"❌ SSH WebSocket Fehler: {e}")
+        log_ssh.error(f"❌ SSH WebSocket Fehler: {e}")
     finally:
-        ssh_conn.disconnect()
-        if connection_id in connections:
-            del connections[connection_id]
-        print(f"🧹 Verbindung bereinigt: {connection_id}")
+        # Von einem anderen WebSocket übernommene Sitzungen nicht anfassen
+        if ssh_conn and ssh_conn.websocket is websocket:
+            if ssh_conn.connected and not terminated:
+                ssh_conn.detach(grace=SESSION_GRACE_PERIOD)
+                log_ssh.info(f"⏸️ Sitzung {ssh_conn.session_id} abgekoppelt, Gnadenfrist {SESSION_GRACE_PERIOD}s")
+            else:
+                ssh_conn.disconnect()
+                connections.pop(ssh_conn.session_id, None)
+                log_ssh.info(f"🧹 Sitzung bereinigt: {ssh_conn.session_id}")
 
 
 if __name__ == "__main__":
@@ -808,16 +4422,26 @@ if __name__ == "__main__":
     print(f"WebSocket: ws://localhost:8000/ws/ssh")
     print("=" * 50)
     
-    # Config beim Start laden
-    load_all_configs()
-    
+    workers = settings['workers']['count']
     try:
-        uvicorn.run(
-            app,
-            host="0.0.0.0",
-            port=8000,
-            log_level="info"
-        )
+        if workers > 1:
+            # Jeder Worker-Prozess importiert das Modul selbst, daher der Import-String
+            print(f"Worker: {workers} (ein Leader prüft, Zustand in {settings['workers']['runtime_dir']})")
+            uvicorn.run(
+                "app:app",
+                host="0.0.0.0",
+                port=8000,
+                log_level="info",
+                workers=workers
+            )
+        else:
+            uvicorn.run(
+                app,
+                host="0.0.0.0",
+                port=8000,
+                log_level="info"
+            )
     finally:
         ping_checker.stop()
-        print("🧹 Backend sauber beendet")
\ No newline at end of file
+        print("🧹 Backend sauber beendet")
+        log_listener.stop()
\ No newline at end of file
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Lineare Suche vs. gepflegte Hash-Indizes im ConfigStore
+Aufruf: python benchmarks/config_index.py [--servers 5000] [--services-per-host 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+os.chdir(ROOT_DIR)
+
+from app import ConfigStore, JSONConfigBackend, config_paths  # noqa: E402
+
+
+def build_store(server_count: int, services_per_host: int) -> ConfigStore:
+    """Synthetische Konfiguration im Speicher (ohne Dateizugriff)"""
+    store = ConfigStore(JSONConfigBackend({key: Path(f"/nonexistent/{path.name}") for key, path in config_paths.items()}, None))
+    store.replace('servers', {'servers': [
+        {'hostname': f"host{i:05d}", 'description': '', 'category_id': f"net{i % 20}",
+         'host': f"10.{i // 65536}.{i // 256 % 256}.{i % 256}", 'shared': False, 'access': {'ssh': False}, 'notes': ''}
+        for i in range(server_count)
+    ]})
+    store.replace('services', {'services': [
+        {'name': f"svc{i:05d}-{j}", 'description': '', 'hostname': f"host{i:05d}", 'url': None,
+         'internal_url': None, 'port': 8000 + j, 'category': f"cat{j}", 'tags': []}
+        for i in range(server_count) for j in range(services_per_host)
+    ]})
+    store.replace('categories', {'categories': [{'id': f"net{i}", 'name': f"Net {i}"} for i in range(20)]})
+    store.replace('service_categories', {'service_categories': [{'id': f"cat{j}", 'order': j} for j in range(services_per_host)]})
+    return store
+
+
+def measure(label: str, func, repeat: int):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    per_call = (time.perf_counter() - started) / repeat * 1e6
+    print(f"  {label:<42} {per_call:>10.2f} µs")
+
+
+def main(args):
+    store = build_store(args.servers, args.services_per_host)
+    servers = store['servers']['servers']
+    services = store['services']['services']
+    target = servers[-1]['hostname']
+    repeat = args.repeat
+
+    print(f"{len(servers)} Server, {len(services)} Services, {repeat} Wiederholungen")
+
+    started = time.perf_counter()
+    server_index, service_index = store.index('servers'), store.index('services')
+    print(f"  {'Index-Aufbau (einmalig)':<42} {(time.perf_counter() - started) * 1e3:>10.2f} ms")
+
+    print("Duplikat-Check beim Anlegen")
+    measure("any(...) über Liste", lambda: any(s['hostname'] == target for s in servers), repeat)
+    measure("hostname in index", lambda: target in server_index, repeat)
+
+    print("Eintrag für Update/Delete finden")
+    measure("enumerate(...) über Liste", lambda: next(i for i, s in enumerate(servers) if s['hostname'] == target), repeat)
+    measure("index.get(hostname)", lambda: server_index.get(target), repeat)
+
+    print("Services eines Hosts (Join)")
+    measure("Filter über Services", lambda: [s for s in services if s['hostname'] == target], repeat)
+    measure("index.group('hostname', ...)", lambda: service_index.group('hostname', target), repeat)
+
+    print("Update mit Index-Pflege")
+    replacement = dict(servers[-1])
+    measure("index.replace(hostname, server)", lambda: server_index.replace(target, replacement), repeat)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Config-Index Benchmark")
+    parser.add_argument("--servers", type=int, default=5000)
+    parser.add_argument("--services-per-host", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=200)
+    main(parser.parse_args())
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Ping-Sweep über Loopback- und nicht erreichbare Adressen
+Aufruf: python benchmarks/ping_sweep.py [--hosts 300] [--timeout 1.0] [--concurrency 256]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+os.chdir(ROOT_DIR)
+
+from app import AsyncPinger  # noqa: E402
+
+
+def build_targets(count: int):
+    """Hälfte Loopback (127.0.0.0/8), Hälfte TEST-NET-1 (192.0.2.0/24, nicht geroutet)"""
+    loopback = [f"127.0.{i // 250}.{i % 250 + 1}" for i in range(count // 2)]
+    unreachable = [f"192.0.2.{i % 254 + 1}" for i in range(count - len(loopback))]
+    return loopback + unreachable
+
+
+async def run(args):
+    hosts = build_targets(args.hosts)
+    pinger = AsyncPinger(timeout=args.timeout, concurrency=args.concurrency)
+    await pinger.start()
+
+    try:
+        started = time.perf_counter()
+        results = await pinger.sweep(hosts)
+        elapsed = time.perf_counter() - started
+    finally:
+        pinger.close()
+
+    online = [rtt for rtt in results.values() if rtt is not None]
+    offline = len(results) - len(online)
+    sequential = len(online) * (sum(online) / len(online) / 1000 if online else 0) + offline * args.timeout
+
+    print(f"Hosts:        {len(results)} ({len(online)} online, {offline} offline)")
+    print(f"Timeout:      {args.timeout:.1f}s, Concurrency: {args.concurrency}")
+    print(f"Sweep:        {elapsed:.2f}s")
+    print(f"Sequenziell:  ~{sequential:.1f}s (geschätzt)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ping-Sweep Benchmark")
+    parser.add_argument("--hosts", type=int, default=300)
+    parser.add_argument("--timeout", type=float, default=1.0)
+    parser.add_argument("--concurrency", type=int, default=256)
+    asyncio.run(run(parser.parse_args()))
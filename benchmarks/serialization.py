@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark: CPU-Zeit pro Request für die Serialisierung von API-Antworten und WebSocket-Frames
+Aufruf: python benchmarks/serialization.py [--servers 3000] [--services-per-host 3]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+os.chdir(ROOT_DIR)
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from starlette.responses import JSONResponse  # noqa: E402
+
+import app  # noqa: E402
+from config_index import build_store  # noqa: E402
+
+
+def measure(label: str, func, repeat: int):
+    """CPU-Zeit (process_time) pro Aufruf"""
+    started = time.process_time()
+    for _ in range(repeat):
+        func()
+    per_call = (time.process_time() - started) / repeat * 1e6
+    print(f"  {label:<46} {per_call:>10.1f} µs")
+
+
+def main(args):
+    store = build_store(args.servers, args.services_per_host)
+    # enrich_data() liest die globale Konfiguration
+    app.config_cache = store
+    servers = store['servers']
+    dashboard = app.enrich_data()
+    repeat = args.repeat
+
+    print(f"{len(servers['servers'])} Server, {len(store['services']['services'])} Services, "
+          f"{repeat} Wiederholungen, orjson: {'ja' if app.orjson else 'nein'}")
+
+    print("GET /api/servers")
+    measure("jsonable_encoder + JSONResponse", lambda: JSONResponse(jsonable_encoder(servers)), repeat)
+    measure("FastJSONResponse", lambda: app.FastJSONResponse(servers), repeat)
+    measure("config_cache.encode (vorkodiert)", lambda: store.encode('servers'), repeat)
+
+    print("GET /api/dashboard (Snapshot-Neubau)")
+    measure("json.dumps(...).encode()", lambda: json.dumps(
+        dashboard, ensure_ascii=False, separators=(',', ':')).encode('utf-8'), repeat)
+    measure("json_dumps", lambda: app.json_dumps(dashboard), repeat)
+
+    print("WebSocket-/SSE-Nachricht")
+    output = {'type': 'output', 'data': 'user@host:~$ ls -la\r\n' * 8}
+    event = {'type': 'status', 'hostname': 'host00001', 'status': 'online', 'version': 1, 'epoch': None}
+    measure("json.dumps (Output-Frame)", lambda: json.dumps(output), repeat * 100)
+    measure("json_text (Output-Frame)", lambda: app.json_text(output), repeat * 100)
+    measure("json.dumps (Event)", lambda: json.dumps(event, ensure_ascii=False), repeat * 100)
+    measure("json_text (Event)", lambda: app.json_text(event), repeat * 100)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serialisierungs-Benchmark")
+    parser.add_argument("--servers", type=int, default=3000)
+    parser.add_argument("--services-per-host", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=50)
+    main(parser.parse_args())
@@ -0,0 +1,257 @@
+"""
+Inventar-Speicher: Storage-Backends des ConfigStore (JSON-Dateien oder SQLite)
+Ohne Seiteneffekte beim Import, damit Tools (tools/migrate_inventory.py) sie direkt nutzen können
+"""
+
+import json
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+log_config = logging.getLogger('homelab.config')
+
+# Dateiname pro Konfigurationstyp (unter config/, Backups unter demselben Namen ohne .json)
+CONFIG_FILES = {
+    'servers': 'servers.json',
+    'categories': 'categories.json',
+    'services': 'services.json',
+    'service_categories': 'service-categories.json'
+}
+
+# Index pro Konfigurationstyp: Schlüsselfeld und gruppierte Felder (Joins)
+CONFIG_INDEXES = {
+    'servers': ('hostname', ('category_id',)),
+    'services': ('name', ('hostname', 'category')),
+    'categories': ('id', ()),
+    'service_categories': ('id', ())
+}
+
+
+# SQLite-Inventar: Wartezeit auf Schreibsperren anderer Prozesse (Sekunden)
+SQLITE_BUSY_TIMEOUT = 5.0
+
+
+def _json_row(item: dict) -> str:
+    return json.dumps(item, ensure_ascii=False, separators=(',', ':'))
+
+
+class JSONConfigBackend:
+    """Eine JSON-Datei pro Konfigurationstyp, vor jedem Schreiben wird der bisherige Stand gesichert"""
+
+    def __init__(self, paths: Dict[str, Path], manager):
+        self.paths = paths
+        self.manager = manager
+        self.config_types = list(paths)
+
+    def describe(self, config_type: str) -> str:
+        return self.paths[config_type].name
+
+    def watch_directories(self) -> set:
+        return {path.parent for path in self.paths.values() if path.parent.exists()}
+
+    def stamp(self, config_type: str) -> Optional[tuple]:
+        """Datei-Signatur (inode, mtime, Größe) oder None wenn nicht vorhanden"""
+        try:
+            file_stat = self.paths[config_type].stat()
+        except FileNotFoundError:
+            return None
+        return (file_stat.st_ino, file_stat.st_mtime_ns, file_stat.st_size)
+
+    def read(self, config_type: str) -> dict:
+        with open(self.paths[config_type], 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def load(self, config_type: str) -> Optional[dict]:
+        """Erstes Laden, None bei fehlender oder defekter Datei (Fallback setzt der ConfigStore)"""
+        config_path = self.paths[config_type]
+        try:
+            if config_path.exists():
+                data = self.read(config_type)
+                log_config.info(f"✅ {config_path.name} geladen")
+                return data
+            log_config.warning(f"⚠️ {config_path} nicht gefunden")
+        except Exception as e:
+            log_config.error(f"❌ Fehler beim Laden von {config_path.name}: {e}")
+        return None
+
+    def serialize(self, config_type: str, data: dict) -> str:
+        return json.dumps(data, indent=2, ensure_ascii=False)
+
+    def save(self, payloads: Dict[str, str]) -> bool:
+        """Dateien nacheinander atomar ersetzen (keine Transaktion über mehrere Dateien)"""
+        return all([self.manager.save_config(self.paths[config_type].stem, content)
+                    for config_type, content in payloads.items()])
+
+
+class SQLiteConfigBackend:
+    """Inventar in SQLite (WAL): eine Tabelle pro Typ, Zeilen-Updates, eine Transaktion pro Flush"""
+
+    def __init__(self, path: Path, manager, backup_names: Dict[str, str],
+                 encode: Optional[Callable[[dict], str]] = None):
+        self.path = path
+        self.encode = encode or _json_row
+        self.manager = manager
+        self.backup_names = backup_names
+        self.config_types = list(backup_names)
+        # Zuletzt gelesener/geschriebener Stand pro Typ: (Version, {Schlüssel: JSON}, Schlüssel in Reihenfolge)
+        self.saved: Dict[str, tuple] = {}
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit, Transaktionen explizit; Aufrufe serialisiert der ConfigStore-Lock
+        self.db = sqlite3.connect(path, isolation_level=None, check_same_thread=False, timeout=SQLITE_BUSY_TIMEOUT)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)')
+        for config_type in self.config_types:
+            # Schlüsselfeld als Primärschlüssel, Join-Felder aus CONFIG_INDEXES als indizierte Spalten
+            key, group_fields = CONFIG_INDEXES[config_type]
+            columns = ''.join(f', "{field}" TEXT' for field in group_fields)
+            self.db.execute(f'CREATE TABLE IF NOT EXISTS {config_type} '
+                            f'("{key}" TEXT PRIMARY KEY{columns}, position INTEGER NOT NULL, data TEXT NOT NULL)')
+            for field in group_fields:
+                self.db.execute(f'CREATE INDEX IF NOT EXISTS {config_type}_{field} ON {config_type} ("{field}")')
+
+    def describe(self, config_type: str) -> str:
+        return f"{config_type} ({self.path.name})"
+
+    def watch_directories(self) -> set:
+        # Commits anderer Prozesse erkennt stamp() per Polling
+        return set()
+
+    def _version(self, config_type: str) -> Optional[int]:
+        row = self.db.execute('SELECT value FROM meta WHERE key = ?', (config_type,)).fetchone()
+        return row[0] if row else None
+
+    def _rows(self, config_type: str) -> tuple:
+        key, _ = CONFIG_INDEXES[config_type]
+        rows = self.db.execute(f'SELECT "{key}", data FROM {config_type} ORDER BY position').fetchall()
+        return dict(rows), [item_key for item_key, _ in rows]
+
+    def stamp(self, config_type: str) -> Optional[tuple]:
+        """Schreibzähler des Typs; None solange der Typ nie geschrieben/migriert wurde"""
+        version = self._version(config_type)
+        return None if version is None else (version,)
+
+    def read(self, config_type: str) -> dict:
+        self.db.execute('BEGIN')
+        try:
+            version = self._version(config_type)
+            rows, order = self._rows(config_type)
+        finally:
+            self.db.execute('COMMIT')
+        self.saved[config_type] = (version, rows, order)
+        return {config_type: [json.loads(rows[item_key]) for item_key in order]}
+
+    def load(self, config_type: str) -> Optional[dict]:
+        """Erstes Laden, None für nicht migrierte Typen (Fallback setzt der ConfigStore)"""
+        try:
+            if self._version(config_type) is not None:
+                data = self.read(config_type)
+                log_config.info(f"✅ {self.describe(config_type)} geladen")
+                return data
+            log_config.warning(f"⚠️ {config_type} fehlt in {self.path} (Migration: tools/migrate_inventory.py)")
+        except sqlite3.Error as e:
+            log_config.error(f"❌ Fehler beim Laden von {self.describe(config_type)}: {e}")
+        return None
+
+    def serialize(self, config_type: str, data: dict) -> List[tuple]:
+        """Zeilen (Schlüssel, Join-Felder, JSON) in Listenreihenfolge"""
+        key, group_fields = CONFIG_INDEXES[config_type]
+        return [
+            (item[key], tuple(item.get(field) for field in group_fields), self.encode(item))
+            for item in data.get(config_type, [])
+        ]
+
+    def save(self, payloads: Dict[str, List[tuple]]) -> bool:
+        """Alle Typen in einer Transaktion schreiben, nur geänderte Zeilen"""
+        try:
+            self.db.execute('BEGIN IMMEDIATE')
+            try:
+                stale = [config_type for config_type in payloads if self._stale(config_type)]
+                if stale:
+                    # Liste beruht auf einem überholten Stand, ein Diff würde fremde Commits löschen
+                    self.db.execute('ROLLBACK')
+                    log_config.warning(f"⚠️ {', '.join(stale)} wurde von einem anderen Prozess geändert, "
+                                       f"Speichern verworfen")
+                    for config_type in payloads:
+                        self.saved.pop(config_type, None)
+                    return False
+                results = {config_type: self._apply(config_type, rows) for config_type, rows in payloads.items()}
+                self.db.execute('COMMIT')
+            except BaseException:
+                self.db.execute('ROLLBACK')
+                raise
+        except sqlite3.Error as e:
+            log_config.error(f"❌ Fehler beim Speichern in {self.path.name}: {e}")
+            for config_type in payloads:
+                self.saved.pop(config_type, None)
+            return False
+
+        for config_type, (state, previous_content, changes) in results.items():
+            self.saved[config_type] = state
+            if previous_content is not None and self.manager is not None:
+                digest = self.manager.backups.add(self.backup_names[config_type], previous_content)
+                if digest:
+                    log_config.info(f"📦 Backup erstellt: {config_type} ({digest[:12]})")
+            log_config.info(f"✅ {self.describe(config_type)} gespeichert: {changes} Zeilen geändert")
+        return True
+
+    def _stale(self, config_type: str) -> bool:
+        """Hat seit dem letzten Lesen/Schreiben ein anderer Prozess den Typ geschrieben? (in der Transaktion)"""
+        version = self._version(config_type)
+        cached = self.saved.get(config_type)
+        return version is not None and (cached is None or cached[0] != version)
+
+    def _apply(self, config_type: str, rows: List[tuple]) -> tuple:
+        """Unterschied zum gespeicherten Stand schreiben (innerhalb der Transaktion, Stand ist aktuell)"""
+        key, group_fields = CONFIG_INDEXES[config_type]
+        _, previous, previous_order = self.saved.get(config_type, (None, {}, []))
+
+        current = {item_key: data for item_key, _, data in rows}
+        order = [item_key for item_key, _, _ in rows]
+        deleted = [item_key for item_key in previous_order if item_key not in current]
+
+        # Nur angehängte neue Einträge: Positionen bleiben, sonst (Umsortierung, Restore) neu vergeben
+        kept = [item_key for item_key in order if item_key in previous]
+        appended = kept == [item_key for item_key in previous_order if item_key in current] and order[:len(kept)] == kept
+        if appended:
+            next_position = self.db.execute(f'SELECT COALESCE(MAX(position), -1) + 1 FROM {config_type}').fetchone()[0]
+            changed = [row for row in rows if previous.get(row[0]) != row[2]]
+            positions = {}
+            for item_key, _, _ in changed:
+                if item_key not in previous:
+                    positions[item_key] = next_position
+                    next_position += 1
+        else:
+            changed = rows
+            positions = {item_key: position for position, item_key in enumerate(order)}
+
+        columns = ', '.join(f'"{field}"' for field in (key, *group_fields))
+        placeholders = ', '.join('?' for _ in range(len(group_fields) + 3))
+        updates = ', '.join(f'"{field}" = excluded."{field}"' for field in group_fields)
+        if deleted:
+            self.db.executemany(f'DELETE FROM {config_type} WHERE "{key}" = ?', ((item_key,) for item_key in deleted))
+        for item_key, groups, data in changed:
+            if item_key in positions:
+                self.db.execute(
+                    f'INSERT INTO {config_type} ({columns}, position, data) VALUES ({placeholders}) '
+                    f'ON CONFLICT("{key}") DO UPDATE SET {updates + ", " if updates else ""}'
+                    f'position = excluded.position, data = excluded.data',
+                    (item_key, *groups, positions[item_key], data))
+            else:
+                assignments = ''.join(f'"{field}" = ?, ' for field in group_fields)
+                self.db.execute(f'UPDATE {config_type} SET {assignments}data = ? WHERE "{key}" = ?',
+                                (*groups, data, item_key))
+
+        self.db.execute("INSERT INTO meta VALUES (?, 1) ON CONFLICT(key) DO UPDATE SET value = value + 1", (config_type,))
+        state = (self._version(config_type), current, order)
+
+        # Bisherigen Stand wie beim JSON-Backend vor dem Überschreiben sichern
+        previous_content = None
+        if previous_order and (deleted or changed):
+            previous_content = ('{"%s":[%s]}' % (config_type, ','.join(previous[item_key] for item_key in previous_order))).encode('utf-8')
+        return state, previous_content, len(deleted) + len(changed)
+
+    def close(self):
+        self.db.close()
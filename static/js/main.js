@@ -2,6 +2,12 @@
 class HomelabDashboard {
     constructor() {
         this.dashboardData = null;
+        this.dashboardEtag = null;
+        this.eventVersion = 0;
+        // Mit mehreren Workern: Worker, dessen Versionen eventVersion zählt
+        this.eventEpoch = null;
+        this.eventSource = null;
+        this.renderScheduled = false;
         this.currentFilter = 'all';
         this.currentServiceFilter = 'all';
         this.searchTerm = '';
@@ -32,8 +38,8 @@ class HomelabDashboard {
         this.renderHosts();
         this.renderServices();
         
-        // Start auto-refresh for ping status
-        this.startAutoRefresh();
+        // Live-Updates für Ping-Status und Änderungen
+        this.startEventStream();
         
         Utils.debugLog('✅ Dashboard initialisiert');
     }
@@ -73,14 +79,30 @@ class HomelabDashboard {
     async loadDashboardData() {
         try {
             Utils.debugLog('📡 Lade Dashboard-Daten...');
-            const response = await Utils.fetchWithTimeout('/api/dashboard', {}, 3000);
+            
+            // Conditional Request: unveränderte Daten liefern 304 ohne Body
+            const headers = this.dashboardEtag ? { 'If-None-Match': this.dashboardEtag } : {};
+            const response = await Utils.fetchWithTimeout('/api/dashboard', { headers, cache: 'no-store' }, 3000);
+            
+            // Alle Events bis zu dieser Version sind im Snapshot enthalten
+            if (response.headers.has('X-Event-Version')) {
+                this.eventVersion = parseInt(response.headers.get('X-Event-Version'), 10);
+                this.eventEpoch = response.headers.get('X-Event-Epoch');
+            }
+            
+            if (response.status === 304) {
+                Utils.debugLog('✅ Dashboard-Daten unverändert');
+                return false;
+            }
             
             if (!response.ok) {
                 throw new Error(`HTTP ${response.status}: ${response.statusText}`);
             }
             
             this.dashboardData = await response.json();
+            this.dashboardEtag = response.headers.get('ETag');
             Utils.debugLog(`✅ ${this.dashboardData.servers.length} Hosts, ${this.dashboardData.services.length} Services, ${this.dashboardData.service_categories.length} Service-Kategorien geladen`);
+            return true;
             
         } catch (error) {
             Utils.debugLog(`❌ Fehler beim Laden der Dashboard-Daten: ${error.message}`);
@@ -108,6 +130,8 @@ class HomelabDashboard {
                 services: [],
                 service_categories: []
             };
+            this.dashboardEtag = null;
+            return true;
         }
     }
 
@@ -115,14 +139,113 @@ class HomelabDashboard {
         // Refresh every 60 seconds
         this.refreshInterval = setInterval(async () => {
             Utils.debugLog('🔄 Auto-Refresh: Lade Dashboard-Daten...');
-            await this.loadDashboardData();
-            this.renderHosts();
-            this.renderServices();
+            if (await this.loadDashboardData()) {
+                this.renderHosts();
+                this.renderServices();
+            }
         }, 60000);
         
         Utils.debugLog('⏰ Auto-Refresh gestartet (60s Intervall)');
     }
 
+    startEventStream() {
+        if (typeof EventSource === 'undefined') {
+            Utils.debugLog('⚠️ EventSource nicht unterstützt, verwende Auto-Refresh');
+            this.startAutoRefresh();
+            return;
+        }
+        
+        // Ab der Snapshot-Version verbinden, Reconnects setzen per Last-Event-ID fort
+        const epoch = this.eventEpoch ? `&epoch=${encodeURIComponent(this.eventEpoch)}` : '';
+        this.eventSource = new EventSource(`/api/events?since=${this.eventVersion}${epoch}`);
+        ['status', 'server', 'service', 'health', 'reload'].forEach(type => {
+            this.eventSource.addEventListener(type, (e) => this.applyEvent(JSON.parse(e.data)));
+        });
+        
+        this.eventSource.onopen = () => Utils.debugLog('📡 Event-Stream verbunden');
+        this.eventSource.onerror = () => Utils.debugLog('⚠️ Event-Stream unterbrochen, Browser verbindet neu...');
+    }
+
+    async applyEvent(event) {
+        // Bereits im Snapshot enthalten (reload immer ausführen, z.B. nach Server-Neustart)
+        const sameEpoch = (event.epoch || null) === this.eventEpoch;
+        if (event.type !== 'reload' && sameEpoch && event.version <= this.eventVersion) {
+            return;
+        }
+        Utils.debugLog(`📥 Event ${event.version}: ${event.type}`);
+        
+        const data = this.dashboardData;
+        switch (event.type) {
+            case 'status': {
+                const server = data.servers.find(s => s.hostname === event.hostname);
+                if (server) {
+                    server.status = event.status;
+                }
+                break;
+            }
+            case 'server': {
+                const index = data.servers.findIndex(s => s.hostname === event.key);
+                if (event.op === 'delete') {
+                    if (index >= 0) data.servers.splice(index, 1);
+                } else if (index >= 0) {
+                    data.servers[index] = event.server;
+                } else {
+                    data.servers.push(event.server);
+                }
+                break;
+            }
+            case 'service': {
+                const index = data.services.findIndex(s => s.name === event.key);
+                if (event.op === 'delete') {
+                    if (index >= 0) data.services.splice(index, 1);
+                } else if (index >= 0) {
+                    data.services[index] = event.service;
+                } else {
+                    data.services.push(event.service);
+                }
+                data.servers.forEach(server => {
+                    server.services = data.services.filter(s => s.hostname === server.hostname);
+                });
+                break;
+            }
+            case 'health': {
+                const service = data.services.find(s => s.name === event.name);
+                if (service) {
+                    service.health = event.health;
+                }
+                data.servers.forEach(server => {
+                    (server.services || []).forEach(s => {
+                        if (s.name === event.name) s.health = event.health;
+                    });
+                });
+                break;
+            }
+            case 'reload':
+                await this.loadDashboardData();
+                break;
+        }
+        
+        // Snapshot kann von einem anderen Worker stammen: ab hier zählen die Versionen des Streams
+        if ((event.epoch || null) !== this.eventEpoch) {
+            this.eventEpoch = event.epoch || null;
+            this.eventVersion = event.version;
+        } else {
+            this.eventVersion = Math.max(this.eventVersion, event.version);
+        }
+        this.scheduleRender();
+    }
+
+    scheduleRender() {
+        // Mehrere Events pro Frame zu einem Rendern zusammenfassen
+        if (this.renderScheduled) return;
+        this.renderScheduled = true;
+        requestAnimationFrame(() => {
+            this.renderScheduled = false;
+            this.renderHosts();
+            this.renderServices();
+        });
+    }
+
     stopAutoRefresh() {
         if (this.refreshInterval) {
             clearInterval(this.refreshInterval);
@@ -489,10 +612,18 @@ class HomelabDashboard {
         const host = this.dashboardData.servers.find(s => s.hostname === service.hostname);
         const hostStatus = host ? host.status : 'unknown';
         const categoryInfo = service.category_info || {};
+        // Eigener Service-Check hat Vorrang vor dem Ping-Status des Hosts
+        const health = service.health;
+        const serviceStatus = health && health.status !== 'unknown' ? health.status : hostStatus;
+        const healthTitle = health ? [
+            health.http_status ? `HTTP ${health.http_status}` : null,
+            health.latency_ms != null ? `${health.latency_ms} ms` : (health.tcp_ms != null ? `TCP ${health.tcp_ms} ms` : null),
+            health.error || null
+        ].filter(Boolean).join(' · ') : '';
             
         return `
             <div class="service-card">
-                <div class="service-status-indicator ${hostStatus}"></div>
+                <div class="service-status-indicator ${serviceStatus}" title="${healthTitle}"></div>
                 <div class="service-header">
                     <div class="service-favicon icon">${categoryInfo.icon || '🌐'}</div>
                     <div class="service-info">
@@ -672,6 +803,14 @@ class HomelabDashboard {
                                 <label class="form-label">Notizen</label>
                                 <textarea class="form-input" name="notes" rows="3">${host?.notes || ''}</textarea>
                             </div>
+                            <div class="form-group">
+                                <label class="form-label">Tags (kommagetrennt)</label>
+                                <input type="text" class="form-input" name="tags" value="${host?.tags?.join(', ') || ''}">
+                            </div>
+                            <div class="form-group">
+                                <label class="form-label">Ping-Intervall (Sekunden, leer = Standard)</label>
+                                <input type="number" class="form-input" name="ping_interval" value="${host?.ping_interval || ''}" min="1" step="any">
+                            </div>
                         </form>
                     </div>
                     <div class="modal-footer">
@@ -739,6 +878,10 @@ class HomelabDashboard {
                                 <label class="form-label">Tags (kommagetrennt)</label>
                                 <input type="text" class="form-input" name="tags" value="${service?.tags?.join(', ') || ''}">
                             </div>
+                            <div class="form-group">
+                                <label class="form-label">Check-Timeout (Sekunden, leer = Standard)</label>
+                                <input type="number" class="form-input" name="check_timeout" value="${service?.check_timeout || ''}" min="0.1" step="any">
+                            </div>
                         </form>
                     </div>
                     <div class="modal-footer">
@@ -808,7 +951,9 @@ class HomelabDashboard {
                 ssh: formData.has('ssh'),
                 ssh_user: formData.get('ssh_user') || 'root'
             },
-            notes: formData.get('notes') || ''
+            notes: formData.get('notes') || '',
+            tags: formData.get('tags') ? formData.get('tags').split(',').map(t => t.trim()).filter(t => t) : [],
+            ping_interval: formData.get('ping_interval') ? parseFloat(formData.get('ping_interval')) : null
         };
 
         try {
@@ -847,7 +992,8 @@ class HomelabDashboard {
             url: formData.get('url') || null,
             internal_url: formData.get('internal_url') || null,
             port: formData.get('port') ? parseInt(formData.get('port')) : null,
-            tags: formData.get('tags') ? formData.get('tags').split(',').map(t => t.trim()).filter(t => t) : []
+            tags: formData.get('tags') ? formData.get('tags').split(',').map(t => t.trim()).filter(t => t) : [],
+            check_timeout: formData.get('check_timeout') ? parseFloat(formData.get('check_timeout')) : null
         };
 
         try {
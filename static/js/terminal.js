@@ -5,6 +5,38 @@ class SSHTerminal {
         this.fitAddon = null;
         this.socket = null;
         this.currentServer = null;
+        this.binaryMode = false;
+        this.encoder = new TextEncoder();
+        this.sessionKey = null;
+    }
+
+    // Sitzungs-IDs pro Ziel überleben einen Reload (sessionStorage), Backend hält die Sitzung eine Weile
+    getStoredSession() {
+        return sessionStorage.getItem(`ssh-session:${this.sessionKey}`);
+    }
+
+    storeSession(sessionId) {
+        if (sessionId) {
+            sessionStorage.setItem(`ssh-session:${this.sessionKey}`, sessionId);
+        } else {
+            sessionStorage.removeItem(`ssh-session:${this.sessionKey}`);
+        }
+    }
+
+    sendConnect() {
+        const server = this.currentServer;
+        const sshRequest = {
+            action: 'connect',
+            host: server.host,
+            port: 22,
+            username: this.currentUsername,  // Include username
+            binary: true,  // Binärmodus anfragen, Backend bestätigt in 'connected'
+            cols: this.terminal.cols,
+            rows: this.terminal.rows
+        };
+        
+        Utils.debugLog(`📤 Sende SSH-Request für ${this.currentUsername}@${server.host}`);
+        this.socket.send(JSON.stringify(sshRequest));
     }
 
     async openSSHTerminal(server) {
@@ -100,6 +132,13 @@ class SSHTerminal {
 
             // Open terminal in container
             this.terminal.open(document.getElementById('terminal'));
+            
+            // Größenänderungen (fitAddon) an den PTY weitergeben, Backend entprellt
+            this.terminal.onResize(({ cols, rows }) => {
+                if (this.socket && this.socket.readyState === WebSocket.OPEN) {
+                    this.socket.send(JSON.stringify({ action: 'resize', cols: cols, rows: rows }));
+                }
+            });
             Utils.debugLog('✅ Terminal erfolgreich initialisiert');
             
             return true;
@@ -118,6 +157,7 @@ class SSHTerminal {
         // Store username for later use
         this.currentUsername = username;
         this.currentServer = server;
+        this.sessionKey = `${username}@${server.host}`;
         
         // Create WebSocket connection to backend
         const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
@@ -127,32 +167,43 @@ class SSHTerminal {
         
         try {
             this.socket = new WebSocket(wsUrl);
+            this.socket.binaryType = 'arraybuffer';
+            this.binaryMode = false;
             
             this.socket.onopen = () => {
                 Utils.debugLog('✅ WebSocket-Verbindung hergestellt');
                 this.updateConnectionStatus('connected', 'Verbunden');
                 
-                // Send SSH connection request WITH username
-                const sshRequest = {
-                    action: 'connect',
-                    host: server.host,
-                    port: 22,
-                    username: username  // Include username
-                };
-                
-                Utils.debugLog(`📤 Sende SSH-Request für ${username}@${server.host}`);
-                this.socket.send(JSON.stringify(sshRequest));
-                
                 // Clear terminal and show connection info
                 this.terminal.clear();
                 this.terminal.writeln('\x1b[1;36m╔══════════════════════════════════════╗\x1b[0m');
                 this.terminal.writeln('\x1b[1;36m║        HomeLab SSH Terminal          ║\x1b[0m');
                 this.terminal.writeln('\x1b[1;36m╚══════════════════════════════════════╝\x1b[0m');
                 this.terminal.writeln('');
-                this.terminal.writeln(`\x1b[32mVerbinde zu ${username}@${server.host}...\x1b[0m`);
+                
+                // Laufende Sitzung wieder aufnehmen, sonst neue SSH-Verbindung
+                const sessionId = this.getStoredSession();
+                if (sessionId) {
+                    Utils.debugLog(`🔗 Sitzung ${sessionId} wieder aufnehmen`);
+                    this.socket.send(JSON.stringify({
+                        action: 'attach',
+                        session_id: sessionId,
+                        cols: this.terminal.cols,
+                        rows: this.terminal.rows
+                    }));
+                } else {
+                    this.terminal.writeln(`\x1b[32mVerbinde zu ${username}@${server.host}...\x1b[0m`);
+                    this.sendConnect();
+                }
             };
             
             this.socket.onmessage = (event) => {
+                // Binary-Frames: rohe Terminal-Ausgabe, xterm.js dekodiert UTF-8 selbst
+                if (event.data instanceof ArrayBuffer) {
+                    this.terminal.write(new Uint8Array(event.data));
+                    return;
+                }
+                
                 try {
                     const data = JSON.parse(event.data);
                     Utils.debugLog(`📥 WebSocket-Nachricht: ${data.type}`);
@@ -162,16 +213,31 @@ class SSHTerminal {
                             this.terminal.write(data.data);
                             break;
                         case 'connected':
+                            this.binaryMode = data.binary === true;
+                            this.storeSession(data.session_id);
                             this.updateConnectionStatus('connected', 'SSH Aktiv');
                             document.getElementById('terminalInfo').textContent = `SSH Session - ${this.currentUsername}@${this.currentServer.name}`;
                             Utils.debugLog('🎉 SSH-Verbindung erfolgreich!');
                             break;
+                        case 'attached':
+                            this.binaryMode = data.binary === true;
+                            this.updateConnectionStatus('connected', data.connected ? 'SSH Aktiv' : 'Getrennt');
+                            document.getElementById('terminalInfo').textContent = `SSH Session - ${this.currentUsername}@${this.currentServer.name}`;
+                            Utils.debugLog('🔗 Sitzung wieder aufgenommen, Scrollback folgt');
+                            break;
                         case 'error':
+                            if (data.code === 'session_not_found') {
+                                this.storeSession(null);
+                                this.terminal.writeln(`\x1b[32mVerbinde zu ${this.currentUsername}@${this.currentServer.host}...\x1b[0m`);
+                                this.sendConnect();
+                                break;
+                            }
                             this.terminal.writeln(`\x1b[31mFehler: ${data.message}\x1b[0m`);
                             this.updateConnectionStatus('disconnected', 'Fehler');
                             Utils.debugLog(`❌ SSH-Fehler: ${data.message}`);
                             break;
                         case 'disconnected':
+                            this.storeSession(null);
                             this.terminal.writeln('\x1b[33mVerbindung getrennt.\x1b[0m');
                             this.updateConnectionStatus('disconnected', 'Getrennt');
                             Utils.debugLog('🔌 SSH-Verbindung getrennt');
@@ -198,10 +264,14 @@ class SSHTerminal {
             // Handle terminal input - This is crucial for interactive SSH
             this.terminal.onData((data) => {
                 if (this.socket && this.socket.readyState === WebSocket.OPEN) {
-                    this.socket.send(JSON.stringify({
-                        action: 'input',
-                        data: data
-                    }));
+                    if (this.binaryMode) {
+                        this.socket.send(this.encoder.encode(data));
+                    } else {
+                        this.socket.send(JSON.stringify({
+                            action: 'input',
+                            data: data
+                        }));
+                    }
                 }
             });
             
@@ -232,6 +302,11 @@ class SSHTerminal {
 
     disconnectSSH() {
         if (this.socket) {
+            // Explizit beenden, sonst hält das Backend die Sitzung für einen Reattach
+            if (this.socket.readyState === WebSocket.OPEN) {
+                this.socket.send(JSON.stringify({ action: 'disconnect' }));
+            }
+            this.storeSession(null);
             this.socket.close();
             Utils.debugLog('🔌 SSH-Verbindung manuell getrennt');
         }
@@ -0,0 +1,11 @@
+"""
+Gemeinsame Einrichtung: app.py erwartet das Projektverzeichnis als Arbeitsverzeichnis (static/, config/)
+Aufruf: python -m pytest tests
+"""
+
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+os.chdir(ROOT_DIR)
@@ -0,0 +1,64 @@
+"""apply_batch: Batch-Operationen werden vollständig oder gar nicht angewendet"""
+
+from app import apply_batch
+
+
+def server(hostname: str, **fields) -> dict:
+    return dict({'hostname': hostname, 'description': ''}, **fields)
+
+
+ITEMS = [server('web01', status='online'), server('db01', status='offline'), server('mail01')]
+
+
+def hostnames(items) -> list:
+    return [item['hostname'] for item in items]
+
+
+def test_create_update_delete():
+    items, errors = apply_batch(ITEMS, 'hostname', [
+        ('create', None, server('git01')),
+        ('update', 'db01', server('db01', description='PostgreSQL')),
+        ('delete', 'mail01', None),
+    ])
+    assert errors == []
+    assert hostnames(items) == ['web01', 'db01', 'git01']
+    # Update übernimmt den bisherigen Ping-Status
+    assert items[1] == {'hostname': 'db01', 'description': 'PostgreSQL', 'status': 'offline'}
+    assert len(ITEMS) == 3
+
+
+def test_rename_keeps_position():
+    items, errors = apply_batch(ITEMS, 'hostname', [('update', 'web01', server('web02'))])
+    assert errors == []
+    assert hostnames(items) == ['web02', 'db01', 'mail01']
+    assert items[0]['status'] == 'online'
+
+
+def test_operations_see_earlier_operations():
+    items, errors = apply_batch(ITEMS, 'hostname', [
+        ('delete', 'web01', None),
+        ('create', None, server('web01')),
+        ('update', 'web01', server('web01', description='neu')),
+    ])
+    assert errors == []
+    assert hostnames(items) == ['db01', 'mail01', 'web01']
+    assert items[-1]['description'] == 'neu'
+
+
+def test_errors_reference_operation_index():
+    items, errors = apply_batch(ITEMS, 'hostname', [
+        ('create', None, server('web01')),
+        ('update', 'missing', server('missing')),
+        ('delete', 'missing', None),
+        ('update', 'db01', server('web01')),
+        ('create', None, None),
+        ('create', None, server('git01')),
+    ])
+    assert errors == [
+        {'index': 0, 'error': "web01 already exists"},
+        {'index': 1, 'error': "missing not found"},
+        {'index': 2, 'error': "missing not found"},
+        {'index': 3, 'error': "web01 already exists"},
+        {'index': 4, 'error': "'create' requires an item"},
+    ]
+    assert hostnames(ITEMS) == ['web01', 'db01', 'mail01']
@@ -0,0 +1,101 @@
+"""IndexedList: Schlüssel-, Gruppen- und Textindex bleiben bei jeder Mutation konsistent"""
+
+import pytest
+
+from app import IndexedList
+
+
+def server(hostname: str, category_id: str = 'intern', **fields) -> dict:
+    return dict({'hostname': hostname, 'category_id': category_id, 'description': '', 'notes': '', 'tags': []}, **fields)
+
+
+def make_index(items):
+    return IndexedList(items, 'hostname', ('category_id',), ('hostname', 'description', 'notes', 'tags'))
+
+
+def assert_consistent(index: IndexedList):
+    """Index muss einem Neuaufbau aus der aktuellen Liste entsprechen"""
+    rebuilt = make_index(list(index.items))
+    assert index.by_key == rebuilt.by_key
+    assert index.positions == rebuilt.positions
+    assert index.groups == rebuilt.groups
+    assert index.postings == rebuilt.postings
+    assert index.vocabulary == rebuilt.vocabulary == sorted(rebuilt.postings)
+
+
+@pytest.fixture
+def index():
+    return make_index([
+        server('web01', description='Nginx Frontend', tags=['prod']),
+        server('db01', 'dmz', description='PostgreSQL Primary', tags=['prod', 'database']),
+        server('backup01', notes='Nightly rsync'),
+    ])
+
+
+def test_build(index):
+    assert 'db01' in index and 'missing' not in index
+    assert index.get('web01')['description'] == 'Nginx Frontend'
+    assert index.positions == {'web01': 0, 'db01': 1, 'backup01': 2}
+    assert [item['hostname'] for item in index.group('category_id', 'intern')] == ['web01', 'backup01']
+    assert index.group('category_id', 'unknown') == []
+    assert_consistent(index)
+
+
+def test_duplicate_key_indexes_first_entry():
+    index = make_index([server('web01', description='first'), server('web01', description='second')])
+    assert index.get('web01')['description'] == 'first'
+    assert index.positions == {'web01': 0}
+
+
+def test_add(index):
+    index.add(server('mail01', 'dmz', description='Postfix Relay'))
+    assert index.items[-1]['hostname'] == 'mail01'
+    assert index.positions['mail01'] == 3
+    assert [item['hostname'] for item in index.group('category_id', 'dmz')] == ['db01', 'mail01']
+    assert index.search('postfix') == {'mail01'}
+    assert_consistent(index)
+
+
+def test_replace_keeps_position(index):
+    previous = index.replace('db01', server('db01', 'intern', description='MariaDB'))
+    assert previous['description'] == 'PostgreSQL Primary'
+    assert index.positions['db01'] == 1
+    assert index.group('category_id', 'dmz') == []
+    assert 'dmz' not in index.groups['category_id']
+    assert index.search('postgresql') == set()
+    assert index.search('mariadb') == {'db01'}
+    assert_consistent(index)
+
+
+def test_replace_with_renamed_key(index):
+    index.replace('web01', server('web02', description='Nginx Frontend'))
+    assert 'web01' not in index
+    assert index.positions['web02'] == 0
+    assert index.search('web01') == set()
+    assert index.search('web') == {'web02'}
+    assert_consistent(index)
+
+
+def test_replace_missing(index):
+    assert index.replace('missing', server('missing')) is None
+    assert len(index.items) == 3
+
+
+def test_remove_shifts_positions(index):
+    removed = index.remove('web01')
+    assert removed['hostname'] == 'web01'
+    assert [item['hostname'] for item in index.items] == ['db01', 'backup01']
+    assert index.positions == {'db01': 0, 'backup01': 1}
+    assert index.search('nginx') == set()
+    assert 'nginx' not in index.vocabulary
+    assert index.remove('web01') is None
+    assert_consistent(index)
+
+
+def test_search(index):
+    assert index.search('PROD') == {'web01', 'db01'}
+    # Jedes Wort als Wortanfang, alle Wörter müssen passen
+    assert index.search('post prim') == {'db01'}
+    assert index.search('prod rsync') == set()
+    assert index.search('nightly') == {'backup01'}
+    assert index.search('  ') is None
@@ -0,0 +1,110 @@
+"""SQLiteConfigBackend: Zeilen-Diff beim Speichern, Positionen und Schutz vor überholten Ständen"""
+
+import json
+
+import pytest
+
+from inventory import SQLiteConfigBackend
+
+
+def service(name: str, hostname: str = 'web01', **fields) -> dict:
+    return dict({'name': name, 'hostname': hostname, 'category': 'web', 'port': 80}, **fields)
+
+
+def open_backend(path) -> SQLiteConfigBackend:
+    return SQLiteConfigBackend(path, None, {'services': 'services'})
+
+
+def save(backend: SQLiteConfigBackend, items) -> bool:
+    return backend.save({'services': backend.serialize('services', {'services': items})})
+
+
+def apply(backend: SQLiteConfigBackend, items) -> tuple:
+    """_apply direkt in einer Transaktion, liefert (Stand, bisheriger Inhalt, geänderte Zeilen)"""
+    backend.db.execute('BEGIN IMMEDIATE')
+    result = backend._apply('services', backend.serialize('services', {'services': items}))
+    backend.db.execute('COMMIT')
+    backend.saved['services'] = result[0]
+    return result
+
+
+def table(backend: SQLiteConfigBackend) -> list:
+    return backend.db.execute('SELECT name, hostname, position FROM services ORDER BY position').fetchall()
+
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = open_backend(tmp_path / 'inventory.db')
+    assert save(backend, [service('nginx'), service('grafana', 'mon01'), service('gitea', 'git01')])
+    yield backend
+    backend.close()
+
+
+def test_first_save_and_read(backend):
+    assert backend.stamp('services') == (1,)
+    assert table(backend) == [('nginx', 'web01', 0), ('grafana', 'mon01', 1), ('gitea', 'git01', 2)]
+    assert backend.read('services') == {'services': [service('nginx'), service('grafana', 'mon01'), service('gitea', 'git01')]}
+
+
+def test_unmigrated_type(tmp_path):
+    backend = open_backend(tmp_path / 'empty.db')
+    assert backend.stamp('services') is None
+    assert backend.load('services') is None
+    backend.close()
+
+
+def test_append_writes_only_new_rows(backend):
+    items = backend.read('services')['services']
+    _, previous_content, changes = apply(backend, items + [service('loki', 'mon01')])
+    assert changes == 1
+    assert table(backend)[-1] == ('loki', 'mon01', 3)
+    assert json.loads(previous_content) == {'services': items}
+    assert backend.stamp('services') == (2,)
+
+
+def test_append_with_changed_row_keeps_positions(backend):
+    items = backend.read('services')['services']
+    items[1] = service('grafana', 'mon02')
+    _, _, changes = apply(backend, items + [service('loki', 'mon01')])
+    assert changes == 2
+    assert table(backend) == [('nginx', 'web01', 0), ('grafana', 'mon02', 1), ('gitea', 'git01', 2), ('loki', 'mon01', 3)]
+
+
+def test_unchanged_list_writes_nothing(backend):
+    _, previous_content, changes = apply(backend, backend.read('services')['services'])
+    assert changes == 0
+    assert previous_content is None
+
+
+def test_delete_and_reorder_rewrites_positions(backend):
+    items = backend.read('services')['services']
+    _, _, changes = apply(backend, [items[2], service('loki', 'mon01'), items[0]])
+    # Gelöscht: grafana; neu positioniert: alle übrigen Zeilen
+    assert changes == 4
+    assert table(backend) == [('gitea', 'git01', 0), ('loki', 'mon01', 1), ('nginx', 'web01', 2)]
+    assert [item['name'] for item in backend.read('services')['services']] == ['gitea', 'loki', 'nginx']
+
+
+def test_group_column_follows_data(backend):
+    items = backend.read('services')['services']
+    items[0] = service('nginx', 'web02')
+    assert save(backend, items)
+    assert backend.db.execute('SELECT name FROM services WHERE hostname = ?', ('web02',)).fetchall() == [('nginx',)]
+
+
+def test_stale_save_is_rejected(backend, tmp_path):
+    other = open_backend(tmp_path / 'inventory.db')
+    try:
+        items = other.read('services')['services']
+        backend.read('services')
+        assert save(other, items + [service('loki', 'mon01')])
+
+        # Liste beruht auf Version 1, ein Diff würde 'loki' löschen
+        assert not save(backend, items[:1])
+        assert [item['name'] for item in other.read('services')['services']] == ['nginx', 'grafana', 'gitea', 'loki']
+
+        # Nach erneutem Lesen setzt das Speichern auf dem aktuellen Stand auf
+        assert save(backend, backend.read('services')['services'][:1])
+        assert table(other) == [('nginx', 'web01', 0)]
+    finally:
+        other.close()
@@ -0,0 +1,118 @@
+"""query_inventory und Cursor: Suche, Filter und Seiten über die Config-Indizes"""
+
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+
+import app
+from app import ConfigStore, JSONConfigBackend, config_paths, decode_cursor, encode_cursor, query_inventory
+
+
+def query(**params) -> dict:
+    return dict({'q': None, 'category': None, 'tag': None, 'status': None, 'shared': None,
+                 'cursor': None, 'limit': None}, **params)
+
+
+def names(page: dict, config_type: str) -> list:
+    key = 'hostname' if config_type == 'servers' else 'name'
+    return [item[key] for item in page[config_type]]
+
+
+@pytest.fixture
+def store(monkeypatch):
+    """Synthetische Konfiguration im Speicher (ohne Dateizugriff), Status über Ping-Ergebnisse und Service-Checks"""
+    store = ConfigStore(JSONConfigBackend({key: Path(f"/nonexistent/{path.name}") for key, path in config_paths.items()}, None))
+    store.replace('servers', {'servers': [
+        {'hostname': 'web01', 'category_id': 'dmz', 'description': 'Nginx Frontend', 'shared': True, 'tags': ['prod']},
+        {'hostname': 'web02', 'category_id': 'dmz', 'description': 'Nginx Staging', 'shared': False, 'tags': []},
+        {'hostname': 'db01', 'category_id': 'intern', 'description': 'PostgreSQL', 'shared': False, 'tags': ['prod']},
+        {'hostname': 'mon01', 'category_id': 'intern', 'description': 'Grafana', 'shared': True, 'tags': []},
+    ]})
+    store.replace('services', {'services': [
+        {'name': 'shop', 'hostname': 'web01', 'category': 'web', 'tags': ['prod']},
+        {'name': 'grafana', 'hostname': 'mon01', 'category': 'monitoring', 'tags': []},
+        {'name': 'postgres', 'hostname': 'db01', 'category': 'database', 'tags': ['prod']},
+    ]})
+    monkeypatch.setattr(app, 'config_cache', store)
+    monkeypatch.setattr(app.ping_checker, 'ping_results', {'web01': 'online', 'db01': 'offline', 'mon01': 'online'})
+    monkeypatch.setattr(app.service_checker, 'results', {'grafana': {'status': 'offline'}})
+    return store
+
+
+def test_cursor_round_trip(store):
+    index = store.index('servers')
+    assert decode_cursor(encode_cursor(2, 'db01'), index) == 2
+
+
+def test_cursor_follows_moved_entry(store):
+    cursor = encode_cursor(2, 'db01')
+    store.index('servers').remove('web01')
+    assert decode_cursor(cursor, store.index('servers')) == 1
+
+
+def test_cursor_of_deleted_entry_keeps_position(store):
+    cursor = encode_cursor(2, 'db01')
+    store.index('servers').remove('db01')
+    # Position 2 ist jetzt mon01, der Nachfolger des gelöschten Eintrags
+    assert decode_cursor(cursor, store.index('servers')) == 2
+
+
+@pytest.mark.parametrize('cursor', ['', 'kein-cursor', encode_cursor(-1, 'web01'),
+                                    'WyJhIiwgImIiXQ', 'W3RydWUsICJ3ZWIwMSJd'])
+def test_invalid_cursor(store, cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, store.index('servers'))
+    assert error.value.status_code == 400
+
+
+def test_no_filters_returns_list_order(store):
+    page = query_inventory('servers', query())
+    assert names(page, 'servers') == ['web01', 'web02', 'db01', 'mon01']
+    assert page['next_cursor'] is None
+    assert page['servers'][0]['status'] == 'online'
+    assert page['servers'][1]['status'] == 'unknown'
+
+
+def test_search_and_category(store):
+    assert names(query_inventory('servers', query(q='nginx')), 'servers') == ['web01', 'web02']
+    assert names(query_inventory('servers', query(q='nginx stag')), 'servers') == ['web02']
+    assert names(query_inventory('servers', query(category='intern')), 'servers') == ['db01', 'mon01']
+    assert names(query_inventory('servers', query(q='nginx', category='intern')), 'servers') == []
+    assert names(query_inventory('servers', query(category='missing')), 'servers') == []
+    assert query_inventory('servers', query(q='nginx grafana', limit=1)) == {'servers': [], 'next_cursor': None}
+
+
+def test_tag_status_and_shared(store):
+    assert names(query_inventory('servers', query(tag='prod')), 'servers') == ['web01', 'db01']
+    assert names(query_inventory('servers', query(status='online')), 'servers') == ['web01', 'mon01']
+    assert names(query_inventory('servers', query(shared=True, tag='prod')), 'servers') == ['web01']
+
+
+def test_service_status_and_shared_from_host(store):
+    # Eigener Service-Check vor dem Ping-Status des Hosts
+    page = query_inventory('services', query(status='online'))
+    assert names(page, 'services') == ['shop']
+    assert page['services'][0]['health'] is None
+    assert names(query_inventory('services', query(status='offline')), 'services') == ['grafana', 'postgres']
+    assert names(query_inventory('services', query(shared=True)), 'services') == ['shop', 'grafana']
+    assert names(query_inventory('services', query(category='database', q='post')), 'services') == ['postgres']
+
+
+def test_pagination(store):
+    first = query_inventory('servers', query(limit=3))
+    assert names(first, 'servers') == ['web01', 'web02', 'db01']
+    second = query_inventory('servers', query(limit=3, cursor=first['next_cursor']))
+    assert names(second, 'servers') == ['mon01']
+    assert second['next_cursor'] is None
+
+
+def test_pagination_with_filter_and_deletion(store):
+    first = query_inventory('servers', query(tag='prod', limit=1))
+    assert names(first, 'servers') == ['web01']
+
+    # Eintrag vor dem Cursor gelöscht: die nächste Seite beginnt trotzdem beim gemerkten Treffer
+    store.index('servers').remove('web02')
+    second = query_inventory('servers', query(tag='prod', limit=1, cursor=first['next_cursor']))
+    assert names(second, 'servers') == ['db01']
+    assert second['next_cursor'] is None
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Einmalige Migration: JSON-Konfiguration (config/*.json) in das SQLite-Inventar übernehmen
+Aufruf: python tools/migrate_inventory.py [--config-dir config] [--db data/inventory.db] [--force]
+Danach in config/settings.json: {"storage": {"backend": "sqlite"}}
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+os.chdir(ROOT_DIR)
+
+# Nur das Storage-Modul: kein Logging-Thread, keine Backups, keine App-Konfiguration
+from inventory import CONFIG_FILES, CONFIG_INDEXES, SQLiteConfigBackend  # noqa: E402
+
+
+def migrate(args, backend: SQLiteConfigBackend) -> int:
+    config_dir = Path(args.config_dir)
+    payloads, counts = {}, {}
+
+    for config_type, filename in CONFIG_FILES.items():
+        if backend.stamp(config_type) is not None:
+            if not args.force:
+                print(f"❌ {config_type} ist bereits in {args.db} (überschreiben mit --force)")
+                return 1
+            # Bestehende Zeilen als Ausgangsstand lesen, sonst verweigert save() das Überschreiben
+            backend.read(config_type)
+
+        source = config_dir / filename
+        if not source.exists():
+            print(f"⚠️ {source} nicht gefunden, übersprungen")
+            continue
+        with open(source, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        key, _ = CONFIG_INDEXES[config_type]
+        items = data.get(config_type, [])
+        keys = [item.get(key) for item in items]
+        if None in keys or len(set(keys)) != len(keys):
+            print(f"❌ {source}: '{key}' fehlt oder ist doppelt")
+            return 1
+
+        payloads[config_type] = backend.serialize(config_type, data)
+        counts[config_type] = len(items)
+
+    # Alle Typen in einer Transaktion: entweder vollständig migriert oder gar nicht
+    if not backend.save(payloads):
+        return 1
+
+    for config_type, count in counts.items():
+        print(f"✅ {config_type}: {count} Einträge")
+    print(f"Fertig. Aktivieren in config/settings.json: {{\"storage\": {{\"backend\": \"sqlite\", \"path\": \"{args.db}\"}}}}")
+    return 0
+
+
+def main(args) -> int:
+    backend = SQLiteConfigBackend(Path(args.db), None, {config_type: Path(filename).stem
+                                                        for config_type, filename in CONFIG_FILES.items()})
+    try:
+        return migrate(args, backend)
+    finally:
+        backend.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="JSON-Konfiguration nach SQLite migrieren")
+    parser.add_argument("--config-dir", default="config")
+    parser.add_argument("--db", default="data/inventory.db")
+    parser.add_argument("--force", action="store_true", help="bereits migrierte Typen überschreiben")
+    sys.exit(main(parser.parse_args()))